@@ -7,7 +7,10 @@ from flask import make_response
 from flask import jsonify
 from models import storage
 from api.v1.views import app_views
+from api.v1.profiler import RequestProfiler
 from os import getenv
+import signal
+import sys
 from flask_cors import CORS
 from flasgger import Swagger
 
@@ -21,6 +24,9 @@ port = getenv('HBNB_API_PORT') or '0.0.0.0'
 
 cors = CORS(app, resources={"*": {"origins": "0.0.0.0"}})
 
+if getenv('HBNB_API_PROFILE_DIR'):
+    RequestProfiler(getenv('HBNB_API_PROFILE_DIR')).init_app(app)
+
 
 @app.teardown_appcontext
 def teardown(self):
@@ -35,4 +41,6 @@ def not_found(error):
 
 
 if __name__ == "__main__":
+    # exit normally on SIGTERM so that the pending saves are flushed
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
     app.run(host=host, port=port, threaded=True)
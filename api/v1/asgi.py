@@ -0,0 +1,493 @@
+#!/usr/bin/python3
+"""
+ASGI serving mode of the API v1
+
+    python3 -m api.v1.asgi --port 5000 --workers 16
+
+The ASGI application wraps the Flask app of api.v1.app, so the routes and
+the JSON shapes are those of app_views, and runs every request, with its
+storage calls, on a bounded pool of threads. The connections are held by
+the event loop instead of a thread each: one process keeps thousands of
+idle keep-alive clients while at most `workers` requests touch the storage
+at once. The body of a response goes to the server chunk by chunk as the
+WSGI application yields it, so a streamed route (/admin/export) is never
+held whole in memory; the builtin server sends it with the chunked
+transfer encoding.
+
+SIGTERM and SIGINT stop the builtin server gracefully, like app.py: the
+running requests end and the saves waiting for the write-behind thread of
+the storage are written (AsgiApp.shutdown, also run at the lifespan
+shutdown of uvicorn).
+
+`app` can be served by any ASGI server (uvicorn api.v1.asgi:app). Without
+uvicorn installed, or with --server builtin, the small HTTP/1.1 server of
+this module serves it.
+"""
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from io import BytesIO
+from os import getenv
+import signal
+import sys
+from threading import Lock, Semaphore
+from urllib.parse import unquote
+from api.v1.app import app as flask_app
+from models import storage
+
+MAX_HEADER_BYTES = 65536
+MAX_BODY_BYTES = 1 << 20
+# chunks of a streamed response waiting for the event loop
+STREAM_QUEUE = 8
+
+
+class AsgiApp:
+    """
+    ASGI application running a WSGI application on a thread pool
+
+    Attributes:
+        wsgi_app (callable): the WSGI application.
+        workers (int): number of threads running the requests.
+        __executor (ThreadPoolExecutor): the threads running the requests,
+                                         started by the first request
+        __lock (Lock): guards the start of __executor
+    """
+
+    def __init__(self, wsgi_app, workers=16):
+        """
+        Initializes the application
+
+        Args:
+            wsgi_app (callable): the WSGI application.
+            workers (int): number of threads running the requests.
+        """
+        self.wsgi_app = wsgi_app
+        self.workers = workers
+        self.__executor = None
+        self.__lock = Lock()
+
+    def __pool(self):
+        """Returns the thread pool, started on the first call"""
+        with self.__lock:
+            if self.__executor is None:
+                self.__executor = ThreadPoolExecutor(
+                    self.workers, thread_name_prefix="asgi")
+            return self.__executor
+
+    def shutdown(self):
+        """
+        Waits for the requests running, then writes the saves still
+        waiting for the write-behind thread of the storage.
+        """
+        with self.__lock:
+            executor, self.__executor = self.__executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        if hasattr(storage, "flush"):
+            storage.flush()
+
+    async def __call__(self, scope, receive, send):
+        """Handles an ASGI connection scope"""
+        if scope["type"] == "lifespan":
+            return await self.__lifespan(receive, send)
+        if scope["type"] != "http":
+            raise ValueError("unsupported scope {}".format(scope["type"]))
+        body = []
+        more = True
+        while more:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            body.append(message.get("body", b""))
+            more = message.get("more_body", False)
+        environ = self.environ(scope, b"".join(body))
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        room = Semaphore(STREAM_QUEUE)
+
+        def put(message):
+            """Hands a message to the event loop, from the thread, waiting
+            while STREAM_QUEUE messages are not sent yet"""
+            if message is not None:
+                room.acquire()
+            loop.call_soon_threadsafe(queue.put_nowait, message)
+
+        future = loop.run_in_executor(self.__pool(), self.__call_wsgi,
+                                      environ, put)
+        message = None
+        try:
+            while True:
+                message = await queue.get()
+                if message is None:
+                    break
+                room.release()
+                await send(message)
+        finally:
+            # the thread may wait for room until its last message
+            while message is not None:
+                message = await queue.get()
+                room.release()
+            await future
+
+    async def __lifespan(self, receive, send):
+        """Answers the startup and shutdown of the server"""
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await asyncio.get_running_loop().run_in_executor(
+                    None, self.shutdown)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    @staticmethod
+    def environ(scope, body):
+        """
+        Returns the WSGI environ of an ASGI http scope.
+
+        Args:
+            scope (dict): the ASGI http scope.
+            body (bytes): the whole request body.
+        """
+        server = scope.get("server") or ("localhost", 80)
+        client = scope.get("client") or ("", 0)
+        environ = {
+            "REQUEST_METHOD": scope["method"],
+            "SCRIPT_NAME": scope.get("root_path", ""),
+            "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+            "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+            "SERVER_NAME": server[0],
+            "SERVER_PORT": str(server[1]),
+            "SERVER_PROTOCOL": "HTTP/" + scope.get("http_version", "1.1"),
+            "REMOTE_ADDR": client[0],
+            "REMOTE_PORT": str(client[1]),
+            "CONTENT_LENGTH": str(len(body)),
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": scope.get("scheme", "http"),
+            "wsgi.input": BytesIO(body),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        for name, value in scope.get("headers", []):
+            name = name.decode("latin-1").upper().replace("-", "_")
+            value = value.decode("latin-1")
+            if name == "CONTENT_TYPE":
+                environ[name] = value
+                continue
+            if name == "CONTENT_LENGTH":
+                continue
+            key = "HTTP_" + name
+            environ[key] = environ[key] + "," + value \
+                if key in environ else value
+        return environ
+
+    def __call_wsgi(self, environ, put):
+        """
+        Runs the WSGI application, in a thread of the pool, and hands the
+        ASGI messages of the response to put() chunk by chunk: a streamed
+        response is never held whole. None is put last, even on error.
+        """
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            """Records the status and the headers of the response"""
+            if exc_info and response.get("started"):
+                raise exc_info[1].with_traceback(exc_info[2])
+            response["status"] = int(status.split(" ", 1)[0])
+            response["headers"] = headers
+            return write
+
+        def start():
+            """Sends the status and the headers once"""
+            if not response.get("started"):
+                response["started"] = True
+                put({"type": "http.response.start",
+                     "status": response["status"],
+                     "headers": [(name.lower().encode("latin-1"),
+                                  value.encode("latin-1"))
+                                 for name, value in response["headers"]]})
+
+        def write(chunk):
+            """Sends the previous chunk of the body, the last one is held
+            so that a body of one chunk is sent in one message"""
+            start()
+            if chunk:
+                if response.get("held"):
+                    put({"type": "http.response.body",
+                         "body": response["held"], "more_body": True})
+                response["held"] = chunk
+
+        try:
+            iterable = self.wsgi_app(environ, start_response)
+            try:
+                for chunk in iterable:
+                    write(chunk)
+            finally:
+                if hasattr(iterable, "close"):
+                    iterable.close()
+            start()
+            put({"type": "http.response.body",
+                 "body": response.get("held", b""), "more_body": False})
+        finally:
+            put(None)
+
+
+async def respond(app, scope, body):
+    """
+    Runs an ASGI application on a request.
+
+    Return:
+        The status code, the headers and the body of the response, None
+        when the application sent no response.
+    """
+    sent = [False]
+    response = {"body": []}
+
+    async def receive():
+        """Returns the whole body at once, then a disconnect"""
+        if sent[0]:
+            return {"type": "http.disconnect"}
+        sent[0] = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        """Collects the response"""
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = message.get("headers", [])
+        elif message["type"] == "http.response.body":
+            response["body"].append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    if "status" not in response:
+        return None
+    return response["status"], response["headers"], b"".join(
+        response["body"])
+
+
+def render_head(status, headers, keep_alive, length=None):
+    """
+    Returns the bytes of the status line and the headers of an HTTP/1.1
+    response, whose body is chunked when its length is None
+    """
+    try:
+        reason = HTTPStatus(status).phrase
+    except ValueError:
+        reason = ""
+    lines = ["HTTP/1.1 {} {}".format(status, reason)]
+    for name, value in headers:
+        name = name.decode("latin-1")
+        if name.lower() not in ("content-length", "connection",
+                                "transfer-encoding"):
+            lines.append("{}: {}".format(name, value.decode("latin-1")))
+    if length is None:
+        lines.append("Transfer-Encoding: chunked")
+    else:
+        lines.append("Content-Length: {}".format(length))
+    lines.append("Connection: " + ("keep-alive" if keep_alive else "close"))
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+def render_response(status, headers, body, keep_alive):
+    """Returns the bytes of an HTTP/1.1 response"""
+    return render_head(status, headers, keep_alive, len(body)) + body
+
+
+async def stream(app, scope, body, writer, keep_alive, chunked):
+    """
+    Runs an ASGI application on a request and writes its response: a
+    response sent in one message gets a Content-Length, a streamed one
+    is written chunk by chunk with the chunked transfer encoding, or
+    buffered when chunked is False (HTTP/1.0 clients).
+
+    Return:
+        False when the application sent no response.
+    """
+    sent = [False]
+    response = {"body": []}
+
+    async def receive():
+        """Returns the whole body at once, then a disconnect"""
+        if sent[0]:
+            return {"type": "http.disconnect"}
+        sent[0] = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        """Writes the response"""
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = message.get("headers", [])
+            return
+        if message["type"] != "http.response.body":
+            return
+        chunk = message.get("body", b"")
+        more = message.get("more_body", False)
+        if not response.get("streaming"):
+            if not more or not chunked:
+                response["body"].append(chunk)
+                if not more:
+                    writer.write(render_response(
+                        response["status"], response["headers"],
+                        b"".join(response["body"]), keep_alive))
+                    await writer.drain()
+                return
+            response["streaming"] = True
+            writer.write(render_head(response["status"],
+                                     response["headers"], keep_alive))
+        if chunk:
+            writer.write(b"%x\r\n" % len(chunk) + chunk + b"\r\n")
+        if not more:
+            writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    await app(scope, receive, send)
+    return "status" in response
+
+
+async def serve_connection(app, reader, writer):
+    """Serves the requests of a keep-alive connection"""
+    server = writer.get_extra_info("sockname")
+    client = writer.get_extra_info("peername")
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                    ConnectionError):
+                return
+            try:
+                lines = head.decode("latin-1").split("\r\n")
+                method, target, version = lines[0].split(" ", 2)
+                headers = []
+                for line in lines[1:]:
+                    if line:
+                        name, value = line.split(":", 1)
+                        headers.append((name.strip().lower(), value.strip()))
+                fields = dict(headers)
+                length = fields.get("content-length", "0")
+                if not (length.isascii() and length.isdigit()):
+                    raise ValueError("invalid Content-Length")
+                length = int(length)
+                if "transfer-encoding" in fields:
+                    raise ValueError("chunked requests are not supported")
+            except ValueError:
+                writer.write(render_response(400, [], b"", False))
+                return
+            if length > MAX_BODY_BYTES:
+                writer.write(render_response(413, [], b"", False))
+                return
+            body = await reader.readexactly(length)
+            connection = fields.get("connection", "").lower()
+            keep_alive = connection != "close" if version == "HTTP/1.1" \
+                else connection == "keep-alive"
+            path, _, query = target.partition("?")
+            scope = {"type": "http", "asgi": {"version": "3.0"},
+                     "http_version": version.split("/", 1)[-1],
+                     "method": method, "scheme": "http", "root_path": "",
+                     "path": unquote(path),
+                     "raw_path": path.encode("latin-1"),
+                     "query_string": query.encode("latin-1"),
+                     "headers": [(name.encode("latin-1"),
+                                  value.encode("latin-1"))
+                                 for name, value in headers],
+                     "server": server[:2] if server else None,
+                     "client": client[:2] if client else None}
+            if not await stream(app, scope, body, writer, keep_alive,
+                                version == "HTTP/1.1"):
+                writer.write(render_response(500, [], b"", keep_alive))
+                await writer.drain()
+            if not keep_alive:
+                return
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return
+    finally:
+        writer.close()
+
+
+async def start_server(app, host, port):
+    """
+    Starts serving an ASGI application over HTTP/1.1 on the running loop.
+
+    Return:
+        The asyncio.Server, port 0 binds a free port.
+    """
+    async def handle(reader, writer):
+        """Serves a connection"""
+        await serve_connection(app, reader, writer)
+
+    return await asyncio.start_server(handle, host, port,
+                                      limit=MAX_HEADER_BYTES, backlog=4096)
+
+
+def run(app, host, port, ready=None):
+    """
+    Serves an ASGI application with the builtin server until SIGTERM or
+    SIGINT, then shuts the application down.
+
+    Args:
+        app (callable): the ASGI application.
+        host (str): address to bind.
+        port (int): port to bind, 0 for a free one.
+        ready (callable): called with the bound port once listening.
+    """
+    async def main():
+        """Starts the server then serves until SIGTERM or SIGINT"""
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(signum, stop.set)
+            except (NotImplementedError, RuntimeError, ValueError):
+                # not the main thread, or no signals on this platform
+                pass
+        server = await start_server(app, host, port)
+        if ready is not None:
+            ready(server.sockets[0].getsockname()[1])
+        async with server:
+            await stop.wait()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # exit like app.py on SIGTERM: the pending saves are written
+        if hasattr(app, "shutdown"):
+            app.shutdown()
+
+
+app = AsgiApp(flask_app, int(getenv("HBNB_API_WORKERS", 16)))
+
+
+def main(argv=None):
+    """Entry point of the ASGI server"""
+    parser = argparse.ArgumentParser(description="HBNB API ASGI server")
+    parser.add_argument("--host", default=getenv("HBNB_API_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int,
+                        default=int(getenv("HBNB_API_PORT", 5000)))
+    parser.add_argument("--workers", type=int,
+                        default=int(getenv("HBNB_API_WORKERS", 16)),
+                        help="threads running the requests")
+    parser.add_argument("--server", default="auto",
+                        choices=("auto", "uvicorn", "builtin"))
+    args = parser.parse_args(argv)
+    asgi_app = AsgiApp(flask_app, args.workers)
+    if args.server != "builtin":
+        try:
+            import uvicorn
+        except ImportError:
+            if args.server == "uvicorn":
+                raise
+        else:
+            return uvicorn.run(asgi_app, host=args.host, port=args.port,
+                               log_level="warning")
+    run(asgi_app, args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
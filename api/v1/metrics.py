@@ -0,0 +1,146 @@
+#!/usr/bin/python3
+"""
+Request and storage metrics for the API v1, exported in the Prometheus text
+exposition format
+"""
+from bisect import bisect_left
+from threading import Lock
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576)
+STORAGE_GAUGES = ("write_behind_pending", "write_behind_lag_seconds",
+                  "write_behind_max_lag_seconds", "cache_objects")
+
+
+class Histogram:
+    """
+    Cumulative histogram with fixed upper bounds
+
+    Attributes:
+        buckets (tuple): sorted upper bounds of the buckets.
+        counts (list): number of observations per bucket, the last slot
+                       holds the observations above the highest bound.
+        sum (float): sum of all observed values.
+        count (int): number of observations.
+    """
+
+    def __init__(self, buckets):
+        """Initializes an empty histogram for the given bucket bounds"""
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        """Records one observation"""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """Returns a list of (upper bound label, cumulative count) pairs"""
+        pairs = []
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            pairs.append((repr(float(bound)), total))
+        pairs.append(("+Inf", self.count))
+        return pairs
+
+
+class Metrics:
+    """
+    Thread safe registry of the per route request metrics
+
+    Attributes:
+        __latency (dict): (method, route) -> latency Histogram in seconds.
+        __sizes (dict): (method, route) -> response size Histogram in bytes.
+        __statuses (dict): (method, route, status) -> number of responses.
+    """
+
+    def __init__(self):
+        """Initializes an empty registry"""
+        self.__lock = Lock()
+        self.__latency = {}
+        self.__sizes = {}
+        self.__statuses = {}
+
+    def observe(self, method, route, status, seconds, size=None):
+        """
+        Records a served request.
+
+        Args:
+            method (str): HTTP method of the request.
+            route (str): URL rule that matched the request.
+            status (int): HTTP status code of the response.
+            seconds (float): time spent serving the request.
+            size (int): length of the response body, None when unknown.
+        """
+        key = (method, route)
+        with self.__lock:
+            latency = self.__latency.get(key)
+            if latency is None:
+                latency = self.__latency[key] = Histogram(LATENCY_BUCKETS)
+                self.__sizes[key] = Histogram(SIZE_BUCKETS)
+            latency.observe(seconds)
+            if size is not None:
+                self.__sizes[key].observe(size)
+            key = (method, route, status)
+            self.__statuses[key] = self.__statuses.get(key, 0) + 1
+
+    def reset(self):
+        """Forgets every recorded request"""
+        with self.__lock:
+            self.__latency.clear()
+            self.__sizes.clear()
+            self.__statuses.clear()
+
+    def render(self, storage_stats=None):
+        """
+        Returns the metrics in the Prometheus text exposition format.
+
+        Args:
+            storage_stats (dict): counters returned by storage.stats().
+        """
+        lines = []
+        with self.__lock:
+            self.__render_histograms(lines, "hbnb_http_request_duration_"
+                                     "seconds", "Request latency by route.",
+                                     self.__latency)
+            self.__render_histograms(lines, "hbnb_http_response_size_bytes",
+                                     "Response payload size by route.",
+                                     self.__sizes)
+            lines.append("# HELP hbnb_http_responses_total Responses by "
+                         "route and status.")
+            lines.append("# TYPE hbnb_http_responses_total counter")
+            for (method, route, status), value in \
+                    sorted(self.__statuses.items()):
+                lines.append('hbnb_http_responses_total{{method="{}",'
+                             'route="{}",status="{}"}} {}'
+                             .format(method, route, status, value))
+        for name, value in sorted((storage_stats or {}).items()):
+            if name in STORAGE_GAUGES:
+                metric = "hbnb_storage_{}".format(name)
+                lines.append("# TYPE {} gauge".format(metric))
+            else:
+                metric = "hbnb_storage_{}_total".format(name)
+                lines.append("# TYPE {} counter".format(metric))
+            lines.append("{} {}".format(metric, value))
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def __render_histograms(lines, name, doc, histograms):
+        """Appends the lines of a family of histograms to lines"""
+        lines.append("# HELP {} {}".format(name, doc))
+        lines.append("# TYPE {} histogram".format(name))
+        for (method, route), hist in sorted(histograms.items()):
+            labels = 'method="{}",route="{}"'.format(method, route)
+            for bound, total in hist.cumulative():
+                lines.append('{}_bucket{{{},le="{}"}} {}'
+                             .format(name, labels, bound, total))
+            lines.append("{}_sum{{{}}} {}".format(name, labels, hist.sum))
+            lines.append("{}_count{{{}}} {}".format(name, labels, hist.count))
+
+
+metrics = Metrics()
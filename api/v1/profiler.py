@@ -0,0 +1,103 @@
+#!/usr/bin/python3
+"""
+Opt-in cProfile hook for the API v1 and the report of the hotspots
+
+The hook is installed by api.v1.app when HBNB_API_PROFILE_DIR is set and only
+profiles the requests sent with the "X-Profile: 1" header. Each profiled
+request is dumped to its own .prof file, the files are aggregated with:
+
+    python3 -m api.v1.profiler <directory> [-n TOP] [-s SORT]
+"""
+import argparse
+import cProfile
+from flask import g, request
+from itertools import count
+import os
+import pstats
+import re
+import sys
+import time
+
+HEADER = 'X-Profile'
+
+
+class RequestProfiler:
+    """
+    Profiles the flagged requests and dumps one file per request
+
+    Attributes:
+        directory (str): where the .prof files are written.
+    """
+
+    def __init__(self, directory):
+        """Creates the dump directory if needed"""
+        self.directory = directory
+        self.__sequence = count()
+        os.makedirs(directory, exist_ok=True)
+
+    def init_app(self, app):
+        """Registers the request hooks of the profiler on app"""
+        app.before_request(self.start)
+        app.after_request(self.stop)
+        app.teardown_request(self.discard)
+
+    def start(self):
+        """Enables a profiler for the request when it asks for one"""
+        if request.headers.get(HEADER) == '1':
+            g.profiler = cProfile.Profile()
+            g.profiler.enable()
+
+    def stop(self, response):
+        """Disables the profiler of the request and dumps its stats"""
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.disable()
+            rule = request.url_rule.rule if request.url_rule else 'unmatched'
+            name = '{}-{}-{}-{}-{}.prof'.format(
+                int(time.time() * 1000), request.method,
+                re.sub(r'[^A-Za-z0-9]+', '_', rule).strip('_'),
+                os.getpid(), next(self.__sequence))
+            profiler.dump_stats(os.path.join(self.directory, name))
+            response.headers['X-Profile-File'] = name
+        return response
+
+    def discard(self, exception=None):
+        """Disables the profiler of a request that failed before stop"""
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.disable()
+
+
+def report(directory, top=20, sort='tottime', stream=sys.stdout):
+    """
+    Prints the top functions across all the profiles of directory.
+
+    Args:
+        directory (str): directory holding the .prof files.
+        top (int): number of functions to print.
+        sort (str): pstats sort key, tottime or cumulative for instance.
+        stream (file): where the report is written.
+    Return:
+        The number of aggregated profiles.
+    """
+    files = sorted(os.path.join(directory, name)
+                   for name in os.listdir(directory)
+                   if name.endswith('.prof'))
+    if not files:
+        print("No profile in {}".format(directory), file=stream)
+        return 0
+    stats = pstats.Stats(files[0], stream=stream)
+    for path in files[1:]:
+        stats.add(path)
+    print("Aggregated {} request profiles".format(len(files)), file=stream)
+    stats.strip_dirs().sort_stats(sort).print_stats(top)
+    return len(files)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Top-N request hotspots')
+    parser.add_argument('directory')
+    parser.add_argument('-n', '--top', type=int, default=20)
+    parser.add_argument('-s', '--sort', default='tottime')
+    args = parser.parse_args()
+    report(args.directory, args.top, args.sort)
@@ -15,3 +15,5 @@ from api.v1.views.cities import *
 from api.v1.views.users import *
 from api.v1.views.places import *
 from api.v1.views.places_reviews import *
+from api.v1.views.metrics import *
+from api.v1.views.export import *
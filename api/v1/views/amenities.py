@@ -36,8 +36,7 @@ def all_amenities():
             }
           ]
     """
-    amenities = storage.all(Amenity)
-    amenities = [amenity.to_dict() for amenity in amenities.values()]
+    amenities = [amenity.to_dict() for amenity in storage.iter(Amenity)]
     return jsonify(amenities), 200
 
 
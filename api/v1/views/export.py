@@ -0,0 +1,82 @@
+#!/usr/bin/python3
+"""
+Route of the NDJSON bulk export of the objects of the storage
+"""
+
+from api.v1.views import app_views
+from flask import Response, jsonify, request, stream_with_context
+import hmac
+import json
+from models import storage
+from models.engine.backup import model_classes
+from models.engine.serializers import default
+from os import getenv
+
+CHUNK_SIZE = 1 << 16
+
+
+def export_lines(names=None):
+    """
+    Yields chunks of the NDJSON export of the objects of the given
+    classes, all if None, read from a single storage.records() stream so
+    that a database storage exports one consistent view
+    """
+    chunk = []
+    size = 0
+    for record in storage.records(names):
+        record.pop("password", None)
+        line = json.dumps(record, default=default) + "\n"
+        chunk.append(line)
+        size += len(line)
+        if size >= CHUNK_SIZE:
+            yield "".join(chunk)
+            chunk = []
+            size = 0
+    if chunk:
+        yield "".join(chunk)
+
+
+@app_views.route('/admin/export', strict_slashes=False, methods=['GET'])
+def export_objects():
+    """ Method for the "/admin/export" path GET
+    Streams every object of the requested classes, one JSON object per line
+    ---
+    tags:
+      - Admin
+    parameters:
+      - name: class
+        in: query
+        type: string
+        required: false
+        description: class names, repeated or comma separated, all if none
+      - name: Authorization
+        in: header
+        type: string
+        required: true
+        description: Bearer and the token of HBNB_API_ADMIN_TOKEN
+    responses:
+      200:
+        description: The objects in application/x-ndjson, the classes in
+                     foreign key order and without the user passwords
+      400:
+        description: Unknown class
+      401:
+        description: Missing or wrong token
+      403:
+        description: HBNB_API_ADMIN_TOKEN is not set
+    """
+    token = getenv('HBNB_API_ADMIN_TOKEN')
+    if not token:
+        return jsonify({'error': 'Admin routes disabled'}), 403
+    given = request.headers.get('Authorization', '')
+    if not hmac.compare_digest(given.encode(),
+                               ('Bearer ' + token).encode()):
+        return jsonify({'error': 'Unauthorized'}), 401
+    classes = model_classes()
+    asked = {name.strip() for value in request.args.getlist('class')
+             for name in value.split(',') if name.strip()}
+    for name in asked:
+        if name not in classes:
+            return jsonify({'error': 'Unknown class {}'.format(name)}), 400
+    return Response(stream_with_context(export_lines(asked or None)),
+                    mimetype='application/x-ndjson')
@@ -0,0 +1,43 @@
+#!/usr/bin/python3
+"""
+Route Metrics and the request instrumentation of the app_views blueprint
+"""
+
+from api.v1.views import app_views
+from api.v1.metrics import metrics as request_metrics
+from flask import g, request
+from models import storage
+from time import perf_counter
+
+
+@app_views.before_request
+def start_timer():
+    """Stamps the start time of the request"""
+    g.metrics_start = perf_counter()
+
+
+@app_views.after_request
+def record_request(response):
+    """Records latency, status and payload size of the request"""
+    start = g.pop('metrics_start', None)
+    if start is not None and request.url_rule is not None:
+        size = None if response.is_streamed else response.content_length
+        request_metrics.observe(request.method, request.url_rule.rule,
+                                response.status_code, perf_counter() - start,
+                                size)
+    return response
+
+
+@app_views.route('/metrics', strict_slashes=False, methods=['GET'])
+def get_metrics():
+    """ Method for the "/metrics" path GET
+    Returns request and storage metrics in the Prometheus text format
+    ---
+    tags:
+      - Metrics
+    responses:
+      200:
+        description: The metrics in text/plain; version=0.0.4
+    """
+    body = request_metrics.render(storage.stats())
+    return body, 200, {'Content-Type': 'text/plain; version=0.0.4'}
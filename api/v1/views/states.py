@@ -37,8 +37,7 @@ def all_states():
             }
           ]
     """
-    states = storage.all(State)
-    states = [state.to_dict() for state in states.values()]
+    states = [state.to_dict() for state in storage.iter(State)]
     return jsonify(states), 200
 
 
@@ -6,6 +6,20 @@ Route
 from api.v1.views import app_views, User
 from flask import jsonify, abort, request
 from models import storage
+from sqlalchemy.exc import IntegrityError
+
+
+def save_user(user):
+    """
+    Saves a user, returns the 409 response of a taken email or None. The
+    database storage enforces the unique users.email.
+    """
+    try:
+        user.save()
+    except IntegrityError:
+        storage.rollback()
+        return jsonify({'error': 'Email already exists'}), 409
+    return None
 
 
 @app_views.route('/users', strict_slashes=False, methods=['GET'])
@@ -42,8 +56,7 @@ def all_users():
             }
           ]
     """
-    users = storage.all(User)
-    users = [user.to_dict() for user in users.values()]
+    users = [user.to_dict() for user in storage.iter(User)]
     return jsonify(users), 200
 
 
@@ -106,8 +119,9 @@ def create_user():
     if 'password' not in body:
         return jsonify({'error': 'Missing password'}), 400
     new_user = User(**body)
-    storage.new(new_user)
-    storage.save()
+    error = save_user(new_user)
+    if error:
+        return error
     return jsonify(new_user.to_dict()), 201
 
 
@@ -122,6 +136,8 @@ def update_user(id):
         for key in body:
             if key != 'id' and key != 'created_at' and key != 'updated_at':
                 setattr(user, key, body[key])
-        user.save()
+        error = save_user(user)
+        if error:
+            return error
         return jsonify(user.to_dict()), 200
     return abort(404)
@@ -0,0 +1,116 @@
+#!/usr/bin/python3
+"""
+Benchmarks of every route of the app_views blueprint through the Flask test
+client, so that only the application and the storage are measured
+"""
+from benchmarks.results import summarize
+import random
+import re
+from time import perf_counter
+import uuid
+
+# first segment of a path -> class of the ids following it
+SEGMENTS = {"states": "State", "cities": "City", "amenities": "Amenity",
+            "users": "User", "places": "Place", "reviews": "Review"}
+
+
+def routes(app):
+    """
+    Returns the sorted (method, rule) pairs of the app_views blueprint, the
+    admin routes, which need a token, left out
+    """
+    pairs = set()
+    for rule in app.url_map.iter_rules():
+        if rule.endpoint.startswith('app_views.') and \
+                '/admin/' not in rule.rule:
+            for method in rule.methods - {'HEAD', 'OPTIONS'}:
+                pairs.add((method, rule.rule))
+    return sorted(pairs)
+
+
+def target(rule):
+    """Returns the name of the class created or listed by a rule"""
+    return SEGMENTS.get(rule.rstrip('/').split('/')[-1])
+
+
+def fill(rule, pick):
+    """
+    Replaces every <variable> of a rule by an id.
+
+    Args:
+        rule (str): URL rule, like /api/v1/states/<state_id>/cities.
+        pick (function): class name -> id of an object of that class.
+    """
+    parts = rule.split('/')
+    for i, part in enumerate(parts):
+        if re.match(r'^<.*>$', part):
+            parts[i] = pick(SEGMENTS[parts[i - 1]])
+    return '/'.join(parts)
+
+
+def body(name, pick):
+    """Returns a valid JSON body to create an object of class name"""
+    return {"State": {"name": "Bench"},
+            "City": {"name": "Bench"},
+            "Amenity": {"name": "Bench"},
+            "User": {"email": "bench-{}@hbnb.io".format(uuid.uuid4().hex),
+                     "password": "bench"},
+            "Place": {"name": "Bench", "user_id": pick("User")},
+            "Review": {"text": "Bench", "user_id": pick("User")}}[name]
+
+
+def run(app, ids, repeat=5, seed=0):
+    """
+    Measures every route of the blueprint.
+
+    The GET routes are sampled on random objects of the dataset, the POST
+    routes create repeat objects that the PUT routes update and the DELETE
+    routes remove, leaving the dataset unchanged.
+
+    Args:
+        app (flask.Flask): the API application.
+        ids (dict): class name -> ids of the objects of the dataset.
+        repeat (int): number of requests per route.
+    Return:
+        Dict of "METHOD rule" -> summary of the samples.
+    """
+    rng = random.Random(seed)
+    client = app.test_client()
+    created = {}
+    results = {}
+
+    def pick(name):
+        """Returns a random id of the dataset"""
+        return rng.choice(ids[name])
+
+    def time_request(method, url, json=None):
+        """Returns the duration of a request and its JSON response"""
+        start = perf_counter()
+        response = client.open(url, method=method, json=json)
+        elapsed = perf_counter() - start
+        if response.status_code >= 400:
+            raise RuntimeError("{} {} answered {}".format(
+                method, url, response.status_code))
+        return elapsed, response.get_json(silent=True)
+
+    order = {'POST': 0, 'GET': 1, 'PUT': 2, 'DELETE': 3}
+    for method, rule in sorted(routes(app), key=lambda r: order[r[0]]):
+        samples = []
+        for _ in range(repeat):
+            if method == 'POST':
+                name = target(rule)
+                elapsed, obj = time_request(method, fill(rule, pick),
+                                            body(name, pick))
+                created.setdefault(name, []).append(obj['id'])
+            elif method == 'GET':
+                elapsed, _ = time_request(method, fill(rule, pick))
+            else:
+                name = SEGMENTS[rule.split('/')[-2]]
+                mine = created[name]
+                id = mine[-1] if method == 'PUT' else mine.pop()
+                url = fill(rule, lambda _: id)
+                elapsed, _ = time_request(method, url, {"name": "Renamed"}
+                                          if method == 'PUT' else None)
+            samples.append(elapsed)
+        results["{} {}".format(method, rule)] = summarize(samples)
+    return results
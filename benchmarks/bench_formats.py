@@ -0,0 +1,132 @@
+#!/usr/bin/python3
+"""
+Save and reload of the FileStorage in every file format and compression
+
+    python3 -m benchmarks.bench_formats --scale 100k --repeat 3 -o fmt.json \
+        --compression none gzip zstd
+
+The dataset is loaded once, then for every format and compression the
+storage is saved repeat times and reloaded repeat times from an empty
+memory, so that every record of the file is decoded and turned into an
+object again. The file sizes and the timings are printed, and written in
+the results format of benchmarks.run with one backend per format, named
+<format>+<compression> when compressed.
+
+With --memory one more reload runs under tracemalloc: its peak and the
+memory still held by the objects after it are recorded, their difference
+is the transient memory of the parsing.
+"""
+import argparse
+import os
+import sys
+import tempfile
+from time import perf_counter
+import tracemalloc
+
+FORMATS = ("json", "binary")
+
+
+def trace_reload(storage):
+    """
+    Reloads the storage from an empty memory under tracemalloc.
+
+    Return:
+        The peak of the allocated bytes during the reload and the bytes
+        still allocated after it.
+    """
+    storage.reset()
+    tracemalloc.start()
+    storage.reload()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, retained
+
+
+def run_format(storage, name, repeat, compression="none", memory=False):
+    """
+    Measures the save and the reload of a format and compression.
+
+    Return:
+        Dict of metric name -> summary, and the size of the file.
+    """
+    from benchmarks.results import summarize
+    storage.set_format(name)
+    storage.set_compression(compression)
+    objects = dict(storage.all())
+    saves = []
+    for _ in range(repeat):
+        start = perf_counter()
+        storage.save()
+        saves.append(perf_counter() - start)
+    size = os.path.getsize("file.json")
+    reloads = []
+    for _ in range(repeat):
+        storage.reset()
+        start = perf_counter()
+        storage.reload()
+        reloads.append(perf_counter() - start)
+        if len(storage.all()) != len(objects):
+            raise RuntimeError("{} lost objects".format(name))
+    peak = retained = None
+    if memory:
+        peak, retained = trace_reload(storage)
+    storage.reset(objects)
+    results = {"FileStorage.save": summarize(saves),
+               "FileStorage.reload": summarize(reloads)}
+    results["FileStorage.save"]["bytes"] = size
+    if memory:
+        results["FileStorage.reload"]["peak_bytes"] = peak
+        results["FileStorage.reload"]["retained_bytes"] = retained
+    return results, size
+
+
+def main(argv=None):
+    """Entry point of the format benchmark"""
+    parser = argparse.ArgumentParser(
+        description="FileStorage save and reload per file format")
+    parser.add_argument("--scale", default="1k",
+                        help="1k, 100k, 1m or a number of objects")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", nargs="+", default=list(FORMATS),
+                        choices=FORMATS)
+    parser.add_argument("--compression", nargs="+", default=["none"],
+                        choices=("none", "gzip", "zstd"))
+    parser.add_argument("--memory", action="store_true",
+                        help="trace the memory of a reload")
+    parser.add_argument("-o", "--output")
+    args = parser.parse_args(argv)
+    output = os.path.abspath(args.output) if args.output else None
+    os.environ["HBNB_TYPE_STORAGE"] = "file"
+    with tempfile.TemporaryDirectory() as cwd:
+        os.chdir(cwd)
+        from benchmarks import dataset, results as bench_results
+        from models import storage
+        dataset.load(storage, dataset.parse_scale(args.scale), args.seed)
+        results = {}
+        runs = [(name, compression) for compression in args.compression
+                for name in args.format]
+        for name, compression in runs:
+            backend = name if compression == "none" else \
+                name + "+" + compression
+            results[backend], size = run_format(storage, name, args.repeat,
+                                                compression, args.memory)
+            save = results[backend]["FileStorage.save"]["median"]
+            reload = results[backend]["FileStorage.reload"]["median"]
+            print("  {:<12} {:>12,d} bytes  save {:>9.1f} ms  reload"
+                  " {:>9.1f} ms".format(backend, size, save * 1000,
+                                        reload * 1000), file=sys.stdout)
+            if args.memory:
+                traced = results[backend]["FileStorage.reload"]
+                print("  {:<12} reload peak {:>12,d} bytes, retained {:>12,d}"
+                      " bytes".format("", traced["peak_bytes"],
+                                      traced["retained_bytes"]),
+                      file=sys.stdout)
+        if output:
+            meta = bench_results.metadata(scale=args.scale,
+                                          repeat=args.repeat)
+            bench_results.save(output, meta, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/python3
+"""
+Memory and lookups of the FileStorage against the memory-mapped store
+
+    python3 -m benchmarks.bench_mapped --scale 100k --gets 10000 -o map.json
+
+The dataset is written once in the binary format, the file is then reloaded
+by a FileStorage and by a MappedStorage. For each of them the reload time,
+the memory still allocated after the reload (tracemalloc), the latency of
+get() on a working set of random ids and of count() are measured. The
+results are printed, and written in the results format of benchmarks.run
+with one backend per storage.
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import tempfile
+from time import perf_counter
+import tracemalloc
+
+BACKENDS = ("file", "mapped")
+
+
+def open_storage(backend, path):
+    """Returns an empty storage of a backend reading the file at path"""
+    if backend == "mapped":
+        from models.engine.mapped_storage import MappedStorage
+        return MappedStorage(path)
+    from models.engine.file_storage import FileStorage
+    FileStorage._FileStorage__file_path = path
+    storage = FileStorage()
+    storage.reset()
+    return storage
+
+
+def run_backend(backend, path, keys, gets, repeat):
+    """
+    Measures a backend on the file at path.
+
+    Args:
+        keys (list): (class, id) of the working set read by get().
+        gets (int): number of get() calls.
+    Return:
+        Dict of metric name -> summary, and the bytes still allocated
+        after the reload.
+    """
+    from benchmarks.results import summarize
+    from models.engine.file_storage import classes
+    prefix = "FileStorage" if backend == "file" else "MappedStorage"
+    reloads = []
+    for _ in range(repeat):
+        storage = open_storage(backend, path)
+        gc.collect()
+        start = perf_counter()
+        storage.reload()
+        reloads.append(perf_counter() - start)
+    storage = None
+    gc.collect()
+    tracemalloc.start()
+    storage = open_storage(backend, path)
+    storage.reload()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    rng = random.Random(0)
+    samples = []
+    for _ in range(gets):
+        name, id = rng.choice(keys)
+        start = perf_counter()
+        obj = storage.get(classes[name], id)
+        samples.append(perf_counter() - start)
+        if obj is None:
+            raise RuntimeError("{} lost {}.{}".format(backend, name, id))
+    counts = []
+    for _ in range(repeat):
+        for cls in classes.values():
+            start = perf_counter()
+            storage.count(cls)
+            counts.append(perf_counter() - start)
+    results = {prefix + ".reload": summarize(reloads),
+               prefix + ".get": summarize(samples),
+               prefix + ".count": summarize(counts)}
+    results[prefix + ".reload"]["bytes"] = memory
+    # releases the objects of the FileStorage before the next backend
+    open_storage(backend, path)
+    return results, memory
+
+
+def main(argv=None):
+    """Entry point of the memory-mapped store benchmark"""
+    parser = argparse.ArgumentParser(
+        description="FileStorage against the memory-mapped store")
+    parser.add_argument("--scale", default="1k",
+                        help="1k, 100k, 1m or a number of objects")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--gets", type=int, default=10000)
+    parser.add_argument("--working-set", type=int, default=1000,
+                        help="number of distinct ids read by get()")
+    parser.add_argument("--backend", nargs="+", default=list(BACKENDS),
+                        choices=BACKENDS)
+    parser.add_argument("-o", "--output")
+    args = parser.parse_args(argv)
+    output = os.path.abspath(args.output) if args.output else None
+    os.environ["HBNB_TYPE_STORAGE"] = "file"
+    with tempfile.TemporaryDirectory() as cwd:
+        os.chdir(cwd)
+        from benchmarks import dataset, results as bench_results
+        from models.engine.mapped_storage import MappedStorage
+        path = os.path.join(cwd, "file.hbnb")
+        ids = dataset.load(MappedStorage(path, cache_size=0),
+                           dataset.parse_scale(args.scale), args.seed)
+        keys = [(name, id) for name, class_ids in ids.items()
+                for id in class_ids]
+        ids = None
+        keys = random.Random(args.seed).sample(
+            keys, min(args.working_set, len(keys)))
+        results = {}
+        for backend in args.backend:
+            results[backend], memory = run_backend(backend, path, keys,
+                                                   args.gets, args.repeat)
+            prefix = "FileStorage" if backend == "file" else "MappedStorage"
+            reload = results[backend][prefix + ".reload"]["median"]
+            get = results[backend][prefix + ".get"]["median"]
+            print("  {:<8} reload {:>9.1f} ms  {:>12,d} bytes  get"
+                  " {:>7.2f} us".format(backend, reload * 1000, memory,
+                                        get * 1e6), file=sys.stdout)
+        if output:
+            meta = bench_results.metadata(scale=args.scale,
+                                          repeat=args.repeat,
+                                          gets=args.gets,
+                                          working_set=args.working_set)
+            bench_results.save(output, meta, results)
+
+
+if __name__ == "__main__":
+    main()
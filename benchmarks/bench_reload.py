@@ -0,0 +1,94 @@
+#!/usr/bin/python3
+"""
+Speedup of the parallel reload of the FileStorage with the number of cores
+
+    python3 -m benchmarks.bench_reload --scale 100k --workers 1 2 4 8
+
+The dataset is saved once per layout (single file and sharded), in the
+binary format by default since a JSON file is read whole by one worker
+(the shards are still spread over the workers), then for every number of
+workers the storage is reloaded repeat times from an empty
+memory, every class being read at once. The timings and the speedup over
+one worker are printed, and written in the results format of
+benchmarks.run with one backend per layout and number of workers,
+<layout>-<workers>. The number of cores is part of the metadata: there is
+no speedup to expect beyond it.
+"""
+import argparse
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+
+def run_workers(storage, workers, repeat, count):
+    """
+    Measures the reload of every class with a number of workers.
+
+    Return:
+        Dict of metric name -> summary.
+    """
+    from benchmarks.results import summarize
+    storage.set_reload_workers(workers)
+    reloads = []
+    for _ in range(repeat):
+        storage.reset()
+        start = perf_counter()
+        storage.reload()
+        if len(storage.all()) != count:
+            raise RuntimeError("{} workers lost objects".format(workers))
+        reloads.append(perf_counter() - start)
+    return {"FileStorage.reload": summarize(reloads)}
+
+
+def main(argv=None):
+    """Entry point of the parallel reload benchmark"""
+    parser = argparse.ArgumentParser(
+        description="FileStorage reload time per number of processes")
+    parser.add_argument("--scale", default="1k",
+                        help="1k, 100k, 1m or a number of objects")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--layout", nargs="+", default=["single", "sharded"],
+                        choices=("single", "sharded"))
+    parser.add_argument("--format", default="binary",
+                        choices=("json", "binary"))
+    parser.add_argument("-o", "--output")
+    args = parser.parse_args(argv)
+    output = os.path.abspath(args.output) if args.output else None
+    os.environ["HBNB_TYPE_STORAGE"] = "file"
+    with tempfile.TemporaryDirectory() as cwd:
+        os.chdir(cwd)
+        from benchmarks import dataset, results as bench_results
+        from models import storage
+        dataset.load(storage, dataset.parse_scale(args.scale), args.seed)
+        storage.set_format(args.format)
+        count = len(storage.all())
+        objects = dict(storage.all())
+        results = {}
+        print("  {} cores".format(os.cpu_count()), file=sys.stdout)
+        for layout in args.layout:
+            storage.set_layout(layout)
+            storage.save()
+            base = None
+            for workers in args.workers:
+                backend = "{}-{}".format(layout, workers)
+                results[backend] = run_workers(storage, workers,
+                                               args.repeat, count)
+                median = results[backend]["FileStorage.reload"]["median"]
+                base = base or median
+                print("  {:<8} {:>2} workers  reload {:>9.1f} ms  speedup"
+                      " {:>5.2f}x".format(layout, workers, median * 1000,
+                                          base / median), file=sys.stdout)
+            storage.reset(objects)
+        if output:
+            meta = bench_results.metadata(scale=args.scale,
+                                          repeat=args.repeat,
+                                          format=args.format,
+                                          cpu_count=os.cpu_count())
+            bench_results.save(output, meta, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+"""
+Save and reload of the FileStorage in the single file and sharded layouts
+
+    python3 -m benchmarks.bench_shards --scale 100k --repeat 3 -o shards.json
+
+The dataset is saved once per layout. Then repeat times: one State is
+updated and saved (single rewrites every class, sharded the states file
+only), and the storage is reloaded from an empty memory then queried for
+the States (single parses every class, sharded the states file only). The
+timings are printed, and written in the results format of benchmarks.run
+with one backend per layout.
+"""
+import argparse
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+LAYOUTS = ("single", "sharded")
+
+
+def run_layout(storage, layout, repeat):
+    """
+    Measures the save of one object and the reload of one class.
+
+    Return:
+        Dict of metric name -> summary.
+    """
+    from benchmarks.results import summarize
+    from models.state import State
+    storage.set_layout(layout)
+    storage.save()
+    objects = dict(storage.all())
+    state = next(iter(storage.all(State).values()))
+    saves = []
+    for i in range(repeat):
+        state.name = "State {}".format(i)
+        storage.new(state)
+        start = perf_counter()
+        storage.save()
+        saves.append(perf_counter() - start)
+    reloads = []
+    for _ in range(repeat):
+        storage.reset()
+        start = perf_counter()
+        storage.reload()
+        storage.all(State)
+        reloads.append(perf_counter() - start)
+    storage.reset(objects)
+    return {"FileStorage.save_one": summarize(saves),
+            "FileStorage.reload_one_class": summarize(reloads)}
+
+
+def main(argv=None):
+    """Entry point of the layout benchmark"""
+    parser = argparse.ArgumentParser(
+        description="FileStorage save and reload per file layout")
+    parser.add_argument("--scale", default="1k",
+                        help="1k, 100k, 1m or a number of objects")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--layout", nargs="+", default=list(LAYOUTS),
+                        choices=LAYOUTS)
+    parser.add_argument("-o", "--output")
+    args = parser.parse_args(argv)
+    output = os.path.abspath(args.output) if args.output else None
+    os.environ["HBNB_TYPE_STORAGE"] = "file"
+    with tempfile.TemporaryDirectory() as cwd:
+        os.chdir(cwd)
+        from benchmarks import dataset, results as bench_results
+        from models import storage
+        dataset.load(storage, dataset.parse_scale(args.scale), args.seed)
+        results = {}
+        for layout in args.layout:
+            results[layout] = run_layout(storage, layout, args.repeat)
+            save = results[layout]["FileStorage.save_one"]["median"]
+            reload = results[layout]["FileStorage.reload_one_class"]
+            print("  {:<8} save one {:>9.1f} ms  reload one class {:>9.1f}"
+                  " ms".format(layout, save * 1000, reload["median"] * 1000),
+                  file=sys.stdout)
+        if output:
+            meta = bench_results.metadata(scale=args.scale,
+                                          repeat=args.repeat)
+            bench_results.save(output, meta, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/python3
+"""
+Reader throughput of the FileStorage under concurrent writes
+
+    python3 -m benchmarks.bench_snapshot --scale 100k --readers 4 \\
+        --writers 2 --duration 5 -o snapshot.json
+
+The readers repeat a full read of the States, Cities and Users, the way the
+hbnb_filters page and the users listing do, while the writers create and
+delete Cities. Every mode runs for the same duration:
+
+    live: every class is read with storage.all(cls), under the read lock
+    snapshot: the classes are read from one storage.snapshot()
+
+The passes per second and the latency percentiles of a pass are printed and
+written in the results format of benchmarks.run.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+from time import perf_counter
+
+MODES = ("live", "snapshot")
+READ = ("State", "City", "User")
+
+
+def read_live(storage):
+    """Reads the objects of the classes one storage.all() at a time"""
+    return sum(len(obj.id) for name in READ
+               for obj in storage.all(name).values())
+
+
+def read_snapshot(storage):
+    """Reads the objects of the classes from a single snapshot"""
+    snapshot = storage.snapshot()
+    return sum(len(obj.id) for name in READ
+               for obj in snapshot.all(name).values())
+
+
+def run_mode(storage, ids, mode, readers, writers, duration, seed):
+    """
+    Runs the readers of a mode against the writers for duration seconds.
+
+    Return:
+        The latencies of the read passes and the number of writes.
+    """
+    from models.city import City
+
+    read = read_snapshot if mode == "snapshot" else read_live
+    stop = threading.Event()
+    latencies = [[] for _ in range(readers)]
+    writes = [0] * writers
+
+    def reader(n):
+        """Times full read passes until stopped"""
+        while not stop.is_set():
+            start = perf_counter()
+            read(storage)
+            latencies[n].append(perf_counter() - start)
+
+    def writer(n):
+        """Creates and deletes cities until stopped"""
+        rng = random.Random(seed + n)
+        while not stop.is_set():
+            city = City(name="Bench", state_id=rng.choice(ids["State"]))
+            storage.new(city)
+            storage.delete(city)
+            writes[n] += 2
+
+    threads = [threading.Thread(target=reader, args=(n,))
+               for n in range(readers)]
+    threads += [threading.Thread(target=writer, args=(n,))
+                for n in range(writers)]
+    for thread in threads:
+        thread.start()
+    stop.wait(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return [value for values in latencies for value in values], sum(writes)
+
+
+def main(argv=None):
+    """Entry point of the snapshot benchmark"""
+    parser = argparse.ArgumentParser(
+        description="FileStorage reader throughput under writes")
+    parser.add_argument("--scale", default="1k",
+                        help="1k, 100k, 1m or a number of objects")
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--mode", nargs="+", default=list(MODES),
+                        choices=MODES)
+    parser.add_argument("-o", "--output")
+    args = parser.parse_args(argv)
+    output = os.path.abspath(args.output) if args.output else None
+    with tempfile.TemporaryDirectory() as cwd:
+        os.chdir(cwd)
+        from benchmarks import dataset, results as bench_results
+        from models import storage
+        ids = dataset.load(storage, dataset.parse_scale(args.scale),
+                           args.seed)
+        results = {}
+        for mode in args.mode:
+            latencies, writes = run_mode(storage, ids, mode, args.readers,
+                                         args.writers, args.duration,
+                                         args.seed)
+            summary = bench_results.summarize(latencies)
+            summary.update(rps=len(latencies) / args.duration,
+                           writes=writes / args.duration)
+            results["snapshot:{}".format(mode)] = summary
+            print("  {:<10} {:>10.1f} reads/s  p50 {:>8.2f}  p99 {:>8.2f} ms"
+                  "  {:>10.1f} writes/s".format(
+                      mode, summary["rps"], summary["median"] * 1000,
+                      summary["p99"] * 1000, summary["writes"]),
+                  file=sys.stdout)
+        if output:
+            meta = bench_results.metadata(scale=args.scale,
+                                          readers=args.readers,
+                                          writers=args.writers,
+                                          duration=args.duration)
+            bench_results.save(output, meta, {"file": results})
+
+
+if __name__ == "__main__":
+    main()
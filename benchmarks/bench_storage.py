@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+"""
+Benchmarks of the storage engine methods and of the relationship properties
+"""
+from benchmarks.results import measure, summarize
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+import random
+
+classes = {"Amenity": Amenity, "City": City, "Place": Place,
+           "Review": Review, "State": State, "User": User}
+
+
+def run(storage, ids, repeat=5, samples=100, seed=0):
+    """
+    Measures reload, save, all, get, count and the relationship properties.
+
+    Args:
+        storage: the loaded storage engine.
+        ids (dict): class name -> ids of the objects of the dataset.
+        repeat (int): number of runs of the whole store operations.
+        samples (int): number of random objects used by get and properties.
+        seed (int): seed of the choice of the sampled objects.
+    Return:
+        Dict of metric name -> summary of the samples.
+    """
+    rng = random.Random(seed)
+    engine = storage.__class__.__name__
+    results = {}
+
+    def record(name, values):
+        """Stores the summary of a metric"""
+        results["{}.{}".format(engine, name)] = summarize(values)
+
+    record("save", measure(storage.save, repeat))
+    record("reload", measure(storage.reload, repeat))
+    record("all", measure(storage.all, repeat))
+    record("count", measure(storage.count, repeat))
+    for name, cls in sorted(classes.items()):
+        record("all({})".format(name), measure(storage.all, repeat, cls))
+        record("count({})".format(name), measure(storage.count, repeat, cls))
+
+    picked = {name: [rng.choice(ids[name]) for _ in range(samples)]
+              for name in classes if ids.get(name)}
+    get = []
+    for name, values in sorted(picked.items()):
+        for id in values:
+            get += measure(storage.get, 1, classes[name], id)
+    record("get", get)
+
+    for name, attr in (("State", "cities"), ("Place", "reviews"),
+                       ("Place", "amenities"), ("City", "places")):
+        if not hasattr(classes[name], attr):
+            continue
+        objs = [storage.get(classes[name], id) for id in picked[name]]
+        results["{}.{}".format(name, attr)] = summarize(
+            [t for obj in objs for t in measure(getattr, 1, obj, attr)])
+    return results
@@ -0,0 +1,163 @@
+#!/usr/bin/python3
+"""
+Regression gate comparing benchmark results files
+
+    python3 -m benchmarks.compare -b base.json -c new.json \\
+        --track "file:FileStorage.get@p95" "*:GET /api/v1/stats@median"
+
+Several files may be given on each side: the samples of the runs are pooled.
+A tracked metric regresses when its statistic (median, p95, ...) grows by
+more than --threshold, by more than --min-delta-ms, and when the samples
+differ significantly (two-sided Mann-Whitney U test below --alpha). The
+exit status is 1 when at least one tracked metric regressed, when a
+tracked metric of the baseline is missing from the candidate (a renamed
+metric, a crashed suite) or when a pattern given with --track matches no
+metric at all.
+"""
+import argparse
+from fnmatch import fnmatchcase
+from math import erfc, sqrt
+import sys
+from benchmarks import results as bench_results
+
+DEFAULT_TRACK = ("*:*@median", "*:*.get@p95", "*:GET /api/v1/stats@p95")
+STATISTICS = ("min", "median", "p95", "p99", "max")
+
+
+def pool(paths):
+    """Returns backend:metric -> pooled samples of several results files"""
+    pooled = {}
+    for path in paths:
+        data = bench_results.load(path)
+        for backend, metrics in data["results"].items():
+            for name, metric in metrics.items():
+                key = "{}:{}".format(backend, name)
+                pooled.setdefault(key, []).extend(metric["samples"])
+    return pooled
+
+
+def mann_whitney(a, b):
+    """
+    Returns the two-sided p-value that the samples a and b come from the same
+    distribution (normal approximation with ties and continuity correction).
+    """
+    n1, n2 = len(a), len(b)
+    values = sorted([(v, 0) for v in a] + [(v, 1) for v in b])
+    n = n1 + n2
+    rank_a = 0.0
+    ties = 0.0
+    i = 0
+    while i < n:
+        j = i
+        while j + 1 < n and values[j + 1][0] == values[i][0]:
+            j += 1
+        rank = (i + j) / 2.0 + 1
+        rank_a += rank * sum(1 for k in range(i, j + 1) if values[k][1] == 0)
+        t = j - i + 1
+        ties += t ** 3 - t
+        i = j + 1
+    u = rank_a - n1 * (n1 + 1) / 2.0
+    mean = n1 * n2 / 2.0
+    var = n1 * n2 / 12.0 * ((n + 1) - ties / (n * (n - 1)))
+    if var <= 0:
+        return 1.0
+    z = (abs(u - mean) - 0.5) / sqrt(var)
+    return min(1.0, erfc(max(z, 0) / sqrt(2)))
+
+
+def parse_track(spec):
+    """Splits a "backend:metric@statistic" pattern"""
+    pattern, _, stat = spec.rpartition('@')
+    if not pattern or stat not in STATISTICS:
+        raise argparse.ArgumentTypeError(
+            "expected backend:metric@{}".format('|'.join(STATISTICS)))
+    return pattern, stat
+
+
+def compare(base, cand, track, threshold, min_delta, alpha):
+    """
+    Compares the pooled samples of two sides.
+
+    Return:
+        List of dicts (metric, stat, base, cand, delta, p, regressed),
+        one per tracked metric and statistic found on both sides.
+    """
+    rows = []
+    for key in sorted(set(base) & set(cand)):
+        stats = [stat for pattern, stat in track if fnmatchcase(key, pattern)]
+        for stat in sorted(set(stats), key=STATISTICS.index):
+            old = bench_results.summarize(base[key])[stat]
+            new = bench_results.summarize(cand[key])[stat]
+            delta = (new - old) / old if old else 0.0
+            if min(len(base[key]), len(cand[key])) >= 3:
+                p = mann_whitney(base[key], cand[key])
+            else:
+                p = None
+            regressed = (delta > threshold and new - old > min_delta and
+                         (p is None or p < alpha))
+            rows.append({"metric": key, "stat": stat, "base": old,
+                         "cand": new, "delta": delta, "p": p,
+                         "regressed": regressed})
+    return rows
+
+
+def missing(base, cand, track, strict=False):
+    """
+    Returns the tracked metrics that cannot be compared.
+
+    Args:
+        strict (bool): also report the patterns matching no metric.
+    Return:
+        List of (pattern or metric, reason), the metrics of the baseline
+        matched by a pattern and missing from the candidate first.
+    """
+    problems = []
+    for key in sorted(set(base) - set(cand)):
+        if any(fnmatchcase(key, pattern) for pattern, _ in track):
+            problems.append((key, "missing from the candidate"))
+    if strict:
+        keys = set(base) | set(cand)
+        for pattern, stat in track:
+            if not any(fnmatchcase(key, pattern) for key in keys):
+                problems.append(("{}@{}".format(pattern, stat),
+                                 "matches no metric"))
+    return problems
+
+
+def main(argv=None):
+    """Entry point of the regression gate, returns the exit status"""
+    parser = argparse.ArgumentParser(description="HBNB regression gate")
+    parser.add_argument("-b", "--baseline", nargs="+", required=True)
+    parser.add_argument("-c", "--candidate", nargs="+", required=True)
+    parser.add_argument("--track", nargs="+", type=parse_track,
+                        help="backend:metric@stat patterns (fnmatch)")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative growth considered a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=0.05,
+                        help="absolute growth ignored as noise")
+    parser.add_argument("--alpha", type=float, default=0.05,
+                        help="significance level of the U test")
+    args = parser.parse_args(argv)
+    track = args.track or [parse_track(t) for t in DEFAULT_TRACK]
+    base, cand = pool(args.baseline), pool(args.candidate)
+    rows = compare(base, cand, track, args.threshold,
+                   args.min_delta_ms / 1000, args.alpha)
+    for row in rows:
+        print("{:<4} {:<56} {:<6} {:>10.3f} -> {:>10.3f} ms {:>+8.1%}  p={}"
+              .format("FAIL" if row["regressed"] else "ok", row["metric"],
+                      row["stat"], row["base"] * 1000, row["cand"] * 1000,
+                      row["delta"], "n/a" if row["p"] is None
+                      else "{:.3f}".format(row["p"])))
+    problems = missing(base, cand, track, strict=args.track is not None)
+    for name, reason in problems:
+        print("MISS {:<56} {}".format(name, reason))
+    failed = [row for row in rows if row["regressed"]]
+    print("{} regression(s) in {} tracked metric(s)"
+          .format(len(failed), len(rows)))
+    if problems:
+        print("{} tracked metric(s) missing".format(len(problems)))
+    return 1 if failed or problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+#!/usr/bin/python3
+"""
+Synthetic datasets: States -> Cities -> Places -> Reviews, Users, Amenities
+"""
+import models
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+from itertools import accumulate
+import random
+import uuid
+
+SCALES = {"1k": 1000, "100k": 100000, "1m": 1000000}
+
+# share of the total number of objects per class, in foreign key order
+RATIOS = (("State", 0.01), ("Amenity", 0.01), ("City", 0.05),
+          ("User", 0.13), ("Place", 0.30), ("Review", 0.50))
+
+
+def parse_scale(scale):
+    """Returns the number of objects of a scale name (1k, 100k, 1m) or int"""
+    return SCALES.get(str(scale).lower()) or int(scale)
+
+
+# class name -> the classes every object picks a parent from, the places
+# pick their amenities too but may have none
+PARENTS = {"City": ("State",), "Place": ("City", "User"),
+           "Review": ("Place", "User")}
+
+
+def class_counts(total):
+    """Returns the number of objects to generate per class name"""
+    return {name: max(1, int(total * ratio)) for name, ratio in RATIOS}
+
+
+def run_tag():
+    """
+    Returns a new tag of the emails of a dataset: users.email is unique in a
+    database that may already hold the users of other runs.
+    """
+    return uuid.uuid4().hex[:12]
+
+
+def merge_counts(total, counts=None):
+    """
+    Returns the number of objects to generate per class name, the counts
+    given overriding the shares of total.
+
+    Raises:
+        ValueError: if a count is negative or if the objects of a class
+                    would have no parent to pick.
+    """
+    counts = dict(class_counts(total), **(counts or {}))
+    for name, count in counts.items():
+        if count < 0:
+            raise ValueError("negative number of {} objects".format(name))
+    for name, parents in PARENTS.items():
+        for parent in parents:
+            if counts[name] and not counts[parent]:
+                raise ValueError("{} objects need at least one {}".format(
+                    name, parent))
+    return counts
+
+
+def weights(size, skew):
+    """
+    Returns the cumulative Zipf weights of size ranks: the parent of rank r is
+    picked with a probability proportional to 1 / r ** skew (0 is uniform).
+    """
+    return list(accumulate(1.0 / (rank ** skew)
+                           for rank in range(1, size + 1)))
+
+
+def generate(total, seed=0, skew=0.0, counts=None):
+    """
+    Yields linked model instances, parents always before their children.
+
+    Popular parents get more children when skew is positive: a few states
+    hold most of the cities, a few users own most of the places and write
+    most of the reviews, a few places and amenities are the most reviewed
+    and the most offered.
+
+    Args:
+        total (int): approximate number of objects to generate.
+        seed (int): seed of the random generator, same seed same dataset.
+        skew (float): exponent of the Zipf distribution of the parents.
+        counts (dict): class name -> number of objects, overrides total,
+                       see merge_counts().
+    """
+    rng = random.Random(seed)
+    run = run_tag()
+    counts = merge_counts(total, counts)
+    ids = {name: [] for name, _ in RATIOS}
+    cum_weights = {}
+
+    def pick(name, k=1):
+        """Returns the ids of k random, already generated, parents"""
+        if name not in cum_weights:
+            cum_weights[name] = weights(len(ids[name]), skew)
+        return rng.choices(ids[name], cum_weights=cum_weights[name], k=k)
+
+    for i in range(counts["State"]):
+        obj = State(name="State {}".format(i))
+        ids["State"].append(obj.id)
+        yield obj
+    for i in range(counts["Amenity"]):
+        obj = Amenity(name="Amenity {}".format(i))
+        ids["Amenity"].append(obj.id)
+        yield obj
+    for i in range(counts["City"]):
+        obj = City(name="City {}".format(i), state_id=pick("State")[0])
+        ids["City"].append(obj.id)
+        yield obj
+    for i in range(counts["User"]):
+        obj = User(email="user{}.{}@hbnb.io".format(i, run),
+                   password="pwd{}".format(i),
+                   first_name="First{}".format(i),
+                   last_name="Last{}".format(i))
+        ids["User"].append(obj.id)
+        yield obj
+    for i in range(counts["Place"]):
+        obj = Place(city_id=pick("City")[0], user_id=pick("User")[0],
+                    name="Place {}".format(i),
+                    description="Description of place {}".format(i),
+                    number_rooms=rng.randint(1, 6),
+                    number_bathrooms=rng.randint(1, 3),
+                    max_guest=rng.randint(1, 12),
+                    price_by_night=int(20 + rng.paretovariate(1.5) * 30),
+                    latitude=rng.uniform(-90, 90),
+                    longitude=rng.uniform(-180, 180))
+        if ids["Amenity"]:
+            obj.amenity_ids = sorted(set(pick("Amenity",
+                                              rng.randint(0, 6))))
+        ids["Place"].append(obj.id)
+        yield obj
+    for i in range(counts["Review"]):
+        yield Review(place_id=pick("Place")[0], user_id=pick("User")[0],
+                     text="Review {}".format(i))
+
+
+def load(storage, total, seed=0, skew=0.0, counts=None, batch_size=10000,
+         progress=None):
+    """
+    Fills storage with a generated dataset through its bulk_new path.
+
+    Args:
+        storage: the storage engine to fill.
+        batch_size (int): number of objects written per bulk_new call, the
+                          database engine commits after each batch.
+        progress (function): called with the number of objects written
+                             after each batch.
+    Return:
+        Dict of class name -> list of the generated ids.
+    """
+    ids = {}
+    batch = []
+    written = 0
+    for obj in generate(total, seed, skew, counts):
+        ids.setdefault(obj.__class__.__name__, []).append(obj.id)
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            storage.bulk_new(batch)
+            if models.storage_t == "db":
+                storage.save()
+            written += len(batch)
+            batch = []
+            if progress:
+                progress(written)
+    storage.bulk_new(batch)
+    storage.save()
+    if progress:
+        progress(written + len(batch))
+    return ids
@@ -0,0 +1,253 @@
+#!/usr/bin/python3
+"""
+HTTP load generator for api.v1.app
+
+    python3 -m benchmarks.loadtest benchmarks/scenarios/read_heavy.json \\
+        --backend file sqlite --scale 1k -o load.json
+
+Every backend is seeded and served by its own child process (werkzeug
+threaded server, or the ASGI server of api.v1.asgi with --server asgi, on a
+free local port, in a temporary working directory),
+then a pool of client threads replays the weighted mix of the scenario for
+its duration over keep-alive connections. The throughput and the latency
+percentiles of every route are printed and written in the results format
+of benchmarks.run, so that benchmarks.compare can gate them.
+
+A scenario is a JSON file:
+
+    {"duration": 10, "concurrency": 8,
+     "mix": [{"method": "GET", "route": "/api/v1/states/<id>",
+              "weight": 25}, ...]}
+
+The <variables> of the routes are replaced by random ids of the seeded
+dataset, POST routes send a valid body and PUT routes rename the object.
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import http.client
+from itertools import accumulate
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from time import perf_counter
+from benchmarks import bench_api, dataset, results as bench_results
+from benchmarks.run import BACKENDS, backend_env
+
+SERVERS = ("threaded", "asgi")
+
+
+def serve(args):
+    """Seeds the backend of the current process and serves the API"""
+    from api.v1.app import app
+    from models import storage
+    from werkzeug.serving import make_server, WSGIRequestHandler
+
+    class KeepAliveHandler(WSGIRequestHandler):
+        """Request handler keeping the HTTP/1.1 connections open"""
+        protocol_version = "HTTP/1.1"
+
+        def log_request(self, *args, **kwargs):
+            """Does not log every request"""
+
+    rng = random.Random(args.seed)
+    ids = dataset.load(storage, dataset.parse_scale(args.scale), args.seed,
+                       args.skew)
+    ids = {name: rng.sample(values, min(len(values), 10000))
+           for name, values in ids.items()}
+
+    def ready(port):
+        """Publishes the port and the ids to the parent process"""
+        with open(args.ready + '.tmp', 'w') as f:
+            json.dump({"port": port, "ids": ids}, f)
+        os.rename(args.ready + '.tmp', args.ready)
+
+    if args.server == "asgi":
+        from api.v1 import asgi
+        return asgi.run(asgi.app, '127.0.0.1', 0, ready)
+    server = make_server('127.0.0.1', 0, app, threaded=True,
+                         request_handler=KeepAliveHandler)
+    ready(server.server_port)
+    server.serve_forever()
+
+
+def start_server(backend, args, cwd):
+    """
+    Starts the server of a backend in a child process.
+
+    Return:
+        The child process and its ready file content (port and ids).
+    """
+    env = backend_env(backend)
+    ready = os.path.join(cwd, "ready.json")
+    command = [sys.executable, "-m", "benchmarks.loadtest", args.scenario,
+               "--serve", "--ready", ready, "--server", args.server,
+               "--scale", str(args.scale), "--skew", str(args.skew),
+               "--seed", str(args.seed)]
+    proc = subprocess.Popen(command, cwd=cwd, env=env,
+                            stdout=subprocess.DEVNULL)
+    deadline = time.time() + args.startup_timeout
+    while not os.path.exists(ready):
+        if proc.poll() is not None or time.time() > deadline:
+            proc.kill()
+            raise RuntimeError("the {} server did not start".format(backend))
+        time.sleep(0.1)
+    with open(ready) as f:
+        return proc, json.load(f)
+
+
+def client(port, mix, ids, start, deadline, seed):
+    """
+    Replays the mix until deadline over one keep-alive connection.
+
+    Return:
+        Dict of "METHOD route" -> [latencies, number of errors], requests
+        sent before start (warm up) are not recorded.
+    """
+    rng = random.Random(seed)
+    cum_weights = list(accumulate(entry["weight"] for entry in mix))
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    stats = {}
+
+    def pick(name):
+        """Returns a random id of the dataset"""
+        return rng.choice(ids[name])
+
+    while True:
+        now = perf_counter()
+        if now >= deadline:
+            break
+        entry = rng.choices(mix, cum_weights=cum_weights)[0]
+        method, route = entry["method"], entry["route"]
+        payload = None
+        if method == "POST":
+            payload = bench_api.body(bench_api.target(route), pick)
+        elif method == "PUT":
+            payload = {"name": "Load {}".format(rng.random())}
+        try:
+            conn.request(method, bench_api.fill(route, pick),
+                         body=json.dumps(payload) if payload else None,
+                         headers={"Content-Type": "application/json"})
+            response = conn.getresponse()
+            response.read()
+            failed = response.status >= 400
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            failed = True
+        elapsed = perf_counter() - now
+        if now >= start:
+            record = stats.setdefault("{} {}".format(method, route), [[], 0])
+            record[0].append(elapsed)
+            record[1] += failed
+    conn.close()
+    return stats
+
+
+def run_scenario(name, port, ids, scenario, seed):
+    """
+    Runs the clients of a scenario against a server.
+
+    Return:
+        Dict of "load:<name>:METHOD route" -> summary with the number of
+        errors and the requests per second, plus a "load:<name>:total".
+    """
+    concurrency = scenario["concurrency"]
+    start = perf_counter() + scenario.get("warmup", 0)
+    deadline = start + scenario["duration"]
+    with ThreadPoolExecutor(concurrency) as pool:
+        futures = [pool.submit(client, port, scenario["mix"], ids, start,
+                               deadline, seed + i)
+                   for i in range(concurrency)]
+        merged = {}
+        for future in futures:
+            for key, (latencies, errors) in future.result().items():
+                record = merged.setdefault(key, [[], 0])
+                record[0].extend(latencies)
+                record[1] += errors
+    results = {}
+    every = []
+    errors = 0
+    for key, (latencies, failed) in merged.items():
+        summary = bench_results.summarize(latencies)
+        summary.update(errors=failed,
+                       rps=len(latencies) / scenario["duration"])
+        results["load:{}:{}".format(name, key)] = summary
+        every.extend(latencies)
+        errors += failed
+    summary = bench_results.summarize(every)
+    summary.update(errors=errors, rps=len(every) / scenario["duration"])
+    results["load:{}:total".format(name)] = summary
+    return results
+
+
+def print_report(name, backend, results, stream=sys.stdout):
+    """Prints the throughput and latency percentiles of every route"""
+    print("[{} / {}]".format(name, backend), file=stream)
+    for key, metric in sorted(results.items()):
+        print("  {:<50} {:>8.1f} req/s  p50 {:>8.2f}  p95 {:>8.2f}  "
+              "p99 {:>8.2f} ms  errors {}".format(
+                  key.split(":", 2)[-1], metric["rps"],
+                  metric["median"] * 1000, metric["p95"] * 1000,
+                  metric["p99"] * 1000, metric["errors"]), file=stream)
+
+
+def main(argv=None):
+    """Entry point of the load generator"""
+    parser = argparse.ArgumentParser(description="HBNB API load generator")
+    parser.add_argument("scenario", help="path of a scenario JSON file")
+    parser.add_argument("--backend", nargs="+", default=["file"],
+                        choices=sorted(BACKENDS))
+    parser.add_argument("--server", default="threaded", choices=SERVERS)
+    parser.add_argument("--scale", default="1k",
+                        help="1k, 100k, 1m or a number of objects")
+    parser.add_argument("--skew", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--duration", type=float,
+                        help="overrides the duration of the scenario")
+    parser.add_argument("--concurrency", type=int,
+                        help="overrides the concurrency of the scenario")
+    parser.add_argument("--warmup", type=float, default=1.0)
+    parser.add_argument("--startup-timeout", type=float, default=600)
+    parser.add_argument("-o", "--output")
+    parser.add_argument("--serve", action="store_true",
+                        help=argparse.SUPPRESS)
+    parser.add_argument("--ready", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.serve:
+        return serve(args)
+    with open(args.scenario) as f:
+        scenario = json.load(f)
+    scenario.setdefault("warmup", args.warmup)
+    for key in ("duration", "concurrency"):
+        if getattr(args, key) is not None:
+            scenario[key] = getattr(args, key)
+    for backend in args.backend:
+        try:
+            backend_env(backend)
+        except ValueError as error:
+            parser.error(error)
+    name = os.path.splitext(os.path.basename(args.scenario))[0]
+    results = {}
+    for backend in args.backend:
+        with tempfile.TemporaryDirectory() as cwd:
+            proc, info = start_server(backend, args, cwd)
+            try:
+                results[backend] = run_scenario(name, info["port"],
+                                                info["ids"], scenario,
+                                                args.seed)
+            finally:
+                proc.terminate()
+                proc.wait()
+        print_report(name, backend, results[backend])
+    if args.output:
+        meta = bench_results.metadata(scenario=name, scale=args.scale,
+                                      server=args.server,
+                                      backends=args.backend, **scenario)
+        bench_results.save(args.output, meta, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/python3
+"""
+Timing helpers and the JSON format of the benchmark results
+
+A results file looks like:
+
+    {"meta": {"scale": 1000, "repeat": 5, "commit": "...", ...},
+     "results": {"file": {"FileStorage.get": {"samples": [...],
+                                              "median": ..., "p95": ...}}}}
+
+Every metric keeps its raw samples (seconds) so that two runs can be
+compared statistically by benchmarks.compare.
+"""
+import json
+import platform
+import subprocess
+import sys
+import time
+from time import perf_counter
+
+
+def measure(func, repeat, *args):
+    """Returns the list of the durations in seconds of repeat calls"""
+    samples = []
+    for _ in range(repeat):
+        start = perf_counter()
+        func(*args)
+        samples.append(perf_counter() - start)
+    return samples
+
+
+def percentile(samples, pct):
+    """Returns the pct percentile of samples, linearly interpolated"""
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(samples):
+    """Returns the samples with their count, min, median, p95, p99 and max"""
+    return {"samples": samples, "n": len(samples),
+            "min": min(samples) if samples else None,
+            "median": percentile(samples, 50),
+            "p95": percentile(samples, 95),
+            "p99": percentile(samples, 99),
+            "max": max(samples) if samples else None}
+
+
+def metadata(**extra):
+    """Returns the description of the environment of a run"""
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', 'HEAD'],
+                                         stderr=subprocess.DEVNULL,
+                                         universal_newlines=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    meta = {"commit": commit, "python": platform.python_version(),
+            "platform": platform.platform(), "time": int(time.time())}
+    meta.update(extra)
+    return meta
+
+
+def save(path, meta, results):
+    """Writes a results file"""
+    with open(path, 'w') as f:
+        json.dump({"meta": meta, "results": results}, f, indent=1,
+                  sort_keys=True)
+
+
+def load(path):
+    """Reads a results file"""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def print_table(results, stream=sys.stdout):
+    """Prints the median and p95 in milliseconds of every metric"""
+    for backend in sorted(results):
+        print("[{}]".format(backend), file=stream)
+        for name, metric in sorted(results[backend].items()):
+            print("  {:<48} median {:>10.3f} ms  p95 {:>10.3f} ms  n={}"
+                  .format(name, metric["median"] * 1000,
+                          metric["p95"] * 1000, metric["n"]), file=stream)
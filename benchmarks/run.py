@@ -0,0 +1,115 @@
+#!/usr/bin/python3
+"""
+Runs the storage and API benchmarks and writes the results as JSON
+
+    python3 -m benchmarks.run --scale 1k --backend file sqlite -o bench.json
+
+The storage engine is chosen by HBNB_TYPE_STORAGE when the models are first
+imported, so every backend runs in its own child process, inside a temporary
+working directory so that the file.json of the repository is never touched.
+The database backends run in test mode (HBNB_ENV=test), which drops every
+table: the db backend only runs on the database of HBNB_BENCH_DB_URL, a
+SQLAlchemy URL kept for the benchmarks, never on the HBNB_DB_URL or
+HBNB_MYSQL_* database of the environment, and the sqlite backend on a
+database file in the temporary directory.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from benchmarks import results as bench_results
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKENDS = {"file": {"HBNB_TYPE_STORAGE": "file"},
+            "db": {"HBNB_TYPE_STORAGE": "db", "HBNB_ENV": "test"},
+            "sqlite": {"HBNB_TYPE_STORAGE": "sqlite", "HBNB_ENV": "test"}}
+
+
+def backend_env(backend):
+    """
+    Returns the environment of the child process of a backend.
+
+    Raises:
+        ValueError: if the db backend has no HBNB_BENCH_DB_URL.
+    """
+    env = dict(os.environ, **BACKENDS[backend])
+    if backend == "db":
+        if not os.environ.get("HBNB_BENCH_DB_URL"):
+            raise ValueError("the db backend clears its database: set "
+                             "HBNB_BENCH_DB_URL to a database kept for the "
+                             "benchmarks")
+        env["HBNB_DB_URL"] = os.environ["HBNB_BENCH_DB_URL"]
+    elif backend == "sqlite":
+        # relative to the temporary working directory of the child
+        env["HBNB_SQLITE_PATH"] = "hbnb.db"
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [ROOT, env.get("PYTHONPATH")]))
+    return env
+
+
+def run_child(args):
+    """Benchmarks the backend of the current process into args.output"""
+    from benchmarks import bench_api, bench_storage, dataset
+    from models import storage
+    results = {}
+    ids = dataset.load(storage, dataset.parse_scale(args.scale), args.seed)
+    if "storage" in args.suite:
+        results.update(bench_storage.run(storage, ids, args.repeat,
+                                         args.samples, args.seed))
+    if "api" in args.suite:
+        from api.v1.app import app
+        results.update(bench_api.run(app, ids, args.repeat, args.seed))
+    with open(args.output, 'w') as f:
+        json.dump(results, f)
+
+
+def run_backend(backend, args):
+    """Runs the benchmarks of one backend in a child process"""
+    env = backend_env(backend)
+    command = [sys.executable, "-m", "benchmarks.run", "--child",
+               "--scale", str(args.scale), "--repeat", str(args.repeat),
+               "--samples", str(args.samples), "--seed", str(args.seed),
+               "--output", "results.json", "--suite"] + args.suite
+    with tempfile.TemporaryDirectory() as cwd:
+        subprocess.check_call(command, cwd=cwd, env=env)
+        with open(os.path.join(cwd, "results.json")) as f:
+            return json.load(f)
+
+
+def main(argv=None):
+    """Entry point of the benchmark runner"""
+    parser = argparse.ArgumentParser(description="HBNB benchmarks")
+    parser.add_argument("--scale", default="1k",
+                        help="1k, 100k, 1m or a number of objects")
+    parser.add_argument("--backend", nargs="+", default=["file"],
+                        choices=sorted(BACKENDS))
+    parser.add_argument("--suite", nargs="+", default=["storage", "api"],
+                        choices=["storage", "api"])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--samples", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", default="bench.json")
+    parser.add_argument("--child", action="store_true",
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        return run_child(args)
+    for backend in args.backend:
+        try:
+            backend_env(backend)
+        except ValueError as error:
+            parser.error(error)
+    results = {}
+    for backend in args.backend:
+        results[backend] = run_backend(backend, args)
+    meta = bench_results.metadata(scale=args.scale, repeat=args.repeat,
+                                  samples=args.samples, seed=args.seed,
+                                  backends=args.backend, suites=args.suite)
+    bench_results.save(args.output, meta, results)
+    bench_results.print_table(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ import models
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
+from models.engine import backup, migrations
 from models.place import Place
 from models.review import Review
 from models.state import State
@@ -96,7 +97,7 @@ class HBNBCommand(cmd.Cmd):
             if len(args) > 1:
                 key = args[0] + "." + args[1]
                 if key in models.storage.all():
-                    models.storage.all().pop(key)
+                    models.storage.delete(models.storage.all()[key])
                     models.storage.save()
                 else:
                     print("** no instance found **")
@@ -108,18 +109,16 @@ class HBNBCommand(cmd.Cmd):
     def do_all(self, arg):
         """Prints string representations of instances"""
         args = shlex.split(arg)
-        obj_list = []
         if len(args) == 0:
-            obj_dict = models.storage.all()
+            objs = models.storage.iter()
         elif args[0] in classes:
-            obj_dict = models.storage.all(classes[args[0]])
+            objs = models.storage.iter(classes[args[0]])
         else:
             print("** class doesn't exist **")
             return False
-        for key in obj_dict:
-            obj_list.append(str(obj_dict[key]))
         print("[", end="")
-        print(", ".join(obj_list), end="")
+        for i, obj in enumerate(objs):
+            print(", " if i else "", obj, sep="", end="")
         print("]")
 
     def do_update(self, arg):
@@ -160,5 +159,57 @@ class HBNBCommand(cmd.Cmd):
         else:
             print("** class doesn't exist **")
 
+    def do_migrate(self, arg):
+        """Migrates the database schema: migrate [status | <version>]"""
+        args = shlex.split(arg)
+        if not hasattr(models.storage, "migrate"):
+            print("** migrations need the database storage **")
+            return False
+        if args and args[0] == "status":
+            print("schema version {} (latest {})".format(
+                models.storage.schema_version(), migrations.head()))
+            return False
+        try:
+            version = int(args[0]) if args else None
+            steps = models.storage.migrate(
+                version, lambda direction, migration: print(
+                    "{} {}: {}".format(direction, migration.version,
+                                       migration.name)))
+        except ValueError:
+            print("** unknown schema version **")
+            return False
+        if not steps:
+            print("schema version {} is current".format(
+                models.storage.schema_version()))
+
+    def do_backup(self, arg):
+        """Writes a consistent copy of the storage: backup <path>"""
+        args = shlex.split(arg)
+        if not args:
+            print("** path missing **")
+            return False
+        try:
+            count = backup.backup(models.storage, args[0])
+        except OSError as error:
+            print("** {} **".format(error.strerror or error))
+            return False
+        print("{} objects written to {}".format(count, args[0]))
+
+    def do_restore(self, arg):
+        """Loads a backup into the empty storage: restore <path>"""
+        args = shlex.split(arg)
+        if not args:
+            print("** path missing **")
+            return False
+        try:
+            count = backup.restore(models.storage, args[0])
+        except OSError as error:
+            print("** {} **".format(error.strerror or error))
+            return False
+        except ValueError as error:
+            print("** {} **".format(error))
+            return False
+        print("{} objects restored from {}".format(count, args[0]))
+
 if __name__ == '__main__':
     HBNBCommand().cmdloop()
@@ -8,10 +8,30 @@ from os import getenv
 
 storage_t = getenv("HBNB_TYPE_STORAGE")
 
-if storage_t == "db":
+if storage_t == "sqlite":
+    # the SQLite engine maps the same SQLAlchemy models as the db engine
+    storage_t = "db"
+    from models.engine.sqlite_storage import SQLiteStorage
+    storage = SQLiteStorage()
+elif storage_t == "mapped":
+    from models.engine.mapped_storage import MappedStorage
+    storage = MappedStorage()
+elif storage_t == "db":
     from models.engine.db_storage import DBStorage
     storage = DBStorage()
 else:
     from models.engine.file_storage import FileStorage
     storage = FileStorage()
+    if getenv("HBNB_FILE_LAYOUT"):
+        storage.set_layout(getenv("HBNB_FILE_LAYOUT"))
+    if getenv("HBNB_FILE_FORMAT"):
+        storage.set_format(getenv("HBNB_FILE_FORMAT"))
+    if getenv("HBNB_FILE_COMPRESSION"):
+        storage.set_compression(getenv("HBNB_FILE_COMPRESSION"))
+    if getenv("HBNB_RELOAD_WORKERS"):
+        storage.set_reload_workers(int(getenv("HBNB_RELOAD_WORKERS")))
+    if getenv("HBNB_WRITE_BEHIND"):
+        storage.write_behind(float(getenv("HBNB_WRITE_BEHIND")),
+                             int(getenv("HBNB_WRITE_BEHIND_MAX_DIRTY",
+                                        1000)))
 storage.reload()
@@ -0,0 +1,179 @@
+#!/usr/bin/python3
+"""
+Online backup and restore of the storage engines
+
+    python3 -m models.engine.backup backup hbnb.bak
+    python3 -m models.engine.backup restore hbnb.bak
+
+A backup streams the records() of the storage selected by
+HBNB_TYPE_STORAGE to a file: the FileStorage copies the records of its
+objects under its read lock, the MappedStorage those of its pending
+objects, the database storage reads them in one transaction, so the
+backup is consistent while the API keeps serving and writing. The
+classes come in foreign key order and the places carry their amenity_ids,
+a backup of any engine restores into any engine.
+
+The file is written aside then renamed, in the binary format compressed
+with gzip by default (see models.engine.serializers). A restore reads it
+as a stream and inserts the objects through the bulk_new path of the
+storage, by batches, into an empty storage.
+"""
+import argparse
+import os
+import models
+from models.engine import serializers
+
+
+def model_classes():
+    """Returns class name -> model class of the storage type"""
+    if models.storage_t == "db":
+        from models.engine.db_storage import classes
+    else:
+        from models.engine.file_storage import classes
+    return classes
+
+
+def backup(storage, path, format="binary", compression="gzip",
+           progress=None):
+    """
+    Writes a consistent copy of the objects of storage to path.
+
+    Args:
+        storage: the storage engine to copy.
+        path (str): the backup file, replaced once complete.
+        format (str): "binary" or "json".
+        compression (str): "none", "gzip" or "zstd".
+        progress (callable): called with the number of records written
+                             every 10000 records and at the end.
+    Return:
+        The number of records written.
+    """
+    count = [0]
+
+    def counted(records):
+        """Counts the records going through"""
+        for record in records:
+            yield record
+            count[0] += 1
+            if progress is not None and count[0] % 10000 == 0:
+                progress(count[0])
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f, \
+            serializers.compressed(f, compression) as stream:
+        serializers.serializers[format].dump(counted(storage.records()),
+                                             stream)
+    os.replace(tmp_path, path)
+    if progress is not None:
+        progress(count[0])
+    return count[0]
+
+
+def restore(storage, path, batch_size=10000, progress=None):
+    """
+    Loads the objects of a backup into an empty storage.
+
+    Args:
+        storage: the storage engine to fill, it must hold no object.
+        path (str): the backup file, in any format and compression.
+        batch_size (int): number of objects per bulk_new, the database
+                          storage commits after each batch, the file
+                          storages save once at the end.
+        progress (callable): called with the number of objects restored
+                             after each batch.
+    Return:
+        The number of objects restored, the records of classes unknown to
+        the storage (BaseModel in a database) are skipped.
+    """
+    with open(path, 'rb') as f:
+        return insert(storage, serializers.load(f), batch_size, progress)
+
+
+def is_empty(storage):
+    """
+    Returns whether the storage holds no object, reading at most one row
+    per table of a database instead of counting them all.
+    """
+    objs = storage.iter(batch_size=1)
+    try:
+        return next(objs, None) is None
+    finally:
+        objs.close()
+
+
+def insert(storage, records, batch_size=10000, progress=None):
+    """
+    Inserts the objects of records into an empty storage, by batches.
+
+    Args:
+        storage: the storage engine to fill, it must hold no object.
+        records (iterable): the records, the classes in foreign key order.
+        batch_size (int): number of objects per bulk_new, the database
+                          storage commits after each batch, the file
+                          storages save once at the end.
+        progress (callable): called with the number of objects inserted
+                             after each batch.
+    Return:
+        The number of objects inserted, the records of classes unknown to
+        the storage are skipped.
+    """
+    if not is_empty(storage):
+        raise ValueError("the storage is not empty")
+    classes = model_classes()
+    count = 0
+    batch = []
+    for record in records:
+        cls = classes.get(record["__class__"])
+        if cls is None:
+            continue
+        batch.append(cls(**record))
+        if len(batch) >= batch_size:
+            count += len(batch)
+            storage.bulk_new(batch)
+            if models.storage_t == "db":
+                storage.save()
+            batch = []
+            if progress is not None:
+                progress(count)
+    count += len(batch)
+    storage.bulk_new(batch)
+    storage.save()
+    if progress is not None:
+        progress(count)
+    return count
+
+
+def main(argv=None):
+    """Entry point of the backup tool"""
+    parser = argparse.ArgumentParser(
+        description="backup and restore of the HBNB storage")
+    parser.add_argument("command", choices=("backup", "restore"))
+    parser.add_argument("path")
+    parser.add_argument("--format", default="binary",
+                        choices=sorted(serializers.serializers))
+    parser.add_argument("--compression", default="gzip",
+                        choices=serializers.compressions())
+    parser.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    def progress(count):
+        """Reports the number of objects copied"""
+        print("{} objects".format(count), flush=True)
+
+    try:
+        if args.command == "backup":
+            count = backup(models.storage, args.path, args.format,
+                           args.compression, progress)
+            print("{} objects written to {}".format(count, args.path))
+        else:
+            count = restore(models.storage, args.path, args.batch_size,
+                            progress)
+            print("{} objects restored from {}".format(count, args.path))
+    except OSError as error:
+        parser.error(error.strerror or error)
+    except ValueError as error:
+        parser.error(error)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,41 +6,125 @@ import models
 from models.amenity import Amenity
 from models.base_model import BaseModel, Base
 from models.city import City
+from models.engine import migrations
+from models.engine.file_storage import class_names
+from models.engine.snapshot import Snapshot
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
 from os import getenv
+from time import perf_counter
 import sqlalchemy
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import (NullPool, QueuePool, SingletonThreadPool,
+                             StaticPool)
 
 classes = {"Amenity": Amenity, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+pools = {"null": NullPool, "queue": QueuePool,
+         "singleton": SingletonThreadPool, "static": StaticPool}
+
+
+def flag(value):
+    """Returns the boolean of an environment variable value"""
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def echo(value):
+    """Returns the echo option of create_engine: a boolean or "debug" """
+    return "debug" if value.strip().lower() == "debug" else flag(value)
+
+
+# environment variable -> (create_engine option, parser of the value)
+options_env = {"HBNB_DB_ECHO": ("echo", echo),
+               "HBNB_DB_POOL": ("poolclass", lambda value: pools[value]),
+               "HBNB_DB_POOL_SIZE": ("pool_size", int),
+               "HBNB_DB_MAX_OVERFLOW": ("max_overflow", int),
+               "HBNB_DB_POOL_TIMEOUT": ("pool_timeout", float),
+               "HBNB_DB_POOL_RECYCLE": ("pool_recycle", int),
+               "HBNB_DB_POOL_PRE_PING": ("pool_pre_ping", flag),
+               "HBNB_DB_ISOLATION_LEVEL": ("isolation_level", str)}
+
+
+def engine_options():
+    """
+    Returns the keyword arguments of sqlalchemy.create_engine set by the
+    HBNB_DB_* variables of the environment.
+    """
+    options = {}
+    for variable, (option, parse) in options_env.items():
+        value = getenv(variable)
+        if value:
+            try:
+                options[option] = parse(value)
+            except (KeyError, ValueError):
+                raise ValueError("invalid {}: {}".format(variable, value))
+    return options
 
 
 class DBStorage:
     """
-    This class stores info into database (MySQL)
+    This class stores info into database (MySQL, or any SQLAlchemy URL)
 
     Attributes:
         __engine (sqlalchemy.Engine): The working SQLAlchemy engine.
         __session (sqlalchemy.Session): The working SQLAlchemy session.
+        __stats (dictionary): counters of the work done by the storage
     """
     __engine = None
     __session = None
+    __stats = {"objects_scanned": 0, "saves": 0, "save_seconds": 0.0,
+               "reloads": 0, "reload_seconds": 0.0}
 
-    def __init__(self):
+    def __init__(self, url=None, **options):
         """
         Constructor method for DBStorage class
+
+        Args:
+            url (str): SQLAlchemy URL of the database, HBNB_DB_URL or the
+                       MySQL database of the HBNB_MYSQL_* variables if None.
+            options: keyword arguments of sqlalchemy.create_engine, they
+                     override those of the HBNB_DB_* variables.
         """
-        self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.
-                                      format(getenv('HBNB_MYSQL_USER'),
-                                             getenv('HBNB_MYSQL_PWD'),
-                                             getenv('HBNB_MYSQL_HOST'),
-                                             getenv('HBNB_MYSQL_DB')))
+        if url is None:
+            url = getenv('HBNB_DB_URL')
+        if url is None:
+            url = 'mysql+mysqldb://{}:{}@{}/{}'.format(
+                getenv('HBNB_MYSQL_USER'), getenv('HBNB_MYSQL_PWD'),
+                getenv('HBNB_MYSQL_HOST'), getenv('HBNB_MYSQL_DB'))
+        options = dict(engine_options(), **options)
+        if make_url(url).get_backend_name() == "sqlite":
+            # the sessions of the threads share the pooled connections
+            options.setdefault('connect_args', {}).setdefault(
+                'check_same_thread', False)
+        self.__engine = create_engine(url, **options)
+        self.configure(self.__engine)
         if getenv('HBNB_ENV') == "test":
-            Base.metadata.drop_all(self.__engine)
+            migrations.drop(self.__engine)
+
+    def configure(self, engine):
+        """
+        Hook run on the new engine before any connection, for the settings
+        of a dialect. The SQLite connections get the WAL journal, the
+        normal synchronous mode and the foreign keys.
+
+        Args:
+            engine (sqlalchemy.Engine): the engine of the storage.
+        """
+        if engine.dialect.name != "sqlite":
+            return
+
+        @event.listens_for(engine, "connect")
+        def set_pragmas(connection, record):
+            """Configures a new SQLite connection"""
+            cursor = connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA foreign_keys=ON")
+            cursor.close()
 
     def all(self, cls=None):
         """query on the current database session"""
@@ -48,6 +132,7 @@ class DBStorage:
         for clss in classes:
             if cls is None or cls is classes[clss] or cls is clss:
                 objs = self.__session.query(classes[clss]).all()
+                self.__stats["objects_scanned"] += len(objs)
                 for obj in objs:
                     key = obj.__class__.__name__ + '.' + obj.id
                     new_dict[key] = obj
@@ -80,11 +165,38 @@ class DBStorage:
         """
         self.__session.add(obj)
 
+    def bulk_new(self, objs):
+        """
+        Inserts many objects at once with the bulk path of the session, the
+        amenity_ids of the places are inserted as place_amenity rows.
+
+        Args:
+            objs (iterable): given objects
+        """
+        from models.place import place_amenity
+        objs = list(objs)
+        self.__session.bulk_save_objects(objs)
+        links = [{"place_id": obj.id, "amenity_id": amenity_id}
+                 for obj in objs if isinstance(obj, Place)
+                 for amenity_id in getattr(obj, "amenity_ids", ())]
+        if links:
+            self.__session.execute(place_amenity.insert(), links)
+
     def save(self):
         """
         Commit all changes of the current database session
         """
+        start = perf_counter()
         self.__session.commit()
+        self.__stats["saves"] += 1
+        self.__stats["save_seconds"] += perf_counter() - start
+
+    def rollback(self):
+        """
+        Discards the changes of the current database session, after a
+        failed commit
+        """
+        self.__session.rollback()
 
     def delete(self, obj=None):
         """
@@ -98,12 +210,36 @@ class DBStorage:
 
     def reload(self):
         """
-        Reloads the database session
+        Reloads the database session, after upgrading the schema when its
+        version is older than the latest migration. A current schema costs
+        a single query.
         """
-        Base.metadata.create_all(self.__engine)
+        start = perf_counter()
+        if migrations.current(self.__engine) < migrations.head():
+            migrations.migrate(self.__engine)
         Session = scoped_session(sessionmaker(bind=self.__engine,
                                               expire_on_commit=False))
         self.__session = Session
+        self.__stats["reloads"] += 1
+        self.__stats["reload_seconds"] += perf_counter() - start
+
+    def schema_version(self):
+        """Returns the schema version of the database"""
+        return migrations.current(self.__engine)
+
+    def migrate(self, version=None, log=None):
+        """
+        Upgrades or downgrades the schema of the database.
+
+        Args:
+            version (int): version to reach, the latest if None.
+            log (callable): called with the direction and the migration
+                            before every step.
+        Return:
+            The list of the (direction, migration) steps applied.
+        """
+        self.__session.remove()
+        return migrations.migrate(self.__engine, version, log)
 
     def close(self):
         """
@@ -127,3 +263,117 @@ class DBStorage:
             if CLASS is None:
                 return len(self.all())
         return len(self.all(CLASS))
+
+    def iter(self, cls=None, batch_size=1000):
+        """
+        Yields the objects of the given class, or of all the classes with
+        the tables in foreign key order, without building their dict.
+
+        The rows are read batch_size at a time by increasing id, each query
+        is fetched whole before its objects are yielded: the loop may use
+        the session, e.g. the lazy relationships, meanwhile, and the session
+        only keeps the objects still referenced.
+
+        Args:
+            cls (str): class or name of the class, all the classes if None.
+            batch_size (int): rows read per query.
+        """
+        tables = {classes[name].__table__: classes[name] for name in classes
+                  if cls is None or cls is classes[name] or cls == name}
+        for table in Base.metadata.sorted_tables:
+            if table not in tables:
+                continue
+            model = tables[table]
+            last = None
+            while True:
+                query = self.__session.query(model).order_by(model.id)
+                if last is not None:
+                    query = query.filter(model.id > last)
+                objs = query.limit(batch_size).all()
+                self.__stats["objects_scanned"] += len(objs)
+                if not objs:
+                    break
+                last = objs[-1].id
+                yield from objs
+                objs = None
+
+    def records(self, cls=None, batch_size=1000):
+        """
+        Yields the records of the rows of a consistent view of the
+        database, the tables in foreign key order. One transaction reads
+        every table, batch_size rows per query by increasing id; the places
+        carry the ids of their amenities in amenity_ids.
+
+        Args:
+            cls (str): class or name of the class, or iterable of them, all
+                       the classes if None: only their tables are read.
+            batch_size (int): rows read per query.
+        """
+        names = {classes[name].__table__: name for name in class_names(cls)
+                 if name in classes}
+        with self.__engine.connect() as conn:
+            if conn.dialect.name != "sqlite":
+                conn = conn.execution_options(
+                    isolation_level="REPEATABLE READ")
+            with conn.begin():
+                if conn.dialect.name == "sqlite":
+                    # pysqlite only opens a transaction before a write
+                    conn.exec_driver_sql("BEGIN")
+                for table in Base.metadata.sorted_tables:
+                    if table not in names:
+                        continue
+                    for rows in self.__batches(conn, table, batch_size):
+                        links = self.__amenity_ids(conn, rows) \
+                            if table is Place.__table__ else None
+                        for row in rows:
+                            record = dict(row)
+                            if links is not None:
+                                record["amenity_ids"] = links.get(row["id"],
+                                                                  [])
+                            record["__class__"] = names[table]
+                            yield record
+
+    @staticmethod
+    def __batches(conn, table, batch_size):
+        """Yields the lists of the rows of a table, by increasing id"""
+        last = None
+        while True:
+            query = sqlalchemy.select(table).order_by(table.c.id).limit(
+                batch_size)
+            if last is not None:
+                query = query.where(table.c.id > last)
+            rows = conn.execute(query).mappings().all()
+            if not rows:
+                return
+            yield rows
+            last = rows[-1]["id"]
+
+    @staticmethod
+    def __amenity_ids(conn, rows):
+        """Returns place id -> ids of its amenities, for rows of places"""
+        from models.place import place_amenity
+        links = {}
+        query = sqlalchemy.select(place_amenity.c.place_id,
+                                  place_amenity.c.amenity_id).where(
+            place_amenity.c.place_id.in_([row["id"] for row in rows]))
+        for place_id, amenity_id in conn.execute(query):
+            links.setdefault(place_id, []).append(amenity_id)
+        return links
+
+    def snapshot(self):
+        """
+        Returns a Snapshot of the objects loaded by one query per class, the
+        session keeps them until it is closed. Its version is the number of
+        commits done so far.
+        """
+        classes_map = {name: {} for name in classes}
+        for key, obj in self.all().items():
+            classes_map[obj.__class__.__name__][key] = obj
+        return Snapshot(self.__stats["saves"], classes_map)
+
+    def stats(self):
+        """
+        Returns a copy of the storage counters: rows loaded by the queries,
+        number and total duration of the commits and of the reloads.
+        """
+        return dict(self.__stats)
@@ -2,7 +2,17 @@
 """
 Script for the FileStorage class
 """
-import json
+import atexit
+from concurrent.futures import ProcessPoolExecutor
+import mmap
+import os
+from threading import Lock
+from time import perf_counter
+from types import MappingProxyType
+from models.engine import serializers
+from models.engine.locks import FileLock, ReadWriteLock
+from models.engine.snapshot import Snapshot
+from models.engine.write_behind import WriteBehind
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
@@ -13,6 +23,80 @@ from models.user import User
 
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+LAYOUTS = ("single", "sharded")
+# the classes with foreign keys after the classes they refer to
+order = ("State", "Amenity", "City", "User", "Place", "Review", "BaseModel")
+
+
+def class_names(cls=None):
+    """
+    Returns the names of the classes asked to records() or iter(), in
+    foreign key order.
+
+    Args:
+        cls: class or name of a class, iterable of classes or names, or
+             None for all the classes.
+    """
+    if cls is None:
+        return list(order)
+    if isinstance(cls, (str, type)):
+        cls = [cls]
+    names = {name if isinstance(name, str) else name.__name__
+             for name in cls}
+    return [name for name in order if name in names]
+
+
+def build_part(path, start=None, size=None, shapes=None):
+    """
+    Returns the objects of the records of a file, or of a range of records
+    of a binary file, in a process of a parallel reload.
+
+    Args:
+        path (str): path of the file, in any format.
+        start (int): position of the first record of the range, the whole
+                     file if None.
+        size (int): number of bytes of the records of the range.
+        shapes (list): the shapes defined before the range.
+    """
+    with open(path, 'rb') as f:
+        if start is None:
+            records = serializers.load(f)
+        else:
+            f.seek(start)
+            records = serializers.checked(serializers.serializers[
+                "binary"].load_range(f, size, shapes))
+        return [classes[record["__class__"]](**record) for record in records]
+
+
+def split_file(path, parts):
+    """
+    Returns the build_part arguments of the parts of a file: ranges of
+    records of about the same size for an uncompressed binary file, the
+    whole file otherwise, JSON and compressed files cannot be split
+    without parsing them.
+
+    Args:
+        path (str): path of the file.
+        parts (int): number of parts wanted.
+    """
+    binary = serializers.serializers["binary"]
+    with open(path, 'rb') as f:
+        if parts < 2 or serializers.decompressed(f) is not f or \
+                serializers.detect(f) is not binary:
+            return [(path,)]
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            try:
+                ranges = binary.split(mapped, parts)
+            except serializers.DECODE_ERRORS as error:
+                raise ValueError("truncated or corrupt file: {}".format(
+                    error)) from error
+    return [(path,) + part for part in ranges]
+
+
+def shard_name(name):
+    """Returns the file name of the shard of a class: State -> states.json"""
+    name = name.lower()
+    return (name[:-1] + "ies" if name.endswith("y") else name + "s") + ".json"
 
 
 class FileStorage:
@@ -23,14 +107,100 @@ class FileStorage:
         __file_path (str): path to the JSON file
         __objects (dictionary): empty but will store all objects by
                                 <class name>.id
+        __stats (dictionary): counters of the work done by the storage
+        __lock (ReadWriteLock): guards __objects, readers share it while
+                                new, bulk_new, delete and reload are
+                                serialized
+        __save_lock (Lock): serializes the accesses to the JSON file
+        __generation (int): generation of the JSON file when it was last
+                            read or written by this process
+        __synced (dictionary): <class name>.id -> updated_at of the records
+                               of the JSON file at that generation
+        __dirty (set): keys added or updated since the last save
+        __deleted (set): keys deleted since the last save
+        __marks (dictionary): <class name>.id -> __version of the last new
+                              or delete of the keys of __dirty and
+                              __deleted, a save only forgets the keys not
+                              marked again while it wrote them
+        __by_class (dictionary): class name -> {<class name>.id: object},
+                                 the index of __objects by class
+        __indexed (dictionary): the __objects __by_class was built from
+        __published (dictionary): class name -> frozen copy of its index,
+                                  dropped when the class is written
+        __version (int): bumped by every change of __objects
+        __snapshot (Snapshot): the snapshot of the current version, if any
+        __writer (WriteBehind): the thread writing the saves in write-behind
+                                mode, None when save() writes the file
+        __serializer: the serializer of the saves, JSON by default, the
+                      format of the file is detected when it is read
+        __compression (str): compression of the saves, "none", "gzip" or
+                             "zstd", detected when the file is read
+        __layout (str): "single" for one file of all the classes, or
+                        "sharded" for a file per class
+        __unloaded (set): names of the classes whose shard must be read
+                          before their objects are used, sharded layout
+        __workers (int): processes building the objects of a reload from
+                         an empty memory, 1 builds them in this process
+
+    Several processes may share the JSON file: they hold an advisory lock
+    on <file>.lock while they access it and bump the generation stored in
+    that lock file on every save. A process finding a newer generation
+    merges the records changed by the others, rebuilding only the objects
+    whose updated_at moved, instead of clobbering them or fully reloading.
+
+    Readers wanting a consistent view of several classes take a snapshot():
+    the frozen copies of the classes untouched since the previous snapshot
+    are shared with it, only the written classes are copied again.
+
+    In write-behind mode save() returns at once and a background thread
+    writes the file once for all the saves of the last delay seconds, see
+    write_behind(). flush() writes them now and they are flushed at exit.
+
+    In the sharded layout, see set_layout(), every class has its own file
+    next to the JSON file (states.json, places.json, ...). save() only
+    rewrites the files of the classes changed since the last save and
+    reload() reads no file: the shard of a class is read the first time
+    its objects are queried.
+
+    With several reload workers, see set_reload_workers(), the classes that
+    have no object in memory yet are read by a pool of processes: the
+    uncompressed binary files are split into ranges of records and the
+    other files are read whole, every process decodes and builds the
+    objects of its part only, this process merges them.
     """
     __file_path = "file.json"
     __objects = {}
+    __stats = {"objects_scanned": 0, "saves": 0, "save_seconds": 0.0,
+               "reloads": 0, "reload_seconds": 0.0, "shard_reads": 0,
+               "shard_writes": 0}
+    __lock = ReadWriteLock()
+    __save_lock = Lock()
+    __generation = None
+    __synced = {}
+    __dirty = set()
+    __deleted = set()
+    __marks = {}
+    __by_class = {}
+    __indexed = None
+    __published = {}
+    __version = 0
+    __snapshot = None
+    __writer = None
+    __serializer = serializers.serializers["json"]
+    __compression = "none"
+    __layout = "single"
+    __unloaded = set()
+    __workers = 1
 
     def all(self, cls=None):
         """
         Return all of the objects or of from the given class.
 
+        The dict of a class is a new dict, safe to iterate while other
+        threads write. Without class the live self.__objects is returned,
+        iterating it must not overlap with writers and it must not be
+        modified directly.
+
         Args:
             cls (str): Name of object type. If None, queries all types of
                        objects.
@@ -38,11 +208,14 @@ class FileStorage:
             Dict of queried classes. or The self.__objects.
         """
         if cls is not None:
-            new_dict = {}
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return new_dict
+            name = cls if isinstance(cls, str) else cls.__name__
+            self.__load([name])
+            self.__check_index()
+            with self.__lock.read():
+                class_map = self.__by_class.get(name, {})
+                self.__stats["objects_scanned"] += len(class_map)
+                return dict(class_map)
+        self.__load(None)
         return self.__objects
 
     def get(self, cls, id):
@@ -58,10 +231,9 @@ class FileStorage:
         CLASS = classes[cls.__name__]
         if CLASS is None:
             return None
-        for value in self.all(CLASS).values():
-            if value.id == id:
-                return value
-        return None
+        self.__load([CLASS.__name__])
+        with self.__lock.read():
+            return self.__objects.get(CLASS.__name__ + "." + str(id))
 
     def new(self, obj):
         """
@@ -72,29 +244,251 @@ class FileStorage:
         """
         if obj is not None:
             key = obj.__class__.__name__ + "." + obj.id
-            self.__objects[key] = obj
+            with self.__lock.write():
+                self.__put(key, obj)
+                self.__dirty.add(key)
+                self.__deleted.discard(key)
+                self.__changed()
+                self.__marks[key] = self.__version
+
+    def bulk_new(self, objs):
+        """
+        Adds many objects at once, the bulk version of new()
+
+        Args:
+            objs (iterable): given objects
+        """
+        objs = {obj.__class__.__name__ + "." + obj.id: obj for obj in objs}
+        with self.__lock.write():
+            for key, obj in objs.items():
+                self.__put(key, obj)
+            self.__dirty.update(objs)
+            self.__deleted.difference_update(objs)
+            self.__changed()
+            self.__marks.update(dict.fromkeys(objs, self.__version))
 
     def save(self):
         """
         Serializes __objects to the JSON file (path: __file_path)
+
+        In write-behind mode the save is only recorded, the background
+        thread writes the file later.
+        """
+        writer = self.__writer
+        if writer is None:
+            self.__write()
+        else:
+            with self.__lock.read():
+                dirty = len(self.__dirty) + len(self.__deleted)
+            writer.mark(dirty)
+
+    def write_behind(self, delay=1.0, max_dirty=1000):
+        """
+        Switches save() to the write-behind mode: a background thread
+        writes the file when the oldest unwritten save is delay seconds old
+        or when max_dirty objects changed. A delay of None writes the
+        pending saves and goes back to synchronous saves.
+
+        Args:
+            delay (float): longest time a save waits for the file, seconds.
+            max_dirty (int): number of changed objects forcing a write.
+        """
+        writer = self.__writer
+        if writer is not None:
+            FileStorage.__writer = None
+            writer.stop()
+        atexit.unregister(self.__shutdown)
+        if delay is not None:
+            FileStorage.__writer = WriteBehind(self.__write, delay, max_dirty)
+            atexit.register(self.__shutdown)
+
+    def set_format(self, name):
+        """
+        Chooses the format written by the next saves, the files of every
+        format are read.
+
+        Args:
+            name (str): "json" or "binary", see models.engine.serializers.
+        """
+        FileStorage.__serializer = serializers.serializers[name]
+
+    def set_compression(self, name):
+        """
+        Chooses the compression of the next saves, the files of every
+        compression are read.
+
+        Args:
+            name (str): "none", "gzip" or "zstd" (needs zstandard).
+        """
+        if name not in serializers.compressions():
+            raise ValueError("unknown or unavailable compression {}"
+                             .format(name))
+        FileStorage.__compression = name
+
+    def set_reload_workers(self, workers):
+        """
+        Chooses the number of processes building the objects when the
+        classes read have no object in memory yet.
+
+        Args:
+            workers (int): number of processes, 1 reads in this process.
+        """
+        if workers < 1:
+            raise ValueError("reload workers must be at least 1")
+        FileStorage.__workers = workers
+
+    def set_layout(self, layout):
+        """
+        Chooses between a single file of all the classes and a file per
+        class. The objects are kept: the next save writes every class in
+        the new layout.
+
+        Args:
+            layout (str): "single" or "sharded".
+        """
+        if layout not in LAYOUTS:
+            raise ValueError("unknown layout {}".format(layout))
+        if layout == self.__layout:
+            return
+        self.__load(None)
+        with self.__save_lock:
+            FileStorage.__layout = layout
+            with self.__lock.write():
+                self.__dirty.update(self.__objects)
+
+    def flush(self):
+        """Writes the saves still waiting for the write-behind thread"""
+        writer = self.__writer
+        if writer is not None:
+            writer.flush()
+
+    def __shutdown(self):
+        """Writes the pending saves at the exit of the interpreter"""
+        self.write_behind(None)
+
+    def __write(self):
+        """
+        Writes __objects to the JSON file, or the changed classes to their
+        shards.
+
+        The changes saved by other processes since our last access are
+        merged first. The file is written aside then renamed over the
+        previous one, so that a concurrent reload never reads a half
+        written file.
+        """
+        start = perf_counter()
+        lock = FileLock(self.__file_path + ".lock")
+        with self.__save_lock, lock.exclusive() as fd:
+            generation = lock.read(fd)
+            if self.__layout == "sharded":
+                self.__write_shards(generation)
+            else:
+                if generation != self.__generation:
+                    self.__merge(self.__read_file())
+                with self.__lock.read():
+                    records = [serializers.record(obj)
+                               for obj in self.__objects.values()]
+                    saved = self.__marked()
+                self.__dump(self.__file_path, records)
+                FileStorage.__synced = self.__stamps(records)
+                self.__saved(saved)
+            lock.write(fd, generation + 1)
+            FileStorage.__generation = generation + 1
+        self.__stats["saves"] += 1
+        self.__stats["save_seconds"] += perf_counter() - start
+
+    def __write_shards(self, generation):
+        """
+        Writes the shards of the classes changed since the last save, the
+        save lock and the file lock are held.
+
+        Args:
+            generation (int): generation of the files before the save.
         """
-        json_objects = {}
-        for key in self.__objects:
-            json_objects[key] = self.__objects[key].to_dict()
-        with open(self.__file_path, 'w') as f:
-            json.dump(json_objects, f)
+        if generation != self.__generation:
+            # another process saved: the classes read may be stale
+            FileStorage.__unloaded = set(classes)
+        with self.__lock.read():
+            saved = self.__marked()
+        names = {key.split(".", 1)[0] for key in saved}
+        self.__read_shards(names)
+        synced = dict(self.__synced)
+        for name in names:
+            self.__check_index()
+            with self.__lock.read():
+                records = [serializers.record(obj) for obj in
+                           self.__by_class.get(name, {}).values()]
+            self.__dump(self.__shard_path(name), records)
+            for key in [key for key in synced
+                        if key.split(".", 1)[0] == name]:
+                del synced[key]
+            synced.update(self.__stamps(records))
+            self.__stats["shard_writes"] += 1
+        FileStorage.__synced = synced
+        self.__saved(saved)
+
+    def __dump(self, path, records):
+        """Writes records to a file aside, then renames it over path"""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f, \
+                serializers.compressed(f, self.__compression) as stream:
+            self.__serializer.dump(records, stream)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def __stamps(records):
+        """Returns <class name>.id -> updated_at of records"""
+        return {record["__class__"] + "." + record["id"]:
+                serializers.stamp(record.get("updated_at"))
+                for record in records}
+
+    def __marked(self):
+        """
+        Returns <class name>.id -> mark of the keys to save, the lock is
+        held
+        """
+        return {key: self.__marks.get(key)
+                for key in self.__dirty | self.__deleted}
+
+    def __saved(self, saved):
+        """
+        Forgets the changes of the keys saved, unless they were marked
+        again while they were written: they stay for the next save.
+
+        Args:
+            saved (dict): the __marked() keys taken before the write.
+        """
+        with self.__lock.write():
+            for key, mark in saved.items():
+                if self.__marks.get(key) == mark:
+                    self.__dirty.discard(key)
+                    self.__deleted.discard(key)
+                    self.__marks.pop(key, None)
 
     def reload(self):
         """
         Deserializes from the JSON file to __objects
+
+        Only the records changed since the last access of this process are
+        rebuilt, the objects deleted from the file by other processes are
+        removed and the unsaved local changes are kept. In the sharded
+        layout the shards are read later, when their classes are queried.
         """
+        start = perf_counter()
+        lock = FileLock(self.__file_path + ".lock")
         try:
-            with open(self.__file_path, 'r') as f:
-                jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
-        except:
+            with self.__save_lock, lock.shared() as fd:
+                generation = lock.read(fd)
+                if self.__layout == "sharded":
+                    FileStorage.__unloaded = set(classes)
+                    self.__adopt_single_file()
+                else:
+                    self.__merge_files([self.__file_path], classes)
+                FileStorage.__generation = generation
+        except (OSError, ValueError, KeyError):
             pass
+        self.__stats["reloads"] += 1
+        self.__stats["reload_seconds"] += perf_counter() - start
 
     def delete(self, obj=None):
         """
@@ -105,15 +499,301 @@ class FileStorage:
         """
         if obj is not None:
             key = obj.__class__.__name__ + '.' + obj.id
-            if key in self.__objects:
-                del self.__objects[key]
+            with self.__lock.write():
+                self.__remove(key)
+                self.__dirty.discard(key)
+                self.__deleted.add(key)
+                self.__changed()
+                self.__marks[key] = self.__version
 
     def close(self):
         """
         Closes by call reload() method for deserializing the JSON file to
-        objects.
+        objects, only when another process saved it since our last access.
+        """
+        lock = FileLock(self.__file_path + ".lock")
+        if lock.generation() != self.__generation:
+            self.reload()
+
+    def reset(self, objects=None):
+        """
+        Forgets the objects in memory, the unsaved changes and what was
+        read of the files, so that the next reload() reads every file.
+
+        Args:
+            objects (dictionary): <class name>.id -> object to hold in
+                                  memory instead of nothing.
+        """
+        with self.__save_lock, self.__lock.write():
+            FileStorage.__objects = dict(objects or {})
+            FileStorage.__generation = None
+            FileStorage.__synced = {}
+            FileStorage.__dirty = set()
+            FileStorage.__deleted = set()
+            FileStorage.__marks = {}
+            FileStorage.__unloaded = set()
+            self.__reindex()
+
+    def __read_file(self, path=None):
+        """
+        Yields the records of the file, or of the file at path, one at a
+        time and in any format, none when the file does not exist.
+        """
+        try:
+            f = open(path or self.__file_path, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            yield from serializers.load(f)
+
+    def __shard_path(self, name):
+        """Returns the path of the shard of a class"""
+        return os.path.join(os.path.dirname(self.__file_path),
+                            shard_name(name))
+
+    def __load(self, names):
+        """
+        Reads the shards of the given classes, or of all the classes if
+        None, that were not read since the last reload.
+        """
+        unloaded = self.__unloaded
+        if not unloaded:
+            return
+        names = unloaded if names is None else unloaded.intersection(names)
+        if not names:
+            return
+        lock = FileLock(self.__file_path + ".lock")
+        with self.__save_lock, lock.shared():
+            self.__read_shards(names)
+
+    def __read_shards(self, names):
+        """
+        Merges the shards of the given classes not read yet, the save lock
+        is held.
+        """
+        names = self.__unloaded.intersection(names)
+        if not names:
+            return
+        paths = [self.__shard_path(name) for name in names]
+        paths = [path for path in paths if os.path.exists(path)]
+        self.__stats["shard_reads"] += len(paths)
+        self.__merge_files(paths, names, names)
+        FileStorage.__unloaded = self.__unloaded - names
+
+    def __merge_files(self, paths, names, scope=None):
+        """
+        Merges the records of files, built by the pool of processes when
+        there are several workers and the classes read have no object in
+        memory.
+
+        Args:
+            paths (list): paths of the files.
+            names (iterable): names of the classes of the files.
+            scope (set): classes the files hold all the objects of, every
+                         class if None, see __merge
+        """
+        if self.__workers > 1 and paths:
+            with self.__lock.read():
+                empty = not any(key.split(".", 1)[0] in names
+                                for key in self.__objects)
+            tasks = self.__split(paths) if empty else []
+            if len(tasks) > 1:
+                self.__merge(self.__build_parallel(tasks), scope, True)
+                return
+        self.__merge((record for path in paths
+                      for record in self.__read_file(path)), scope)
+
+    def __split(self, paths):
+        """
+        Returns the build_part arguments of the parts of the files, every
+        file being split in proportion to its size when it can be.
+        """
+        sizes = {path: os.path.getsize(path) for path in paths
+                 if os.path.exists(path)}
+        total = sum(sizes.values()) or 1
+        tasks = []
+        for path, size in sizes.items():
+            tasks.extend(split_file(path, round(self.__workers * size /
+                                                total)))
+        return tasks
+
+    def __build_parallel(self, tasks):
+        """Yields the objects of the parts of files built by the pool"""
+        with ProcessPoolExecutor(min(self.__workers, len(tasks))) as pool:
+            for objs in pool.map(build_part, *zip(*tasks)):
+                yield from objs
+
+    def __adopt_single_file(self):
         """
-        self.reload()
+        Starts the sharded layout from the single file when no shard
+        exists yet: its objects are read and saved in the shards by the
+        next save.
+        """
+        if any(os.path.exists(self.__shard_path(name)) for name in classes):
+            return
+        if os.path.exists(self.__file_path):
+            FileStorage.__unloaded = set()
+            self.__merge(self.__read_file())
+            with self.__lock.write():
+                self.__dirty.update(self.__synced)
+
+    def __merge(self, records, names=None, built=False):
+        """
+        Applies the records of the JSON file to __objects: the records new
+        or updated since the last access are rebuilt, the objects removed
+        from the file are deleted, the local unsaved changes win.
+
+        Args:
+            records (iterable): the dicts of the objects, consumed one at
+                                a time
+            names (set): classes the records are all the objects of, every
+                         class if None
+            built (bool): whether records are objects already built
+        """
+        changed = {}
+        synced = {}
+        if names is not None:
+            synced = {key: stamp for key, stamp in self.__synced.items()
+                      if key.split(".", 1)[0] not in names}
+        for record in records:
+            if built:
+                key = record.__class__.__name__ + "." + record.id
+                stamp = serializers.stamp(getattr(record, "updated_at", None))
+            else:
+                key = record["__class__"] + "." + record["id"]
+                stamp = serializers.stamp(record.get("updated_at"))
+            synced[key] = stamp
+            if key in self.__dirty or key in self.__deleted or \
+                    (self.__synced.get(key) == stamp and
+                     key in self.__objects):
+                continue
+            changed[key] = record if built else \
+                classes[record["__class__"]](**record)
+        gone = [key for key in self.__synced
+                if key not in synced and
+                (names is None or key.split(".", 1)[0] in names)]
+        with self.__lock.write():
+            # the objects were built without the lock: a key changed by
+            # new() or delete() meanwhile keeps its local change
+            applied = False
+            for key, obj in changed.items():
+                if key not in self.__dirty and key not in self.__deleted:
+                    self.__put(key, obj)
+                    applied = True
+            for key in gone:
+                if key not in self.__dirty:
+                    self.__remove(key)
+                    applied = True
+            if applied:
+                self.__changed()
+        FileStorage.__synced = synced
+
+    def __check_index(self):
+        """Rebuilds __by_class when __objects was replaced"""
+        if self.__indexed is not self.__objects:
+            with self.__lock.write():
+                self.__reindex()
+
+    def __reindex(self):
+        """Rebuilds __by_class if needed, the write lock is held"""
+        if self.__indexed is self.__objects:
+            return
+        by_class = {}
+        for key, obj in self.__objects.items():
+            by_class.setdefault(obj.__class__.__name__, {})[key] = obj
+        FileStorage.__by_class = by_class
+        FileStorage.__indexed = self.__objects
+        FileStorage.__published = {}
+        self.__changed()
+
+    def __put(self, key, obj):
+        """Stores obj in __objects and __by_class, the write lock is held"""
+        self.__reindex()
+        name = obj.__class__.__name__
+        self.__objects[key] = obj
+        self.__by_class.setdefault(name, {})[key] = obj
+        self.__published.pop(name, None)
+
+    def __remove(self, key):
+        """Removes key from __objects and __by_class, write lock held"""
+        self.__reindex()
+        obj = self.__objects.pop(key, None)
+        if obj is not None:
+            name = obj.__class__.__name__
+            self.__by_class.get(name, {}).pop(key, None)
+            self.__published.pop(name, None)
+
+    def __changed(self):
+        """Starts a new version of __objects, the write lock is held"""
+        FileStorage.__version += 1
+        FileStorage.__snapshot = None
+
+    def snapshot(self):
+        """
+        Returns an immutable Snapshot of the objects, consistent across the
+        classes and readable without any lock. Taking the snapshot of an
+        unchanged version is free, after writes only the written classes
+        are copied.
+        """
+        self.__load(None)
+        self.__check_index()
+        snapshot = self.__snapshot
+        if snapshot is not None:
+            return snapshot
+        with self.__lock.read():
+            published = self.__published
+            for name, class_map in self.__by_class.items():
+                if name not in published:
+                    published[name] = MappingProxyType(dict(class_map))
+            snapshot = Snapshot(self.__version, dict(published))
+            FileStorage.__snapshot = snapshot
+        return snapshot
+
+    def records(self, cls=None):
+        """
+        Yields the records of the objects, the classes in foreign key
+        order. They are copied first under the read lock, as a save does:
+        the objects of a snapshot are the live ones, an update made while
+        they are read could refer to an object created after it.
+
+        Args:
+            cls (str): class or name of the class, or iterable of them, all
+                       the classes if None.
+        """
+        names = class_names(cls)
+        self.__load(names)
+        self.__check_index()
+        with self.__lock.read():
+            records = [serializers.record(obj) for name in names
+                       for obj in self.__by_class.get(name, {}).values()]
+        yield from records
+
+    def iter(self, cls=None, batch_size=1000):
+        """
+        Yields the objects of the given class, or of all the classes in
+        foreign key order, batch_size at a time: the keys of a class are
+        listed once, then each batch of objects is read under the read lock
+        and yielded without it, so the writers go on meanwhile. The objects
+        deleted since the listing are skipped, those added are not yielded.
+
+        Args:
+            cls (str): class or name of the class, all the classes if None.
+            batch_size (int): objects read per hold of the lock.
+        """
+        names = list(order) if cls is None else \
+            [cls if isinstance(cls, str) else cls.__name__]
+        self.__load(names)
+        self.__check_index()
+        for name in names:
+            with self.__lock.read():
+                keys = list(self.__by_class.get(name, {}))
+                self.__stats["objects_scanned"] += len(keys)
+            for start in range(0, len(keys), batch_size):
+                with self.__lock.read():
+                    objs = map(self.__by_class.get(name, {}).get,
+                               keys[start:start + batch_size])
+                    objs = [obj for obj in objs if obj is not None]
+                yield from objs
 
     def count(self, cls=None):
         """
@@ -129,4 +809,19 @@ class FileStorage:
             CLASS = classes[cls.__name__]
             if CLASS is None:
                 return len(self.all())
-        return len(self.all(CLASS))
+        self.__load([CLASS.__name__])
+        self.__check_index()
+        with self.__lock.read():
+            return len(self.__by_class.get(CLASS.__name__, {}))
+
+    def stats(self):
+        """
+        Returns a copy of the storage counters: objects scanned by the class
+        queries, number and total duration of the saves and of the reloads,
+        plus the saves, flushes and lag of the write-behind thread if any.
+        """
+        stats = dict(self.__stats)
+        writer = self.__writer
+        if writer is not None:
+            stats.update(writer.stats())
+        return stats
@@ -0,0 +1,134 @@
+#!/usr/bin/python3
+"""
+Script for the locks shared by the storage engines
+"""
+from contextlib import contextmanager
+import fcntl
+import os
+from threading import Condition, Lock
+
+
+class ReadWriteLock:
+    """
+    Lock letting any number of readers in at once, or a single writer.
+
+    Waiting writers take precedence over new readers so that a steady flow
+    of readers cannot starve them. The lock is not reentrant: a thread
+    holding it must not acquire it again.
+    """
+
+    def __init__(self):
+        """Initializes an unlocked lock"""
+        self.__cond = Condition(Lock())
+        self.__readers = 0
+        self.__writing = False
+        self.__writers_waiting = 0
+
+    def acquire_read(self):
+        """Blocks until no writer holds or waits for the lock"""
+        with self.__cond:
+            while self.__writing or self.__writers_waiting:
+                self.__cond.wait()
+            self.__readers += 1
+
+    def release_read(self):
+        """Releases a read hold of the lock"""
+        with self.__cond:
+            self.__readers -= 1
+            if self.__readers == 0:
+                self.__cond.notify_all()
+
+    def acquire_write(self):
+        """Blocks until the lock is free of readers and writers"""
+        with self.__cond:
+            self.__writers_waiting += 1
+            while self.__writing or self.__readers:
+                self.__cond.wait()
+            self.__writers_waiting -= 1
+            self.__writing = True
+
+    def release_write(self):
+        """Releases the write hold of the lock"""
+        with self.__cond:
+            self.__writing = False
+            self.__cond.notify_all()
+
+    @contextmanager
+    def read(self):
+        """Context manager holding the lock for reading"""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self):
+        """Context manager holding the lock for writing"""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class FileLock:
+    """
+    Advisory lock shared between processes (flock on a lock file), the lock
+    file also stores the generation counter of the locked data.
+
+    Every hold opens its own descriptor, so the threads of a process exclude
+    each other like separate processes do.
+
+    Attributes:
+        path (str): path of the lock file, created when missing.
+    """
+
+    def __init__(self, path):
+        """Initializes the lock of the lock file path"""
+        self.path = path
+
+    @contextmanager
+    def __hold(self, operation):
+        """Context manager holding the flock operation, yields the fd"""
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, operation)
+            yield fd
+        finally:
+            os.close(fd)
+
+    def shared(self):
+        """Context manager holding the lock with the other readers"""
+        return self.__hold(fcntl.LOCK_SH)
+
+    def exclusive(self):
+        """Context manager holding the lock alone"""
+        return self.__hold(fcntl.LOCK_EX)
+
+    @staticmethod
+    def read(fd):
+        """Returns the generation stored in the held lock file"""
+        try:
+            return int(os.pread(fd, 32, 0) or 0)
+        except ValueError:
+            return 0
+
+    @staticmethod
+    def write(fd, generation):
+        """Stores generation in the lock file held exclusively"""
+        os.ftruncate(fd, 0)
+        os.pwrite(fd, str(generation).encode(), 0)
+
+    def generation(self):
+        """
+        Returns the generation without taking the lock, 0 when the lock file
+        does not exist yet and None when it cannot be read.
+        """
+        try:
+            with open(self.path, 'rb') as f:
+                return int(f.read() or 0)
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError):
+            return None
@@ -0,0 +1,430 @@
+#!/usr/bin/python3
+"""
+Script for the MappedStorage class, a FileStorage keeping its records on disk
+"""
+from collections import OrderedDict
+import mmap
+import os
+from os import getenv
+from threading import Lock
+from time import perf_counter
+from types import MappingProxyType
+from models.engine.file_storage import class_names, classes, order
+from models.engine.serializers import BinarySerializer, U32, record
+from models.engine.snapshot import Snapshot
+
+
+class MappedStorage:
+    """
+    Keeps the records in a memory-mapped file and only the recently used
+    objects in memory.
+
+    The file is in the binary format of models.engine.serializers, so
+    FileStorage reads it and `python3 -m models.engine.serializers` converts
+    it. reload() maps the file and scans it once, decoding only the class
+    and the id of every record, to build the index of class name -> id ->
+    position of the record values. get() decodes one record on demand and
+    keeps the object in a bounded LRU cache, count() is the size of the
+    index: resident memory grows with the index and the working set, not
+    with the objects of the file.
+
+    The objects added with new() are held until save(), which writes a new
+    file aside then renames it over the previous one: the unchanged records
+    are copied byte for byte from the map, only the new objects are
+    encoded. One process writes a store, the others may read it.
+
+    Attributes:
+        path (str): path of the file, HBNB_MAPPED_PATH or file.hbnb
+        cache_size (int): number of decoded objects kept in memory,
+                          HBNB_MAPPED_CACHE or 10000
+        __lock (Lock): guards the map, the index, the cache and the
+                       pending changes
+        __map (mmap): the mapped file, None when it does not exist
+        __stamp (tuple): inode, size and modification time of the mapped
+                         file, None when it does not exist
+        __shapes (list): shapes of the records of the file
+        __index (dictionary): class name -> id -> (position of the values,
+                              end of the record, shape index) of the
+                              records of the file, None for the new objects
+        __cache (OrderedDict): <class name>.id -> object, least recently
+                               used first
+        __pending (dictionary): <class name>.id -> object added or updated
+                                since the last save
+        __deleted (set): <class name>.id deleted since the last save
+        __version (int): bumped by every change of the objects
+        __stats (dictionary): counters of the work done by the storage
+    """
+
+    def __init__(self, path=None, cache_size=None):
+        """
+        Constructor method for MappedStorage class
+
+        Args:
+            path (str): path of the file, HBNB_MAPPED_PATH or file.hbnb if
+                        None.
+            cache_size (int): number of decoded objects kept in memory,
+                              HBNB_MAPPED_CACHE or 10000 if None.
+        """
+        self.path = path or getenv("HBNB_MAPPED_PATH") or "file.hbnb"
+        if cache_size is None:
+            cache_size = int(getenv("HBNB_MAPPED_CACHE", 10000))
+        self.cache_size = cache_size
+        self.__lock = Lock()
+        self.__serializer = BinarySerializer()
+        self.__map = None
+        self.__stamp = None
+        self.__shapes = []
+        self.__index = {}
+        self.__cache = OrderedDict()
+        self.__pending = {}
+        self.__deleted = set()
+        self.__version = 0
+        self.__stats = {"objects_scanned": 0, "saves": 0, "save_seconds": 0.0,
+                        "reloads": 0, "reload_seconds": 0.0,
+                        "cache_hits": 0, "cache_misses": 0}
+
+    @staticmethod
+    def __name(cls):
+        """Returns the class name of a class or of a class name"""
+        return cls if isinstance(cls, str) else cls.__name__
+
+    def __load(self, name, id, location):
+        """
+        Returns the object of a record, from the cache or decoded from the
+        map, the lock is held.
+        """
+        key = name + "." + id
+        obj = self.__pending.get(key)
+        if obj is not None:
+            return obj
+        obj = self.__cache.get(key)
+        if obj is not None:
+            self.__cache.move_to_end(key)
+            self.__stats["cache_hits"] += 1
+            return obj
+        self.__stats["cache_misses"] += 1
+        start, end, shape = location
+        shape = self.__shapes[shape]
+        values = self.__serializer.read_values(self.__map, start,
+                                               shape[1:])[0]
+        obj = classes[name](**values)
+        self.__cache[key] = obj
+        if len(self.__cache) > self.cache_size:
+            self.__cache.popitem(last=False)
+        return obj
+
+    def all(self, cls=None):
+        """
+        Returns the objects of the given class, or of all the classes,
+        decoding the records missing from the cache.
+
+        Args:
+            cls (str): class or name of the class, all the classes if None.
+        Return:
+            New dict of <class name>.id -> object.
+        """
+        objs = {}
+        with self.__lock:
+            names = list(self.__index) if cls is None else [self.__name(cls)]
+            for name in names:
+                ids = self.__index.get(name, {})
+                self.__stats["objects_scanned"] += len(ids)
+                for id, location in list(ids.items()):
+                    objs[name + "." + id] = self.__load(name, id, location)
+        return objs
+
+    def get(self, cls, id):
+        """
+        Returns the object of the given class and id, None if missing.
+
+        Args:
+            cls (str): class or name of the class.
+            id (str): id of the object.
+        """
+        name = self.__name(cls)
+        id = str(id)
+        with self.__lock:
+            location = self.__index.get(name, {}).get(id, False)
+            if location is False:
+                return None
+            return self.__load(name, id, location)
+
+    def count(self, cls=None):
+        """
+        Returns the number of objects of the given class, or of all the
+        classes, without decoding any record.
+
+        Args:
+            cls (str): class or name of the class, all the classes if None.
+        """
+        with self.__lock:
+            if cls is not None:
+                return len(self.__index.get(self.__name(cls), {}))
+            return sum(len(ids) for ids in self.__index.values())
+
+    def new(self, obj):
+        """
+        Adds or updates an object, written by the next save()
+
+        Args:
+            obj (object): given object
+        """
+        if obj is not None:
+            self.bulk_new([obj])
+
+    def bulk_new(self, objs):
+        """
+        Adds many objects at once, the bulk version of new()
+
+        Args:
+            objs (iterable): given objects
+        """
+        with self.__lock:
+            for obj in objs:
+                name = obj.__class__.__name__
+                key = name + "." + obj.id
+                self.__pending[key] = obj
+                self.__deleted.discard(key)
+                self.__cache.pop(key, None)
+                self.__index.setdefault(name, {}).setdefault(obj.id, None)
+            self.__version += 1
+
+    def delete(self, obj=None):
+        """
+        Deletes an object, removed from the file by the next save()
+
+        Args:
+            obj (object): given object
+        """
+        if obj is not None:
+            name = obj.__class__.__name__
+            key = name + "." + obj.id
+            with self.__lock:
+                self.__index.get(name, {}).pop(obj.id, None)
+                self.__pending.pop(key, None)
+                self.__cache.pop(key, None)
+                self.__deleted.add(key)
+                self.__version += 1
+
+    def save(self):
+        """
+        Writes the store to a new file renamed over the previous one: the
+        records of the unchanged objects are copied from the map, the
+        pending objects are encoded.
+        """
+        start = perf_counter()
+        serializer = self.__serializer
+        tmp_path = self.path + ".tmp"
+        with self.__lock:
+            if self.__map is not None and not self.__pending and \
+                    not self.__deleted:
+                return
+            shapes = {}
+            index = {}
+            with open(tmp_path, 'wb') as f:
+                f.write(serializer.magic)
+                pos = len(serializer.magic)
+                for name, ids in self.__index.items():
+                    locations = index[name] = {}
+                    for id, location in ids.items():
+                        obj = self.__pending.get(name + "." + id)
+                        if obj is not None:
+                            values = record(obj)
+                            del values["__class__"]
+                            shape = (name, "id") + tuple(
+                                field for field in values if field != "id")
+                            values = serializer.values(values, shape[1:])
+                        else:
+                            start_value, end, shape = location
+                            shape = tuple(self.__shapes[shape])
+                            values = self.__map[start_value:end]
+                        header = serializer.header(shape, shapes)
+                        size = len(header) + len(values)
+                        f.write(U32.pack(size) + header + values)
+                        locations[id] = (pos + 4 + len(header),
+                                         pos + 4 + size, shapes[shape])
+                        pos += 4 + size
+            os.replace(tmp_path, self.path)
+            self.__close_map()
+            self.__open_map()
+            self.__shapes = [list(shape) for shape in shapes]
+            self.__index = index
+            for key, obj in self.__pending.items():
+                self.__cache[key] = obj
+            while len(self.__cache) > self.cache_size:
+                self.__cache.popitem(last=False)
+            self.__pending = {}
+            self.__deleted = set()
+        self.__stats["saves"] += 1
+        self.__stats["save_seconds"] += perf_counter() - start
+
+    def reload(self):
+        """
+        Maps the file and indexes its records, the unsaved changes are
+        kept and the cache is emptied.
+        """
+        start = perf_counter()
+        with self.__lock:
+            self.__close_map()
+            self.__open_map()
+            self.__cache.clear()
+            self.__shapes, self.__index = self.__scan()
+            for key in self.__deleted:
+                name, id = key.split(".", 1)
+                self.__index.get(name, {}).pop(id, None)
+            for key, obj in self.__pending.items():
+                self.__index.setdefault(obj.__class__.__name__,
+                                        {}).setdefault(obj.id, None)
+            self.__version += 1
+        self.__stats["reloads"] += 1
+        self.__stats["reload_seconds"] += perf_counter() - start
+
+    def __scan(self):
+        """
+        Returns the shapes and the index of the records of the map, only
+        the fields up to the id of every record are decoded.
+        """
+        shapes = []
+        index = {}
+        mapped = self.__map
+        if mapped is None:
+            return shapes, index
+        serializer = self.__serializer
+        magic = serializer.magic
+        if mapped[:len(magic)] != magic:
+            raise ValueError("{} is not a binary HBNB file".format(self.path))
+        prefixes = []
+        pos = len(magic)
+        size = len(mapped)
+        while pos < size:
+            length, = U32.unpack_from(mapped, pos)
+            end = pos + 4 + length
+            shape, values = serializer.read_header(mapped, pos + 4, shapes)
+            if shape == len(prefixes):
+                names = shapes[shape][1:]
+                prefixes.append(names[:names.index("id") + 1])
+            id = serializer.read_values(mapped, values,
+                                        prefixes[shape])[0]["id"]
+            index.setdefault(shapes[shape][0], {})[id] = (values, end, shape)
+            pos = end
+        return shapes, index
+
+    @staticmethod
+    def __stat(path=None, fd=None):
+        """
+        Returns the inode, size and modification time of a file, None when
+        it does not exist.
+        """
+        try:
+            st = os.stat(path) if fd is None else os.fstat(fd)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_size, st.st_mtime_ns
+
+    def __open_map(self):
+        """Maps the file read only, the lock is held"""
+        self.__stamp = None
+        try:
+            with open(self.path, 'rb') as f:
+                self.__stamp = self.__stat(fd=f.fileno())
+                self.__map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            self.__map = None
+
+    def __close_map(self):
+        """
+        Drops the map of the file, the lock is held. It is unmapped once
+        the iterations of records() using it are over.
+        """
+        self.__map = None
+
+    def __entries(self, cls, copy=False):
+        """
+        Yields the class name, the pending object or None and the decoded
+        values or None of the records of the store at the time of the call,
+        the classes in foreign key order, without holding the lock: the
+        saves replace the file and the map, the map read here stays valid.
+        With copy, the records of the pending objects are copied under the
+        lock and yielded as values, the objects may change later.
+        """
+        names = class_names(cls)
+        with self.__lock:
+            index = {name: dict(self.__index.get(name, {})) for name in names}
+            pending = dict(self.__pending)
+            if copy:
+                pending = {key: record(obj) for key, obj in pending.items()}
+            shapes = list(self.__shapes)
+            mapped = self.__map
+        for name in names:
+            for id, location in index[name].items():
+                obj = pending.get(name + "." + id)
+                if obj is not None:
+                    if copy:
+                        yield name, None, obj
+                    else:
+                        yield name, obj, None
+                    continue
+                start, end, shape = location
+                yield name, None, self.__serializer.read_values(
+                    mapped, start, shapes[shape][1:])[0]
+
+    def records(self, cls=None):
+        """
+        Yields the records of the store at the time of the call, the
+        classes in foreign key order.
+
+        Args:
+            cls (str): class or name of the class, or iterable of them, all
+                       the classes if None.
+        """
+        for name, obj, values in self.__entries(cls, copy=True):
+            values["__class__"] = name
+            yield values
+
+    def iter(self, cls=None, batch_size=1000):
+        """
+        Yields the objects of the given class, or of all the classes in
+        foreign key order, decoded one at a time: neither a dict of the
+        objects nor the cache is filled, the memory holds the index.
+
+        Args:
+            cls (str): class or name of the class, all the classes if None.
+            batch_size (int): unused, the records are decoded one at a time;
+                              for the interface of the database storage.
+        """
+        for name, obj, values in self.__entries(cls):
+            yield obj if obj is not None else classes[name](**values)
+
+    def close(self):
+        """
+        Calls reload(), which empties the cache of the decoded objects,
+        only when another process replaced the file since it was mapped.
+        """
+        with self.__lock:
+            stamp = self.__stamp
+        if self.__stat(self.path) != stamp:
+            self.reload()
+
+    def snapshot(self):
+        """
+        Returns a Snapshot of all the objects, every record missing from
+        the cache is decoded.
+        """
+        with self.__lock:
+            version = self.__version
+        by_class = {}
+        for key, obj in self.all().items():
+            by_class.setdefault(obj.__class__.__name__, {})[key] = obj
+        return Snapshot(version, {name: MappingProxyType(objs)
+                                  for name, objs in by_class.items()})
+
+    def stats(self):
+        """
+        Returns a copy of the storage counters: objects scanned by the class
+        queries, number and total duration of the saves and of the reloads,
+        hits and misses of the object cache and its size.
+        """
+        with self.__lock:
+            stats = dict(self.__stats)
+            stats["cache_objects"] = len(self.__cache)
+        return stats
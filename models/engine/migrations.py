@@ -0,0 +1,178 @@
+#!/usr/bin/python3
+"""
+Versioned schema migrations of the database storage
+
+Every migration moves the schema one version forward (upgrade) or back
+(downgrade). The version of a database is the single row of its
+schema_version table, 0 when the table does not exist. A migration and the
+update of the version run in the same transaction where the dialect has
+transactional DDL (SQLite, PostgreSQL).
+
+A new migration is appended to MIGRATIONS with the next version number,
+it must never be edited once released. Version 1 creates the tables from
+the current models, so a new database already has what the later versions
+add: their upgrades check the schema before altering it, like
+create_indexes does.
+"""
+from models.base_model import Base
+import sqlalchemy
+from sqlalchemy import Column, Integer, MetaData, Table
+
+metadata = MetaData()
+schema_version = Table('schema_version', metadata,
+                       Column('version', Integer, nullable=False))
+
+
+class Migration:
+    """
+    A step of the schema history
+
+    Attributes:
+        version (int): version of the schema after the upgrade.
+        name (str): description of the step.
+        upgrade (callable): applies the step on a connection.
+        downgrade (callable): reverts the step on a connection.
+    """
+
+    def __init__(self, version, name, upgrade, downgrade):
+        """Initializes a migration"""
+        self.version = version
+        self.name = name
+        self.upgrade = upgrade
+        self.downgrade = downgrade
+
+    def __repr__(self):
+        """Returns the version and name of the migration"""
+        return "<Migration {} {}>".format(self.version, self.name)
+
+
+def create_tables(conn):
+    """Creates the tables of the models that do not exist yet"""
+    Base.metadata.create_all(conn)
+
+
+def drop_tables(conn):
+    """Drops the tables of the models"""
+    Base.metadata.drop_all(conn)
+
+
+# indexes added by version 2, the tables created by version 1 before them
+# lack them
+INDEXES = ("ix_cities_state_id", "ix_places_user_id",
+           "ix_places_city_id_price_by_night", "ix_reviews_place_id",
+           "ix_reviews_user_id", "ix_place_amenity_amenity_id",
+           "ix_users_email")
+
+
+def create_indexes(conn):
+    """Creates the declared indexes missing from the existing tables"""
+    inspector = sqlalchemy.inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        existing = {index["name"]
+                    for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in INDEXES and index.name not in existing:
+                index.create(conn)
+
+
+def backs_foreign_key(index):
+    """Returns True if the first column of an index has a foreign key"""
+    return bool(next(iter(index.columns)).foreign_keys)
+
+
+def drop_indexes(conn):
+    """
+    Drops the indexes created by create_indexes. MySQL (InnoDB) uses them
+    for the foreign keys of their first column, in place of the indexes it
+    had made with the tables, and refuses to drop them: they stay, which
+    the upgrade to version 2 accepts.
+    """
+    inspector = sqlalchemy.inspect(conn)
+    mysql = conn.dialect.name == "mysql"
+    for table in Base.metadata.sorted_tables:
+        existing = {index["name"]
+                    for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in INDEXES and index.name in existing and \
+                    not (mysql and backs_foreign_key(index)):
+                index.drop(conn)
+
+
+MIGRATIONS = [
+    Migration(1, "create the tables", create_tables, drop_tables),
+    Migration(2, "index the foreign keys, places by city and price, unique "
+              "user emails", create_indexes, drop_indexes),
+]
+
+
+def head():
+    """Returns the version of the latest migration"""
+    return MIGRATIONS[-1].version if MIGRATIONS else 0
+
+
+def current(engine):
+    """
+    Returns the schema version of a database with a single query, 0 when
+    it has no schema_version table.
+
+    Args:
+        engine (sqlalchemy.Engine): the database.
+    """
+    try:
+        with engine.connect() as conn:
+            return conn.execute(
+                sqlalchemy.select(schema_version.c.version)).scalar() or 0
+    except sqlalchemy.exc.DBAPIError:
+        return 0
+
+
+def drop(engine):
+    """Drops the tables of the models and the schema version"""
+    Base.metadata.drop_all(engine)
+    metadata.drop_all(engine)
+
+
+def set_version(conn, version):
+    """Stores the schema version of the database of conn"""
+    metadata.create_all(conn)
+    conn.execute(schema_version.delete())
+    conn.execute(schema_version.insert().values(version=version))
+
+
+def migrate(engine, target=None, log=None):
+    """
+    Upgrades or downgrades a database to a version.
+
+    Args:
+        engine (sqlalchemy.Engine): the database.
+        target (int): version to reach, the head if None.
+        log (callable): called with the direction and the migration before
+                        every step.
+    Return:
+        The list of the (direction, migration) steps applied.
+    """
+    target = head() if target is None else target
+    if not 0 <= target <= head():
+        raise ValueError("unknown schema version {}".format(target))
+    version = current(engine)
+    steps = []
+    if target > version:
+        steps = [("upgrade", migration) for migration in MIGRATIONS
+                 if version < migration.version <= target]
+    elif target < version:
+        steps = [("downgrade", migration) for migration in
+                 reversed(MIGRATIONS)
+                 if target < migration.version <= version]
+    for direction, migration in steps:
+        if log is not None:
+            log(direction, migration)
+        with engine.begin() as conn:
+            if direction == "upgrade":
+                migration.upgrade(conn)
+                set_version(conn, migration.version)
+            else:
+                migration.downgrade(conn)
+                set_version(conn, migration.version - 1)
+    if target == 0 and steps:
+        metadata.drop_all(engine)
+    return steps
@@ -0,0 +1,576 @@
+#!/usr/bin/python3
+"""
+Serializers of the FileStorage records
+
+A record is the dict of an object: its attributes, "id" and "__class__".
+The serializers write records to a binary file object and read them back
+one at a time:
+
+    json: the historical file.json format, {"<class>.<id>": record, ...}
+          with the timestamps as "%Y-%m-%dT%H:%M:%S.%f" strings.
+    binary: the "HBNB" magic then length-prefixed records. The key is not
+            stored, the class and field names are interned (defined once,
+            then referred to by number) and the timestamps are integers.
+
+Both formats can be compressed with gzip, or with zstd when the zstandard
+package is installed. The compression is a stream around the file: records
+are compressed as they are written and decompressed as they are read,
+the whole content is never held in memory.
+
+load() detects the compression and the format from the first bytes of the
+file. A truncated or corrupt file raises ValueError whatever its format
+and compression. Convert a file with:
+
+    python3 -m models.engine.serializers file.json file.hbnb --to binary \
+        --compression zstd
+"""
+import argparse
+import codecs
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+import gzip
+import io
+import json
+from models.base_model import time
+import re
+import struct
+import zlib
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+EPOCH = datetime(1970, 1, 1)
+COMPRESSIONS = ("none", "gzip", "zstd")
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+BUFFER_SIZE = 1 << 16
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+MICROSECOND = timedelta(microseconds=1)
+# errors of a truncated or corrupt file, raised as ValueError by load()
+DECODE_ERRORS = (EOFError, IndexError, KeyError, struct.error, zlib.error,
+                 gzip.BadGzipFile) + \
+    ((zstandard.ZstdError,) if zstandard is not None else ())
+
+
+def record(obj):
+    """Returns the record of an object, its timestamps stay datetimes"""
+    new_dict = obj.__dict__.copy()
+    new_dict.pop("_sa_instance_state", None)
+    new_dict["__class__"] = obj.__class__.__name__
+    return new_dict
+
+
+def stamp(value):
+    """Returns a timestamp of a record as a string, whatever its format"""
+    return value.strftime(time) if isinstance(value, datetime) else value
+
+
+def default(value):
+    """Encodes the datetimes of the records for json"""
+    if isinstance(value, datetime):
+        return value.strftime(time)
+    raise TypeError("{!r} is not JSON serializable".format(value))
+
+
+class JSONSerializer:
+    """
+    Reads and writes the records in the JSON format
+
+    Attributes:
+        name (str): name of the format.
+    """
+    name = "json"
+
+    def dump(self, records, f):
+        """
+        Writes the records as a JSON object keyed by <class name>.id, one
+        record at a time.
+
+        Args:
+            records (iterable): the records.
+            f (file): binary file open for writing.
+        """
+        f.write(b"{")
+        separator = b""
+        for record in records:
+            key = record["__class__"] + "." + record["id"]
+            f.write(separator + json.dumps(key).encode() + b": " +
+                    json.dumps(record, default=default).encode())
+            separator = b", "
+        f.write(b"}")
+
+    def load(self, f):
+        """
+        Yields the records of a JSON file one at a time.
+
+        The file is read by blocks and every record is parsed as soon as
+        it is complete, so the memory held is a block and a record, not
+        the whole file.
+
+        Args:
+            f (file): binary file open for reading.
+        """
+        decode = json.JSONDecoder().raw_decode
+        text = codecs.getincrementaldecoder("utf-8")()
+        buffer = ""
+        pos = 0
+        eof = False
+
+        def fill():
+            """Appends the next block to the buffer, drops the parsed text"""
+            nonlocal buffer, pos, eof
+            block = f.read(BUFFER_SIZE)
+            eof = not block
+            buffer = buffer[pos:] + text.decode(block, final=eof)
+            pos = 0
+
+        def skip():
+            """Moves pos to the next character that is not a space"""
+            nonlocal pos
+            while True:
+                pos = WHITESPACE.match(buffer, pos).end()
+                if pos < len(buffer) or eof:
+                    return
+                fill()
+
+        def token(expected):
+            """Consumes the next character, one of expected"""
+            nonlocal pos
+            skip()
+            char = buffer[pos:pos + 1]
+            if not char or char not in expected:
+                raise ValueError("expected {!r} at {!r}".format(
+                    expected, buffer[pos:pos + 20]))
+            pos += 1
+            return char
+
+        def value():
+            """Parses the next value, reading blocks until it is whole"""
+            nonlocal pos
+            while True:
+                skip()
+                try:
+                    obj, end = decode(buffer, pos)
+                    if end < len(buffer) or eof:
+                        pos = end
+                        return obj
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                fill()
+
+        token("{")
+        if token('"}') == '"':
+            pos -= 1
+            while True:
+                value()
+                token(":")
+                yield value()
+                if token(",}") == "}":
+                    break
+        skip()
+        if pos < len(buffer):
+            raise ValueError("extra data at {!r}".format(buffer[pos:pos + 20]))
+
+
+# value tags of the binary format
+NONE, STR, INT, FLOAT, TRUE, FALSE, TIME, JSON = range(8)
+U32 = struct.Struct("<I")
+I64 = struct.Struct("<q")
+F64 = struct.Struct("<d")
+
+
+class BinarySerializer:
+    """
+    Reads and writes the records in the compact binary format
+
+    After the magic, every record is its uint32 length then:
+
+        uint32 shape: index of the (class, field names) of the record, a
+                      new index is followed by the class and the names
+        values: per field, a tag byte then the value, the strings and the
+                json fallback as uint32 length + utf-8, int64 integers and
+                timestamps (microseconds since the epoch), float64 floats
+
+    Attributes:
+        name (str): name of the format.
+        magic (bytes): first bytes of a binary file.
+    """
+    name = "binary"
+    magic = b"HBNB\x01"
+
+    @staticmethod
+    def __string(value):
+        """Returns the bytes of a length-prefixed string"""
+        value = value.encode()
+        return U32.pack(len(value)) + value
+
+    def __value(self, value):
+        """Returns the bytes of a tagged value"""
+        kind = type(value)
+        if kind is str:
+            return bytes((STR,)) + self.__string(value)
+        if kind is datetime:
+            return bytes((TIME,)) + I64.pack((value - EPOCH) // MICROSECOND)
+        if kind is bool:
+            return bytes((TRUE if value else FALSE,))
+        if kind is int and -2 ** 63 <= value < 2 ** 63:
+            return bytes((INT,)) + I64.pack(value)
+        if kind is float:
+            return bytes((FLOAT,)) + F64.pack(value)
+        if value is None:
+            return bytes((NONE,))
+        return bytes((JSON,)) + self.__string(json.dumps(value,
+                                                         default=default))
+
+    @classmethod
+    def header(cls, shape, shapes):
+        """
+        Returns the bytes starting a record body: the index of its shape,
+        followed by the shape itself when it is new.
+
+        Args:
+            shape (tuple): the class name then the field names.
+            shapes (dict): shape -> index of the shapes already written,
+                           a new shape is added.
+        """
+        if shape in shapes:
+            return U32.pack(shapes[shape])
+        shapes[shape] = len(shapes)
+        return U32.pack(len(shapes) - 1) + U32.pack(len(shape)) + \
+            b"".join(cls.__string(name) for name in shape)
+
+    def encode(self, record, shapes):
+        """
+        Returns the body of a record, without its length.
+
+        Args:
+            record (dict): the record.
+            shapes (dict): shape -> index of the shapes already written.
+        """
+        names = tuple(name for name in record if name != "__class__")
+        return self.header((record["__class__"],) + names, shapes) + \
+            self.values(record, names)
+
+    def values(self, record, names):
+        """
+        Returns the bytes of the values of a record.
+
+        Args:
+            record (dict): the record.
+            names (iterable): names of the fields, in the order of the shape.
+        """
+        return b"".join(self.__value(record[name]) for name in names)
+
+    def dump(self, records, f):
+        """
+        Writes the records in the binary format.
+
+        Args:
+            records (iterable): the records.
+            f (file): binary file open for writing.
+        """
+        f.write(self.magic)
+        shapes = {}
+        for record in records:
+            body = self.encode(record, shapes)
+            f.write(U32.pack(len(body)) + body)
+
+    def load(self, f):
+        """
+        Yields the records of a binary file.
+
+        Args:
+            f (file): binary file open for reading, at its start.
+        """
+        if f.read(len(self.magic)) != self.magic:
+            raise ValueError("not a binary HBNB file")
+        return self.load_range(f, None, [])
+
+    def load_range(self, f, size, shapes):
+        """
+        Yields the records of a part of a binary file.
+
+        Args:
+            f (file): binary file open for reading, at a record.
+            size (int): number of bytes of the records, to the end if None.
+            shapes (list): the shapes defined before the part, the shapes
+                           defined by its records are appended.
+        """
+        while size is None or size > 0:
+            head = f.read(4)
+            if not head and size is None:
+                return
+            if len(head) < 4:
+                raise ValueError("truncated binary HBNB file")
+            length, = U32.unpack(head)
+            body = f.read(length)
+            if len(body) < length:
+                raise ValueError("truncated binary HBNB file")
+            if size is not None:
+                size -= 4 + length
+            yield self.decode(body, shapes)
+
+    @classmethod
+    def split(cls, buffer, parts):
+        """
+        Splits a binary file into ranges of whole records of about the same
+        size, reading the length and the shape of every record only.
+
+        Args:
+            buffer (bytes): bytes, or mmap, of the whole file.
+            parts (int): number of ranges wanted, fewer when the file has
+                         fewer records.
+        Return:
+            List of (start, size, shapes defined before start).
+        """
+        if buffer[:len(cls.magic)] != cls.magic:
+            raise ValueError("not a binary HBNB file")
+        end = len(buffer)
+        pos = start = len(cls.magic)
+        step = (end - pos) / parts
+        boundary = pos + step
+        shapes = []
+        before = []
+        ranges = []
+        while pos < end:
+            if pos >= boundary:
+                ranges.append((start, pos - start, before))
+                start = pos
+                before = list(shapes)
+                boundary = pos + step
+            length, = U32.unpack_from(buffer, pos)
+            cls.read_header(buffer, pos + 4, shapes)
+            pos += 4 + length
+        if pos > end:
+            raise ValueError("truncated binary HBNB file")
+        if pos > start:
+            ranges.append((start, pos - start, before))
+        return ranges
+
+    @staticmethod
+    def decode(body, shapes):
+        """
+        Returns the record of a record body.
+
+        Args:
+            body (bytes): the bytes of the record, without its length.
+            shapes (list): the shapes defined by the previous records, the
+                           shape defined by this record is appended.
+        """
+        index, pos = BinarySerializer.read_header(body, 0, shapes)
+        shape = shapes[index]
+        record = BinarySerializer.read_values(body, pos, shape[1:])[0]
+        record["__class__"] = shape[0]
+        return record
+
+    @staticmethod
+    def read_header(buffer, pos, shapes):
+        """
+        Reads the shape of the record body starting at pos.
+
+        Args:
+            buffer (bytes): bytes, or mmap, holding the record.
+            pos (int): position of the body in buffer.
+            shapes (list): the shapes defined by the previous records, the
+                           shape defined by this record is appended.
+        Return:
+            The index of the shape and the position of the first value.
+        """
+        unpack_u32 = U32.unpack_from
+        index, = unpack_u32(buffer, pos)
+        pos += 4
+        if index == len(shapes):
+            count, = unpack_u32(buffer, pos)
+            pos += 4
+            shape = []
+            for _ in range(count):
+                size, = unpack_u32(buffer, pos)
+                pos += 4
+                shape.append(buffer[pos:pos + size].decode())
+                pos += size
+            shapes.append(shape)
+        return index, pos
+
+    @staticmethod
+    def read_values(buffer, pos, names):
+        """
+        Reads the values of the given fields, in the order of the record.
+
+        Args:
+            buffer (bytes): bytes, or mmap, holding the record.
+            pos (int): position of the first value to read.
+            names (list): names of the fields to read, a prefix of the
+                          fields of the record shape.
+        Return:
+            The dict of name -> value and the position after the values.
+        """
+        unpack_u32 = U32.unpack_from
+        record = {}
+        for name in names:
+            tag = buffer[pos]
+            pos += 1
+            if tag == STR or tag == JSON:
+                size, = unpack_u32(buffer, pos)
+                pos += 4
+                value = buffer[pos:pos + size].decode()
+                pos += size
+                if tag == JSON:
+                    value = json.loads(value)
+            elif tag == TIME:
+                value = EPOCH + I64.unpack_from(buffer, pos)[0] * MICROSECOND
+                pos += 8
+            elif tag == INT:
+                value, = I64.unpack_from(buffer, pos)
+                pos += 8
+            elif tag == FLOAT:
+                value, = F64.unpack_from(buffer, pos)
+                pos += 8
+            else:
+                value = None if tag == NONE else tag == TRUE
+            record[name] = value
+        return record, pos
+
+
+serializers = {"json": JSONSerializer(), "binary": BinarySerializer()}
+
+
+def detect(f):
+    """
+    Returns the serializer of a file from its first bytes.
+
+    Args:
+        f (io.BufferedReader): binary file open for reading, not consumed.
+    """
+    binary = serializers["binary"]
+    if f.peek(len(binary.magic))[:len(binary.magic)] == binary.magic:
+        return binary
+    return serializers["json"]
+
+
+def compressions():
+    """Returns the names of the compressions available"""
+    return [name for name in COMPRESSIONS
+            if name != "zstd" or zstandard is not None]
+
+
+@contextmanager
+def compressed(f, name, level=None):
+    """
+    Yields a binary file compressing what is written to it into f.
+
+    Args:
+        f (file): binary file open for writing, left open.
+        name (str): "none", "gzip" or "zstd".
+        level (int): compression level, the default of the codec if None.
+    """
+    if name not in COMPRESSIONS:
+        raise ValueError("unknown compression {}".format(name))
+    if name == "none":
+        yield f
+        return
+    if name == "zstd" and zstandard is None:
+        raise ValueError("zstd compression needs the zstandard package")
+    if name == "gzip":
+        stream = gzip.GzipFile(filename="", fileobj=f, mode='wb', mtime=0,
+                               compresslevel=6 if level is None else level)
+    else:
+        compressor = zstandard.ZstdCompressor(level=3 if level is None
+                                              else level)
+        stream = compressor.stream_writer(f, closefd=False)
+    # the serializers write small pieces, the codec gets large blocks
+    buffered = io.BufferedWriter(stream, BUFFER_SIZE)
+    yield buffered
+    buffered.flush()
+    buffered.detach()
+    stream.close()
+
+
+def decompressed(f):
+    """
+    Returns a binary file of the content of f, decompressed on the fly if
+    f starts with a gzip or zstd header.
+
+    Args:
+        f (io.BufferedReader): binary file open for reading, not consumed.
+    """
+    head = f.peek(len(ZSTD_MAGIC))[:len(ZSTD_MAGIC)]
+    if head.startswith(GZIP_MAGIC):
+        stream = gzip.GzipFile(fileobj=f, mode='rb')
+    elif head == ZSTD_MAGIC:
+        if zstandard is None:
+            raise ValueError("zstd compression needs the zstandard package")
+        stream = zstandard.ZstdDecompressor().stream_reader(f)
+    else:
+        return f
+    return io.BufferedReader(stream, BUFFER_SIZE)
+
+
+def checked(records):
+    """
+    Yields the records of an iterator, the errors of a truncated or corrupt
+    file are raised as ValueError.
+    """
+    try:
+        yield from records
+    except DECODE_ERRORS as error:
+        raise ValueError("truncated or corrupt file: {}".format(
+            error or type(error).__name__)) from error
+
+
+def load(f):
+    """
+    Yields the records of a file of any format and compression, the
+    errors of a truncated or corrupt file are raised as ValueError.
+
+    Args:
+        f (io.BufferedReader): binary file open for reading.
+    """
+    def records():
+        """Yields the records of the decompressed file"""
+        stream = decompressed(f)
+        yield from detect(stream).load(stream)
+
+    return checked(records())
+
+
+def convert(source, destination, name, compression="none"):
+    """
+    Rewrites the records of source in the format name into destination,
+    compressed with compression.
+
+    Return:
+        The number of records converted.
+    """
+    count = [0]
+
+    def counted(records):
+        """Counts the records going through"""
+        for record in records:
+            count[0] += 1
+            yield record
+
+    with open(source, 'rb') as f, open(destination, 'wb') as out, \
+            compressed(out, compression) as stream:
+        serializers[name].dump(counted(load(f)), stream)
+    return count[0]
+
+
+def main(argv=None):
+    """Entry point of the conversion tool"""
+    parser = argparse.ArgumentParser(
+        description="converts a FileStorage file between formats")
+    parser.add_argument("source")
+    parser.add_argument("destination")
+    parser.add_argument("--to", default="binary", choices=sorted(serializers))
+    parser.add_argument("--compression", default="none",
+                        choices=compressions())
+    args = parser.parse_args(argv)
+    count = convert(args.source, args.destination, args.to,
+                    args.compression)
+    print("{} records written to {}".format(count, args.destination))
+
+
+if __name__ == "__main__":
+    main()
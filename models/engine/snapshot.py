@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+"""
+Script for the Snapshot class, an immutable view of a storage
+"""
+
+
+class Snapshot:
+    """
+    Consistent, read only view of the objects of a storage at one version
+
+    A snapshot freezes which objects exist: the objects created or deleted
+    after it was taken are not seen, so a long read never needs a lock.
+    The objects themselves are shared with the storage, they are not copies.
+
+    Attributes:
+        version (int): version of the storage the snapshot was taken at.
+        __classes (dictionary): class name -> read only mapping of
+                                <class name>.id -> object
+    """
+
+    def __init__(self, version, classes):
+        """
+        Initializes a snapshot
+
+        Args:
+            version (int): version of the storage.
+            classes (dict): class name -> mapping never mutated afterwards.
+        """
+        self.version = version
+        self.__classes = classes
+
+    @staticmethod
+    def __name(cls):
+        """Returns the class name of a class or of a class name"""
+        return cls if isinstance(cls, str) else cls.__name__
+
+    def all(self, cls=None):
+        """
+        Returns the objects of the given class, or of all the classes.
+
+        Args:
+            cls (str): class or name of the class, all the classes if None.
+        Return:
+            Read only mapping of <class name>.id -> object for a class, a
+            new dict for all the classes.
+        """
+        if cls is not None:
+            return self.__classes.get(self.__name(cls), {})
+        objs = {}
+        for class_map in self.__classes.values():
+            objs.update(class_map)
+        return objs
+
+    def get(self, cls, id):
+        """Returns the object of the given class and id, None if missing"""
+        name = self.__name(cls)
+        return self.__classes.get(name, {}).get(name + "." + str(id))
+
+    def count(self, cls=None):
+        """Returns the number of objects of the given class, or of all"""
+        if cls is not None:
+            return len(self.__classes.get(self.__name(cls), {}))
+        return sum(len(class_map) for class_map in self.__classes.values())
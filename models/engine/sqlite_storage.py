@@ -0,0 +1,31 @@
+#!/usr/bin/python3
+"""
+Script for the SQLite storage class for AirBnB clone
+"""
+from models.engine.db_storage import DBStorage
+from os import getenv
+
+
+class SQLiteStorage(DBStorage):
+    """
+    Stores the SQLAlchemy models in an embedded SQLite database file
+
+    The database runs in WAL mode (see DBStorage.configure): readers never
+    wait for the writer and a commit only appends to the log, synced at the
+    checkpoints. Foreign keys are enforced like in MySQL.
+
+    Attributes:
+        path (str): path of the database file, HBNB_SQLITE_PATH or hbnb.db
+    """
+
+    def __init__(self, path=None, **options):
+        """
+        Constructor method for SQLiteStorage class
+
+        Args:
+            path (str): path of the database file, HBNB_SQLITE_PATH or
+                        hbnb.db if None.
+            options: keyword arguments of sqlalchemy.create_engine.
+        """
+        self.path = path or getenv('HBNB_SQLITE_PATH') or 'hbnb.db'
+        super().__init__('sqlite:///' + self.path, **options)
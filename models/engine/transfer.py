@@ -0,0 +1,109 @@
+#!/usr/bin/python3
+"""
+Export and import of the objects of a storage as newline-delimited JSON
+
+    HBNB_TYPE_STORAGE=file python3 -m models.engine.transfer export | \\
+        HBNB_TYPE_STORAGE=db python3 -m models.engine.transfer import
+
+The models are those of the storage type chosen at import, so the two ends
+of a migration between engines run in two processes joined by a pipe or a
+file. export writes one JSON record per line, the classes in the foreign
+key order of records() (states, amenities, cities, users, places, reviews)
+and the places with their amenity_ids, which the database storage inserts
+as place_amenity rows. import reads the lines as they come and inserts the
+objects by batches: the memory holds a batch, not the dataset, unless the
+destination is a FileStorage, which holds all its objects anyway.
+
+The progress, a count of objects, goes to stderr.
+"""
+import argparse
+import json
+import sys
+import models
+from models.engine import serializers
+from models.engine.backup import insert
+
+
+def export(storage, stream, cls=None, progress=None):
+    """
+    Writes the records of a storage to a text stream, one per line.
+
+    Args:
+        storage: the storage engine to read.
+        stream (file): the text stream written.
+        cls (str): class or name of the class, all the classes if None.
+        progress (callable): called with the number of records written
+                             every 10000 records and at the end.
+    Return:
+        The number of records written.
+    """
+    count = 0
+    for record in storage.records(cls):
+        stream.write(json.dumps(record, default=serializers.default) + "\n")
+        count += 1
+        if progress is not None and count % 10000 == 0:
+            progress(count)
+    stream.flush()
+    if progress is not None:
+        progress(count)
+    return count
+
+
+def lines(stream):
+    """Yields the records of the non blank lines of a text stream"""
+    for number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as error:
+            raise ValueError("line {}: {}".format(number, error)) from None
+
+
+def load(storage, stream, batch_size=1000, progress=None):
+    """
+    Inserts the records of a text stream into an empty storage.
+
+    Args:
+        storage: the storage engine to fill, it must hold no object.
+        stream (file): the text stream of the records, one per line.
+        batch_size (int): number of objects inserted at once.
+        progress (callable): called with the number of objects inserted
+                             after each batch.
+    Return:
+        The number of objects inserted.
+    """
+    return insert(storage, lines(stream), batch_size, progress)
+
+
+def main(argv=None):
+    """Entry point of the transfer tool"""
+    parser = argparse.ArgumentParser(
+        description="export and import of the HBNB storage as NDJSON")
+    parser.add_argument("command", choices=("export", "import"))
+    parser.add_argument("path", nargs="?", default="-",
+                        help="file of the records, - for stdin or stdout")
+    parser.add_argument("--class", dest="cls",
+                        help="export the objects of one class")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    def progress(count):
+        """Reports the number of objects copied"""
+        print("{} objects".format(count), file=sys.stderr, flush=True)
+
+    if args.command == "export":
+        if args.path == "-":
+            export(models.storage, sys.stdout, args.cls, progress)
+        else:
+            with open(args.path, 'w') as f:
+                export(models.storage, f, args.cls, progress)
+    elif args.path == "-":
+        load(models.storage, sys.stdin, args.batch_size, progress)
+    else:
+        with open(args.path) as f:
+            load(models.storage, f, args.batch_size, progress)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/python3
+"""
+Script for the WriteBehind class, coalescing the saves of a storage
+"""
+from threading import Condition, Lock, Thread
+from time import monotonic
+
+
+class WriteBehind:
+    """
+    Background thread running the flush of a storage once for many saves.
+
+    A save only marks the storage dirty. The thread flushes when the oldest
+    unflushed save is delay seconds old, or as soon as max_dirty objects
+    are waiting, whichever comes first. flush() runs a pending flush in the
+    calling thread and stop() flushes one last time. A failed flush keeps
+    its saves pending and is retried after delay seconds.
+
+    Attributes:
+        delay (float): longest time a save waits for its flush, in seconds.
+        max_dirty (int): number of changed objects forcing a flush.
+        __write (callable): writes the storage, called without arguments.
+        __cond (Condition): guards the pending state and wakes the thread
+        __flush_lock (Lock): serializes the calls of __write
+        __pending (int): saves requested since the last flush
+        __dirty (int): changed objects reported by the last save
+        __since (float): monotonic time of the oldest unflushed save
+        __stopped (bool): set by stop() to end the thread
+        __thread (Thread): the thread running the flushes
+        __stats (dictionary): counters of the flushes
+    """
+
+    def __init__(self, write, delay=1.0, max_dirty=1000):
+        """
+        Initializes and starts the thread
+
+        Args:
+            write (callable): writes the storage.
+            delay (float): longest time a save waits for its flush.
+            max_dirty (int): number of changed objects forcing a flush.
+        """
+        self.delay = delay
+        self.max_dirty = max_dirty
+        self.__write = write
+        self.__cond = Condition(Lock())
+        self.__flush_lock = Lock()
+        self.__pending = 0
+        self.__dirty = 0
+        self.__since = None
+        self.__stopped = False
+        self.__stats = {"write_behind_saves": 0, "write_behind_flushes": 0,
+                        "write_behind_errors": 0,
+                        "write_behind_max_lag_seconds": 0.0}
+        self.__thread = Thread(target=self.__run, name="write-behind",
+                               daemon=True)
+        self.__thread.start()
+
+    def mark(self, dirty):
+        """
+        Records a save request.
+
+        Args:
+            dirty (int): number of objects changed since the last flush.
+        """
+        with self.__cond:
+            self.__pending += 1
+            self.__dirty = dirty
+            self.__stats["write_behind_saves"] += 1
+            if self.__since is None:
+                self.__since = monotonic()
+            self.__cond.notify()
+
+    def __due(self):
+        """Returns the seconds before the next flush, the lock is held"""
+        if self.__since is None:
+            return None
+        if self.__dirty >= self.max_dirty:
+            return 0
+        return max(0, self.__since + self.delay - monotonic())
+
+    def __run(self):
+        """Flushes the pending saves when they are due, until stopped"""
+        while True:
+            with self.__cond:
+                while not self.__stopped:
+                    wait = self.__due()
+                    if wait == 0:
+                        break
+                    self.__cond.wait(wait)
+                if self.__stopped:
+                    return
+            try:
+                self.flush()
+            except Exception:
+                with self.__cond:
+                    self.__cond.wait(self.delay)
+
+    def flush(self):
+        """Writes the storage now if a save is pending"""
+        with self.__flush_lock:
+            with self.__cond:
+                since, pending = self.__since, self.__pending
+                if since is None:
+                    return
+                self.__since = None
+                self.__pending = self.__dirty = 0
+            try:
+                self.__write()
+            except Exception:
+                with self.__cond:
+                    self.__stats["write_behind_errors"] += 1
+                    self.__pending += pending
+                    if self.__since is None or since < self.__since:
+                        self.__since = since
+                raise
+            lag = monotonic() - since
+            with self.__cond:
+                self.__stats["write_behind_flushes"] += 1
+                if lag > self.__stats["write_behind_max_lag_seconds"]:
+                    self.__stats["write_behind_max_lag_seconds"] = lag
+
+    def stop(self):
+        """Stops the thread then flushes the pending saves"""
+        with self.__cond:
+            self.__stopped = True
+            self.__cond.notify()
+        self.__thread.join()
+        self.flush()
+
+    def stats(self):
+        """
+        Returns the counters of the saves and flushes, with the number of
+        pending saves and the age of the oldest one (the lag) in seconds.
+        """
+        with self.__cond:
+            stats = dict(self.__stats)
+            stats["write_behind_pending"] = self.__pending
+            stats["write_behind_lag_seconds"] = \
+                0.0 if self.__since is None else monotonic() - self.__since
+        return stats
@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+"""
+Seeds the storage selected by HBNB_TYPE_STORAGE with linked synthetic data
+
+    ./seed.py --total 100k --skew 1.1
+    HBNB_TYPE_STORAGE=db HBNB_MYSQL_USER=... ./seed.py --total 1m --users 50000
+
+The objects are built with the models classes and written through the bulk
+path of the storage engine (bulk_new), batch by batch. The user emails
+carry a tag of the run, so that seeding a database again adds users
+instead of colliding with those of the previous runs.
+"""
+import argparse
+from benchmarks import dataset
+from models import storage
+from sqlalchemy.exc import IntegrityError
+import sys
+import time
+
+OPTIONS = {"State": "--states", "Amenity": "--amenities", "City": "--cities",
+           "User": "--users", "Place": "--places", "Review": "--reviews"}
+
+
+def main(argv=None):
+    """Entry point of the seeder"""
+    parser = argparse.ArgumentParser(description="HBNB data seeder")
+    parser.add_argument("--total", default="1k",
+                        help="1k, 100k, 1m or a number of objects")
+    parser.add_argument("--skew", type=float, default=1.0,
+                        help="Zipf exponent of the parents, 0 is uniform")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    for name, _ in dataset.RATIOS:
+        parser.add_argument(OPTIONS[name], type=int,
+                            dest=name, help="number of {} objects, "
+                            "overrides the share of --total".format(name))
+    args = parser.parse_args(argv)
+    counts = {name: getattr(args, name) for name, _ in dataset.RATIOS
+              if getattr(args, name) is not None}
+    total = dataset.parse_scale(args.total)
+    try:
+        dataset.merge_counts(total, counts)
+    except ValueError as error:
+        parser.error(error)
+    start = time.time()
+    committed = [0]
+
+    def progress(written):
+        """Reports the progress of the seeding"""
+        committed[0] = written
+        print("\r{} objects written in {:.1f}s".format(
+            written, time.time() - start), end="", file=sys.stderr)
+
+    try:
+        ids = dataset.load(storage, total, args.seed, args.skew, counts,
+                           args.batch_size, progress)
+    except IntegrityError as error:
+        storage.rollback()
+        print(file=sys.stderr)
+        sys.exit("seed.py: error: {} ({} objects written before)".format(
+            error.orig, committed[0]))
+    print(file=sys.stderr)
+    for name in sorted(ids):
+        print("{}: {}".format(name, len(ids[name])))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/python3
+"""
+Contains the TestAsgiDocs and TestAsgi classes
+"""
+
+import asyncio
+import http.client
+import inspect
+import json
+from api.v1 import asgi
+import multiprocessing
+import os
+import pep8
+import signal
+import socket
+import tempfile
+import threading
+import time
+import unittest
+AsgiApp = asgi.AsgiApp
+
+
+class TestAsgiDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the asgi module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.asgi_f = inspect.getmembers(AsgiApp, inspect.isfunction)
+
+    def test_pep8_conformance_asgi(self):
+        """Test that api/v1/asgi.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/asgi.py',
+                                    'tests/test_api/test_v1/test_asgi.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_asgi_module_docstring(self):
+        """Test for the asgi.py module docstring"""
+        self.assertIsNot(asgi.__doc__, None,
+                         "asgi.py needs a docstring")
+
+    def test_asgi_func_docstrings(self):
+        """Test for the presence of docstrings in AsgiApp methods"""
+        for func in self.asgi_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+
+
+class TestAsgi(unittest.TestCase):
+    """Test the ASGI application and its server"""
+    def request(self, method, path, body=b""):
+        """Runs a request through asgi.app, returns the response"""
+        scope = {"type": "http", "method": method, "path": path,
+                 "query_string": b"", "http_version": "1.1",
+                 "headers": [(b"content-type", b"application/json")]}
+        return asyncio.run(asgi.respond(asgi.app, scope, body))
+
+    def serve(self, app):
+        """Serves app with the builtin server in a thread, returns its port
+        and the function stopping it"""
+        loop = asyncio.new_event_loop()
+        server = loop.run_until_complete(
+            asgi.start_server(app, "127.0.0.1", 0))
+        thread = threading.Thread(target=loop.run_forever)
+        thread.start()
+
+        def stop():
+            """Stops the server and its loop"""
+            server.close()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+
+            async def cancel():
+                """Cancels the connections still served"""
+                tasks = asyncio.all_tasks() - {asyncio.current_task()}
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+            loop.run_until_complete(cancel())
+            loop.run_until_complete(server.wait_closed())
+            loop.close()
+
+        return server.sockets[0].getsockname()[1], stop
+
+    def test_same_routes_as_app_views(self):
+        """Test that the routes and JSON shapes are those of the Flask app"""
+        status, headers, body = self.request("GET", "/api/v1/status")
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body), {"status": "OK"})
+        self.assertIn((b"content-type", b"application/json"), headers)
+        status, _, body = self.request("GET", "/api/v1/nope")
+        self.assertEqual(status, 404)
+        self.assertEqual(json.loads(body), {"error": "Not found"})
+
+    def test_request_body(self):
+        """Test that the body reaches the view"""
+        status, _, body = self.request("POST", "/api/v1/states",
+                                       b'{"name": "Asgi"}')
+        self.assertEqual(status, 201)
+        state = json.loads(body)
+        self.assertEqual(state["name"], "Asgi")
+        status, _, _ = self.request("DELETE",
+                                    "/api/v1/states/" + state["id"])
+        self.assertEqual(status, 200)
+
+    def test_builtin_server_keeps_connections(self):
+        """Test that several requests share one connection"""
+        port, stop = self.serve(asgi.app)
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+            for _ in range(3):
+                conn.request("GET", "/api/v1/status")
+                response = conn.getresponse()
+                self.assertEqual(json.loads(response.read()),
+                                 {"status": "OK"})
+                self.assertEqual(response.getheader("Connection"),
+                                 "keep-alive")
+            conn.close()
+        finally:
+            stop()
+
+    def test_builtin_server_checks_content_length(self):
+        """Test that a bad or too large Content-Length is refused"""
+        port, stop = self.serve(asgi.app)
+        address = ("127.0.0.1", port)
+        lengths = [("-1", b"400"), ("x", b"400"), ("+5", b"400"),
+                   (str(asgi.MAX_BODY_BYTES + 1), b"413")]
+        try:
+            for length, status in lengths:
+                with socket.create_connection(address, timeout=10) as conn:
+                    conn.sendall("POST /api/v1/states HTTP/1.1\r\n"
+                                 "Content-Length: {}\r\n\r\n"
+                                 .format(length).encode())
+                    self.assertEqual(conn.recv(1024).split(b" ")[1], status)
+        finally:
+            stop()
+
+    def test_streamed_response(self):
+        """Test that the chunks of the WSGI body are sent one at a time"""
+        def wsgi_app(environ, start_response):
+            """Yields three chunks, or one on /one"""
+            start_response("200 OK", [("Content-Type", "text/plain")])
+            if environ["PATH_INFO"] == "/one":
+                yield b"one"
+                return
+            yield from (b"a", b"", b"bc")
+
+        messages = []
+
+        async def send(message):
+            """Collects the messages"""
+            messages.append(message)
+
+        async def receive():
+            """Returns an empty body"""
+            return {"type": "http.request", "body": b""}
+
+        app = AsgiApp(wsgi_app, 2)
+        self.assertIsNone(app._AsgiApp__executor)
+        scope = {"type": "http", "method": "GET", "path": "/"}
+        asyncio.run(app(scope, receive, send))
+        self.assertEqual([(message.get("body"), message.get("more_body"))
+                          for message in messages],
+                         [(None, None), (b"a", True), (b"bc", False)])
+        port, stop = self.serve(app)
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+            conn.request("GET", "/")
+            response = conn.getresponse()
+            self.assertEqual(response.getheader("Transfer-Encoding"),
+                             "chunked")
+            self.assertEqual(response.read(), b"abc")
+            conn.request("GET", "/one")
+            response = conn.getresponse()
+            self.assertEqual(response.getheader("Content-Length"), "3")
+            self.assertEqual(response.read(), b"one")
+            conn.close()
+        finally:
+            stop()
+            app.shutdown()
+
+    def test_path_is_decoded(self):
+        """Test that the path of the scope is percent-decoded"""
+        scopes = []
+
+        async def app(scope, receive, send):
+            """Records the scope"""
+            scopes.append(scope)
+            await send({"type": "http.response.start", "status": 204})
+            await send({"type": "http.response.body", "body": b""})
+
+        port, stop = self.serve(app)
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+            conn.request("GET", "/a%20b/%C3%A9?q=%20")
+            self.assertEqual(conn.getresponse().status, 204)
+            conn.close()
+        finally:
+            stop()
+        self.assertEqual(scopes[0]["path"], "/a b/\u00e9")
+        self.assertEqual(scopes[0]["raw_path"], b"/a%20b/%C3%A9")
+        self.assertEqual(scopes[0]["query_string"], b"q=%20")
+
+    def test_sigterm_shuts_down(self):
+        """Test that SIGTERM stops the builtin server and shuts the
+        application down"""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        ready = os.path.join(tmp.name, "ready")
+        done = os.path.join(tmp.name, "done")
+
+        class App(AsgiApp):
+            """Records its shutdown"""
+            def shutdown(self):
+                """Writes the done file"""
+                super().shutdown()
+                open(done, 'w').close()
+
+        def serve():
+            """Serves until SIGTERM"""
+            asgi.run(App(asgi.flask_app, 1), "127.0.0.1", 0,
+                     lambda port: open(ready, 'w').close())
+
+        process = multiprocessing.get_context("fork").Process(target=serve)
+        process.start()
+        deadline = time.time() + 10
+        while not os.path.exists(ready) and time.time() < deadline:
+            time.sleep(0.05)
+        os.kill(process.pid, signal.SIGTERM)
+        process.join(10)
+        self.assertEqual(process.exitcode, 0)
+        self.assertTrue(os.path.exists(done))
@@ -0,0 +1,126 @@
+#!/usr/bin/python3
+"""
+Contains the TestExportDocs and TestExport classes
+"""
+
+import inspect
+import json
+from api.v1.app import app
+from api.v1.views import export
+from models import storage
+from models.state import State
+from models.user import User
+import os
+import pep8
+import unittest
+from unittest import mock
+
+
+class TestExportDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the export view"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.export_f = inspect.getmembers(export, inspect.isfunction)
+
+    def test_pep8_conformance_export(self):
+        """Test that api/v1/views/export.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/export.py',
+                                    'tests/test_api/test_v1/test_export.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_export_module_docstring(self):
+        """Test for the export.py module docstring"""
+        self.assertIsNot(export.__doc__, None,
+                         "export.py needs a docstring")
+
+    def test_export_func_docstrings(self):
+        """Test for the presence of docstrings in the export functions"""
+        for func in self.export_f:
+            if func[1].__module__ == export.__name__:
+                self.assertIsNot(func[1].__doc__, None,
+                                 "{:s} function needs a docstring".format(
+                                     func[0]))
+
+
+class TestExport(unittest.TestCase):
+    """Test the /admin/export route"""
+    headers = {"Authorization": "Bearer secret"}
+
+    def setUp(self):
+        """Saves a state and a user and creates a test client"""
+        self.env = mock.patch.dict(os.environ,
+                                   {"HBNB_API_ADMIN_TOKEN": "secret"})
+        self.env.start()
+        self.state = State(name="Exported")
+        self.user = User(email="export@hbnb.io", password="pwd")
+        storage.new(self.state)
+        storage.new(self.user)
+        storage.save()
+        self.client = app.test_client()
+
+    def tearDown(self):
+        """Deletes the objects"""
+        storage.delete(self.user)
+        storage.delete(self.state)
+        storage.save()
+        self.env.stop()
+
+    def export(self, query=""):
+        """Returns the records of an export"""
+        response = self.client.get("/api/v1/admin/export" + query,
+                                   headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        return [json.loads(line) for line in response.get_data(
+            as_text=True).splitlines()]
+
+    def test_export_classes(self):
+        """Test that the asked classes are exported in foreign key order"""
+        records = self.export("?class=User,State")
+        names = [record["__class__"] for record in records]
+        self.assertEqual(names, sorted(names, key=("State", "User").index))
+        states = {record["id"]: record for record in records
+                  if record["__class__"] == "State"}
+        self.assertEqual(states[self.state.id]["name"], "Exported")
+        self.assertEqual(states[self.state.id]["created_at"],
+                         self.state.to_dict()["created_at"])
+        self.assertEqual(len(states), storage.count(State))
+
+    def test_one_records_stream(self):
+        """Test that the classes are read from a single records() call"""
+        with mock.patch.object(storage, "records",
+                               wraps=storage.records) as records:
+            self.export("?class=User,State")
+        records.assert_called_once_with({"User", "State"})
+        with mock.patch.object(storage, "records",
+                               wraps=storage.records) as records:
+            names = {record["__class__"] for record in self.export()}
+        records.assert_called_once_with(None)
+        self.assertTrue({"State", "User"} <= names)
+
+    def test_no_password(self):
+        """Test that the passwords of the users are not exported"""
+        users = self.export("?class=User")
+        self.assertIn(self.user.id, [user["id"] for user in users])
+        for user in users:
+            self.assertNotIn("password", user)
+
+    def test_unknown_class(self):
+        """Test that an unknown class is a bad request"""
+        response = self.client.get("/api/v1/admin/export?class=Nope",
+                                   headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+
+    def test_token(self):
+        """Test that the route needs the admin token"""
+        response = self.client.get("/api/v1/admin/export",
+                                   headers={"Authorization": "Bearer no"})
+        self.assertEqual(response.status_code, 401)
+        with mock.patch.dict(os.environ, {"HBNB_API_ADMIN_TOKEN": ""}):
+            response = self.client.get("/api/v1/admin/export",
+                                       headers=self.headers)
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,88 @@
+#!/usr/bin/python3
+"""
+Contains the TestMetricsDocs and TestMetrics classes
+"""
+
+import inspect
+from api.v1 import metrics
+from api.v1.app import app
+import pep8
+import unittest
+Histogram = metrics.Histogram
+Metrics = metrics.Metrics
+
+
+class TestMetricsDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the metrics module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.metrics_f = inspect.getmembers(Metrics, inspect.isfunction)
+
+    def test_pep8_conformance_metrics(self):
+        """Test that api/v1/metrics.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/metrics.py',
+                                    'api/v1/views/metrics.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_metrics(self):
+        """Test that tests/test_api/test_v1/test_metrics.py conforms to PEP8"""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_metrics.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_metrics_module_docstring(self):
+        """Test for the metrics.py module docstring"""
+        self.assertIsNot(metrics.__doc__, None,
+                         "metrics.py needs a docstring")
+
+    def test_metrics_func_docstrings(self):
+        """Test for the presence of docstrings in Metrics methods"""
+        for func in self.metrics_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+
+
+class TestMetrics(unittest.TestCase):
+    """Test the request instrumentation and the /metrics route"""
+    def setUp(self):
+        """Resets the registry and creates a test client"""
+        metrics.metrics.reset()
+        self.client = app.test_client()
+
+    def test_histogram_cumulative(self):
+        """Test that the buckets of a histogram are cumulative"""
+        hist = Histogram((1, 2))
+        for value in (0.5, 1.5, 1.7, 3):
+            hist.observe(value)
+        self.assertEqual(hist.cumulative(),
+                         [("1.0", 1), ("2.0", 3), ("+Inf", 4)])
+        self.assertEqual(hist.sum, 6.7)
+
+    def test_requests_are_recorded_by_route(self):
+        """Test that latency and status are labelled with the url rule"""
+        self.client.get('/api/v1/status')
+        self.client.get('/api/v1/states/nope')
+        body = self.client.get('/api/v1/metrics').get_data(as_text=True)
+        self.assertIn('hbnb_http_request_duration_seconds_count{method="GET"'
+                      ',route="/api/v1/status"} 1', body)
+        self.assertIn('hbnb_http_responses_total{method="GET",'
+                      'route="/api/v1/states/<id>",status="404"} 1', body)
+        self.assertIn('hbnb_storage_saves_total', body)
+
+    def test_metrics_content_type(self):
+        """Test that the metrics are served as text"""
+        response = self.client.get('/api/v1/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain'))
+
+    def test_storage_gauges(self):
+        """Test that the write-behind lag is rendered as a gauge"""
+        body = Metrics().render({"saves": 3, "write_behind_lag_seconds": 0.5})
+        self.assertIn('# TYPE hbnb_storage_saves_total counter', body)
+        self.assertIn('hbnb_storage_write_behind_lag_seconds 0.5', body)
+        self.assertIn('# TYPE hbnb_storage_write_behind_lag_seconds gauge',
+                      body)
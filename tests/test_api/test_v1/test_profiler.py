@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+"""
+Contains the TestProfilerDocs and TestProfiler classes
+"""
+
+from flask import Flask, jsonify
+import inspect
+from io import StringIO
+import os
+from api.v1 import profiler
+import pep8
+import shutil
+import tempfile
+import unittest
+RequestProfiler = profiler.RequestProfiler
+
+
+class TestProfilerDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the profiler module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.profiler_f = inspect.getmembers(RequestProfiler,
+                                            inspect.isfunction)
+
+    def test_pep8_conformance_profiler(self):
+        """Test that api/v1/profiler.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/profiler.py',
+                                    'tests/test_api/test_v1/test_profiler.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_profiler_func_docstrings(self):
+        """Test for the presence of docstrings in RequestProfiler methods"""
+        for func in self.profiler_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+
+
+class TestProfiler(unittest.TestCase):
+    """Test the opt-in request profiler"""
+    def setUp(self):
+        """Creates an app profiled into a temporary directory"""
+        self.directory = tempfile.mkdtemp()
+        app = Flask(__name__)
+
+        @app.route('/ping/<id>')
+        def ping(id):
+            """Test route"""
+            return jsonify(sum(range(1000)))
+
+        RequestProfiler(self.directory).init_app(app)
+        self.client = app.test_client()
+
+    def tearDown(self):
+        """Removes the dumped profiles"""
+        shutil.rmtree(self.directory)
+
+    def test_only_flagged_requests_are_profiled(self):
+        """Test that the header opts a request in"""
+        self.client.get('/ping/1')
+        self.assertEqual(os.listdir(self.directory), [])
+        response = self.client.get('/ping/1', headers={'X-Profile': '1'})
+        name = response.headers['X-Profile-File']
+        self.assertEqual(os.listdir(self.directory), [name])
+        self.assertIn('GET-ping_id', name)
+
+    def test_report_aggregates_profiles(self):
+        """Test that the report covers every dumped profile"""
+        for i in range(3):
+            self.client.get('/ping/{}'.format(i), headers={'X-Profile': '1'})
+        out = StringIO()
+        self.assertEqual(profiler.report(self.directory, 5, stream=out), 3)
+        self.assertIn('Aggregated 3 request profiles', out.getvalue())
@@ -0,0 +1,51 @@
+#!/usr/bin/python3
+"""
+Contains the TestUsersUniqueEmail class
+"""
+
+from api.v1.app import app
+import models
+from models import storage
+from models.user import User
+import unittest
+import uuid
+
+
+@unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+class TestUsersUniqueEmail(unittest.TestCase):
+    """Test the answers of the users routes to a taken email"""
+    def setUp(self):
+        """Creates a user through the API"""
+        self.client = app.test_client()
+        self.email = "taken-{}@hbnb.io".format(uuid.uuid4().hex)
+        response = self.client.post("/api/v1/users", json={
+            "email": self.email, "password": "pwd"})
+        self.assertEqual(response.status_code, 201)
+        self.ids = [response.get_json()["id"]]
+
+    def tearDown(self):
+        """Deletes the users"""
+        for id in self.ids:
+            self.client.delete("/api/v1/users/" + id)
+
+    def test_create_with_taken_email(self):
+        """Test that a second user with the email is a conflict"""
+        response = self.client.post("/api/v1/users", json={
+            "email": self.email, "password": "pwd"})
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.get_json(),
+                         {"error": "Email already exists"})
+        self.assertEqual(self.client.get("/api/v1/users/" + self.ids[0])
+                         .status_code, 200)
+
+    def test_update_to_taken_email(self):
+        """Test that taking the email of another user is a conflict"""
+        response = self.client.post("/api/v1/users", json={
+            "email": "other-" + self.email, "password": "pwd"})
+        self.ids.append(response.get_json()["id"])
+        response = self.client.put("/api/v1/users/" + self.ids[1],
+                                   json={"email": self.email})
+        self.assertEqual(response.status_code, 409)
+        storage.close()
+        self.assertEqual(storage.get(User, self.ids[1]).email,
+                         "other-" + self.email)
@@ -0,0 +1,49 @@
+#!/usr/bin/python3
+"""
+Contains the TestBenchApi class
+"""
+
+from api.v1.app import app
+from benchmarks import bench_api, dataset
+import models
+from models.engine.file_storage import FileStorage
+import os
+import tempfile
+import unittest
+
+
+@unittest.skipIf(not isinstance(models.storage, FileStorage),
+                 "not testing file storage")
+class TestBenchApi(unittest.TestCase):
+    """Test the route benchmark against the app"""
+    state = ("objects", "file_path", "generation", "synced", "dirty",
+             "deleted", "unloaded")
+
+    def setUp(self):
+        """Fills a FileStorage on a temporary file with a small dataset"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.saved = {name: getattr(FileStorage, "_FileStorage__" + name)
+                      for name in self.state}
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__file_path = os.path.join(self.tmp.name,
+                                                           "file.json")
+        FileStorage._FileStorage__generation = None
+        FileStorage._FileStorage__synced = {}
+        FileStorage._FileStorage__dirty = set()
+        FileStorage._FileStorage__deleted = set()
+        FileStorage._FileStorage__unloaded = set()
+        self.ids = dataset.load(FileStorage(), 100)
+
+    def tearDown(self):
+        """Restores the storage"""
+        for name, value in self.saved.items():
+            setattr(FileStorage, "_FileStorage__" + name, value)
+        self.tmp.cleanup()
+
+    def test_run(self):
+        """Test that every route but the admin ones is measured"""
+        results = bench_api.run(app, self.ids, repeat=1)
+        self.assertIn("GET /api/v1/states", results)
+        self.assertIn("DELETE /api/v1/users/<id>", results)
+        self.assertFalse([key for key in results if "/admin/" in key])
+        self.assertEqual(FileStorage().count(), 100)
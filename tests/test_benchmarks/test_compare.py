@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+"""
+Contains the TestCompare class
+"""
+
+from benchmarks import compare, results
+import os
+import tempfile
+import unittest
+
+
+class TestCompare(unittest.TestCase):
+    """Test the benchmark regression gate"""
+    def setUp(self):
+        """Writes a baseline and a slower candidate results file"""
+        self.directory = tempfile.TemporaryDirectory()
+        base = [0.010 + i * 0.0001 for i in range(20)]
+        slow = [value * 1.5 for value in base]
+        self.base = self.write("base.json", base, base)
+        self.cand = self.write("cand.json", slow, base)
+
+    def tearDown(self):
+        """Removes the results files"""
+        self.directory.cleanup()
+
+    def write(self, name, get, stats):
+        """Writes a results file with two metrics"""
+        path = os.path.join(self.directory.name, name)
+        results.save(path, {}, {"file": {
+            "FileStorage.get": results.summarize(get),
+            "GET /api/v1/stats": results.summarize(stats)}})
+        return path
+
+    def test_mann_whitney(self):
+        """Test the p-values of identical and of shifted samples"""
+        same = [1, 2, 3, 4, 5, 6]
+        self.assertGreater(compare.mann_whitney(same, same), 0.5)
+        self.assertLess(compare.mann_whitney(same, [x + 10 for x in same]),
+                        0.01)
+
+    def test_regression_fails_the_gate(self):
+        """Test that a slower tracked metric exits with 1"""
+        self.assertEqual(compare.main(["-b", self.base, "-c", self.cand,
+                                       "--track", "file:*.get@p95"]), 1)
+
+    def test_untouched_metric_passes_the_gate(self):
+        """Test that an unchanged tracked metric exits with 0"""
+        self.assertEqual(compare.main(["-b", self.base, "-c", self.cand,
+                                       "--track",
+                                       "*:GET /api/v1/stats@p95"]), 0)
+
+    def test_unmatched_pattern_fails_the_gate(self):
+        """Test that a --track pattern matching no metric exits with 1"""
+        self.assertEqual(compare.main(["-b", self.base, "-c", self.base,
+                                       "--track",
+                                       "file:FileStorage.gets@p95"]), 1)
+
+    def test_missing_candidate_metric_fails_the_gate(self):
+        """Test that a tracked baseline metric missing later exits with 1"""
+        path = os.path.join(self.directory.name, "partial.json")
+        results.save(path, {}, {"file": {
+            "GET /api/v1/stats": results.summarize(
+                [0.010 + i * 0.0001 for i in range(20)])}})
+        self.assertEqual(compare.main(["-b", self.base, "-c", path]), 1)
+        self.assertEqual(compare.missing(compare.pool([self.base]),
+                                         compare.pool([path]),
+                                         [("file:*.get", "p95")]),
+                         [("file:FileStorage.get",
+                           "missing from the candidate")])
+        self.assertEqual(compare.main(["-b", path, "-c", self.base]), 0)
+
+    def test_faster_candidate_passes_the_gate(self):
+        """Test that improvements are not regressions"""
+        self.assertEqual(compare.main(["-b", self.cand, "-c", self.base]), 0)
@@ -0,0 +1,150 @@
+#!/usr/bin/python3
+"""
+Contains the TestResults, TestDataset and TestBackends classes
+"""
+
+from benchmarks import dataset, results, run
+import contextlib
+import io
+import models
+import os
+import pep8
+from models.engine.sqlite_storage import SQLiteStorage
+import seed
+import tempfile
+import unittest
+from unittest import mock
+
+
+class TestResults(unittest.TestCase):
+    """Test the statistics of the benchmark results"""
+    def test_pep8_conformance_benchmarks(self):
+        """Test that the benchmarks package conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['benchmarks',
+                                    'tests/test_benchmarks'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_percentile(self):
+        """Test that the percentiles are interpolated"""
+        samples = [4, 1, 3, 2, 5]
+        self.assertEqual(results.percentile(samples, 50), 3)
+        self.assertEqual(results.percentile(samples, 100), 5)
+        self.assertEqual(results.percentile(samples, 95), 4.8)
+        self.assertIsNone(results.percentile([], 50))
+
+    def test_summarize_keeps_samples(self):
+        """Test that the raw samples are kept with the summary"""
+        summary = results.summarize([0.2, 0.1])
+        self.assertEqual(summary["samples"], [0.2, 0.1])
+        self.assertEqual(summary["n"], 2)
+        self.assertEqual(summary["min"], 0.1)
+
+
+class TestDataset(unittest.TestCase):
+    """Test the synthetic datasets"""
+    def test_parse_scale(self):
+        """Test the scale names"""
+        self.assertEqual(dataset.parse_scale("100k"), 100000)
+        self.assertEqual(dataset.parse_scale("1M"), 1000000)
+        self.assertEqual(dataset.parse_scale("250"), 250)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_parents_come_first(self):
+        """Test that every foreign key refers to an earlier object"""
+        seen = set()
+        for obj in dataset.generate(300):
+            for attr in ("state_id", "city_id", "user_id", "place_id"):
+                if attr in obj.__dict__:
+                    self.assertIn(getattr(obj, attr), seen)
+            seen.add(obj.id)
+        self.assertGreater(len(seen), 250)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_skew_concentrates_children(self):
+        """Test that a skewed dataset gives most cities to a few states"""
+        counts = {"State": 50, "City": 1000}
+        for skew, share in ((0.0, 0.2), (1.5, 0.6)):
+            cities = [obj for obj in dataset.generate(0, 1, skew, counts)
+                      if obj.__class__.__name__ == "City"]
+            parents = {}
+            for city in cities:
+                parents[city.state_id] = parents.get(city.state_id, 0) + 1
+            top = sum(sorted(parents.values())[-5:]) / len(cities)
+            if skew:
+                self.assertGreater(top, share)
+            else:
+                self.assertLess(top, share)
+
+    def test_parents_are_needed(self):
+        """Test that children without a parent to pick are refused"""
+        for counts in ({"State": 0}, {"User": 0}, {"City": 0},
+                       {"Place": 0}, {"Review": -1}):
+            with self.assertRaises(ValueError):
+                dataset.merge_counts(200, counts)
+        counts = dataset.merge_counts(200, {"Place": 0, "Review": 0})
+        self.assertEqual(counts["Place"], 0)
+        with contextlib.redirect_stderr(io.StringIO()) as stderr:
+            with self.assertRaises(SystemExit):
+                seed.main(["--total", "200", "--states", "0"])
+        self.assertIn("City objects need at least one State",
+                      stderr.getvalue())
+
+    def test_emails_unique_per_run(self):
+        """Test that two datasets do not share an email"""
+        emails = [{obj.email for obj in dataset.generate(100)
+                   if obj.__class__.__name__ == "User"} for _ in range(2)]
+        self.assertEqual(len(emails[0]), 13)
+        self.assertFalse(emails[0] & emails[1])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_seed_twice(self):
+        """Test that a database is seeded twice, a taken email is an error"""
+        with tempfile.TemporaryDirectory() as tmp:
+            storage = SQLiteStorage(os.path.join(tmp, "seed.db"))
+            storage.reload()
+            with mock.patch.object(seed, "storage", storage), \
+                    contextlib.redirect_stdout(io.StringIO()), \
+                    contextlib.redirect_stderr(io.StringIO()):
+                seed.main(["--total", "100"])
+                seed.main(["--total", "100"])
+                self.assertEqual(storage.count(), 200)
+                with mock.patch.object(dataset, "run_tag",
+                                       return_value="same"):
+                    seed.main(["--total", "100"])
+                    with self.assertRaisesRegex(SystemExit, "UNIQUE"):
+                        seed.main(["--total", "100"])
+            storage.close()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_places_without_amenities(self):
+        """Test that places are generated when there is no amenity"""
+        places = [obj for obj in dataset.generate(200, counts={"Amenity": 0})
+                  if obj.__class__.__name__ == "Place"]
+        self.assertEqual(len(places), 60)
+        self.assertTrue(all(place.amenity_ids == [] for place in places))
+
+
+class TestBackends(unittest.TestCase):
+    """Test the environment of the backends of the benchmarks"""
+    def test_db_needs_a_bench_database(self):
+        """Test that the db backend never runs on the configured database"""
+        env = {"HBNB_MYSQL_DB": "hbnb_dev_db", "HBNB_BENCH_DB_URL": ""}
+        with mock.patch.dict(os.environ, env):
+            with self.assertRaises(ValueError):
+                run.backend_env("db")
+            with contextlib.redirect_stderr(io.StringIO()):
+                with self.assertRaises(SystemExit):
+                    run.main(["--backend", "db"])
+        env["HBNB_BENCH_DB_URL"] = "sqlite:///bench.db"
+        with mock.patch.dict(os.environ, env):
+            self.assertEqual(run.backend_env("db")["HBNB_DB_URL"],
+                             "sqlite:///bench.db")
+
+    def test_sqlite_in_working_directory(self):
+        """Test that the sqlite backend ignores HBNB_SQLITE_PATH"""
+        with mock.patch.dict(os.environ, {"HBNB_SQLITE_PATH": "/data/h.db"}):
+            env = run.backend_env("sqlite")
+        self.assertEqual(env["HBNB_SQLITE_PATH"], "hbnb.db")
+        self.assertEqual(env["HBNB_ENV"], "test")
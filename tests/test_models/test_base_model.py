@@ -138,6 +138,18 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(new_d["created_at"], bm.created_at.strftime(t_format))
         self.assertEqual(new_d["updated_at"], bm.updated_at.strftime(t_format))
 
+    def test_kwargs_keep_timestamps(self):
+        """Test that the timestamps of the kwargs are kept, as strings or
+        datetimes"""
+        bm = BaseModel()
+        copy = BaseModel(**bm.to_dict())
+        self.assertEqual(copy.created_at, bm.created_at)
+        self.assertEqual(copy.updated_at, bm.updated_at)
+        copy = BaseModel(id="x", created_at=bm.created_at,
+                         updated_at=bm.updated_at)
+        self.assertEqual(copy.created_at, bm.created_at)
+        self.assertEqual(copy.updated_at, bm.updated_at)
+
     def test_str(self):
         """test that the str method has the correct output"""
         inst = BaseModel()
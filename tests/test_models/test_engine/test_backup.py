@@ -0,0 +1,213 @@
+#!/usr/bin/python3
+"""
+Contains the TestBackupDocs, TestBackupFile and TestBackupDB classes
+"""
+import inspect
+import models
+from models.amenity import Amenity
+from models.city import City
+from models.engine import backup, serializers
+from models.engine.file_storage import FileStorage
+from models.engine.mapped_storage import MappedStorage
+from models.engine.sqlite_storage import SQLiteStorage
+from models.place import Place
+from models.state import State
+from models.user import User
+import os
+import pep8
+import tempfile
+import unittest
+from unittest import mock
+
+
+class TestBackupDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the backup module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.backup_f = inspect.getmembers(backup, inspect.isfunction)
+
+    def test_pep8_conformance_backup(self):
+        """Test that models/engine/backup.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/backup.py',
+                                    'tests/test_models/test_engine/\
+test_backup.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_backup_module_docstring(self):
+        """Test for the backup.py module docstring"""
+        self.assertIsNot(backup.__doc__, None,
+                         "backup.py needs a docstring")
+
+    def test_backup_func_docstrings(self):
+        """Test for the presence of docstrings in backup functions"""
+        for func in self.backup_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} function needs a docstring".format(func[0]))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestBackupFile(unittest.TestCase):
+    """Test the backup and restore of the file storages"""
+    state = ("objects", "file_path", "generation", "synced", "dirty",
+             "deleted", "marks", "unloaded")
+
+    def setUp(self):
+        """Fills a FileStorage on a temporary file"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.saved = {name: getattr(FileStorage, "_FileStorage__" + name)
+                      for name in self.state}
+        FileStorage._FileStorage__file_path = os.path.join(self.tmp.name,
+                                                           "file.json")
+        self.storage = FileStorage()
+        self.storage.reset()
+        self.place = Place(name="Loft", city_id="c", user_id="u",
+                           amenity_ids=["a", "b"])
+        self.storage.bulk_new([self.place] + [State(name=str(i))
+                                              for i in range(5)])
+        self.storage.save()
+        self.path = os.path.join(self.tmp.name, "hbnb.bak")
+
+    def tearDown(self):
+        """Restores the storage"""
+        for name, value in self.saved.items():
+            setattr(FileStorage, "_FileStorage__" + name, value)
+        self.tmp.cleanup()
+
+    def test_records_in_foreign_key_order(self):
+        """Test that the states come before the places"""
+        names = [record["__class__"] for record in self.storage.records()]
+        self.assertEqual(names, ["State"] * 5 + ["Place"])
+        self.assertEqual(len(list(self.storage.records(Place))), 1)
+        names = [record["__class__"]
+                 for record in self.storage.records(["Place", State])]
+        self.assertEqual(names, ["State"] * 5 + ["Place"])
+
+    def test_backup_is_a_snapshot(self):
+        """Test that the objects added during a backup are not in it"""
+        records = self.storage.records()
+        next(records)
+        self.storage.new(State(name="Late"))
+        self.assertEqual(len(list(records)), 5)
+
+    def test_backup_ignores_later_updates(self):
+        """Test that a place updated during a backup keeps its city"""
+        for storage in (self.storage, self.mapped()):
+            place = storage.get(Place, self.place.id)
+            records = storage.records()
+            next(records)
+            city = City(name="Late", state_id="s")
+            storage.new(city)
+            place.city_id = city.id
+            storage.new(place)
+            records = list(records)
+            self.assertEqual([record["city_id"] for record in records
+                              if record["__class__"] == "Place"], ["c"])
+            self.assertNotIn("City", [record["__class__"]
+                                      for record in records])
+
+    def mapped(self):
+        """Returns a MappedStorage holding the objects, the place unsaved"""
+        mapped = MappedStorage(os.path.join(self.tmp.name, "file.hbnb"))
+        mapped.reload()
+        mapped.bulk_new(obj for obj in self.storage.all().values()
+                        if obj is not self.place)
+        mapped.save()
+        mapped.new(Place(**self.place.to_dict()))
+        return mapped
+
+    def test_round_trip_into_mapped_storage(self):
+        """Test that a backup restores into another engine"""
+        progress = []
+        self.assertEqual(backup.backup(self.storage, self.path,
+                                       progress=progress.append), 6)
+        self.assertEqual(progress, [6])
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(2), serializers.GZIP_MAGIC)
+        mapped = MappedStorage(os.path.join(self.tmp.name, "file.hbnb"))
+        mapped.reload()
+        self.assertEqual(backup.restore(mapped, self.path, batch_size=4), 6)
+        self.assertEqual(mapped.count(State), 5)
+        self.assertEqual(mapped.get(Place, self.place.id).to_dict(),
+                         self.place.to_dict())
+        self.assertEqual(list(mapped.records(Place))[0]["amenity_ids"],
+                         ["a", "b"])
+
+    def test_restore_needs_an_empty_storage(self):
+        """Test that a restore does not mix a backup with objects"""
+        backup.backup(self.storage, self.path, format="json",
+                      compression="none")
+        with self.assertRaises(ValueError):
+            backup.restore(self.storage, self.path)
+        self.assertEqual(self.storage.count(), 6)
+
+
+@unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+class TestBackupDB(unittest.TestCase):
+    """Test the backup and restore of the database storage"""
+    def setUp(self):
+        """Fills a SQLite storage with a place and its amenities"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.storage = SQLiteStorage(os.path.join(self.tmp.name, "hbnb.db"))
+        self.storage.reload()
+        state = State(name="California")
+        city = City(name="Fremont", state_id=state.id)
+        user = User(email="a@b.c", password="pwd")
+        self.amenities = [Amenity(name="Wifi"), Amenity(name="Pool")]
+        self.place = Place(name="Loft", city_id=city.id, user_id=user.id,
+                           amenity_ids=[amenity.id
+                                        for amenity in self.amenities])
+        self.storage.bulk_new([state, city, user] + self.amenities +
+                              [self.place])
+        self.storage.save()
+
+    def tearDown(self):
+        """Closes the storage"""
+        self.storage.close()
+        self.tmp.cleanup()
+
+    def test_records(self):
+        """Test the order of the tables and the amenities of the places"""
+        records = list(self.storage.records(batch_size=1))
+        names = [record["__class__"] for record in records]
+        self.assertLess(names.index("State"), names.index("City"))
+        self.assertLess(names.index("City"), names.index("Place"))
+        self.assertLess(names.index("Amenity"), names.index("Place"))
+        self.assertEqual({record["__class__"] for record in
+                          self.storage.records({"Place", City})},
+                         {"City", "Place"})
+        place = records[names.index("Place")]
+        self.assertEqual(sorted(place["amenity_ids"]),
+                         sorted(amenity.id for amenity in self.amenities))
+
+    def test_records_are_consistent(self):
+        """Test that the rows written during a backup are not in it"""
+        records = self.storage.records(State, batch_size=1)
+        next(records)
+        other = SQLiteStorage(self.storage._DBStorage__engine.url.database)
+        other.reload()
+        other.bulk_new(State(name="Late") for _ in range(10))
+        other.save()
+        other.close()
+        self.assertEqual(list(records), [])
+
+    def test_round_trip(self):
+        """Test that a backup restores the links of the places"""
+        path = os.path.join(self.tmp.name, "hbnb.bak")
+        self.assertEqual(backup.backup(self.storage, path), 6)
+        other = SQLiteStorage(os.path.join(self.tmp.name, "other.db"))
+        other.reload()
+        self.assertEqual(backup.restore(other, path, batch_size=2), 6)
+        other.close()
+        other.reload()
+        with mock.patch.object(other, "all") as all:
+            with self.assertRaises(ValueError):
+                backup.restore(other, path)
+            all.assert_not_called()
+        place = other.get(Place, self.place.id)
+        self.assertEqual(sorted(amenity.name for amenity in place.amenities),
+                         ["Pool", "Wifi"])
+        other.close()
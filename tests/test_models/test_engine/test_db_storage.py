@@ -16,7 +16,9 @@ from models.user import User
 import json
 import os
 import pep8
+import tempfile
 import unittest
+from unittest import mock
 DBStorage = db_storage.DBStorage
 classes = {"Amenity": Amenity, "City": City, "Place": Place,
            "Review": Review, "State": State, "User": User}
@@ -104,3 +106,105 @@ class TestFileStorage(unittest.TestCase):
         models.storage.save()
         new_count = models.storage.count()
         self.assertNotEqual(count, new_count)
+
+
+class TestEngineOptions(unittest.TestCase):
+    """Test the engine URL and options of the environment"""
+    def test_engine_options(self):
+        """Test that the HBNB_DB_* variables are parsed"""
+        env = {"HBNB_DB_ECHO": "true", "HBNB_DB_POOL_SIZE": "20",
+               "HBNB_DB_POOL_PRE_PING": "0", "HBNB_DB_POOL": "null",
+               "HBNB_DB_ISOLATION_LEVEL": "READ COMMITTED"}
+        with mock.patch.dict(os.environ, env):
+            options = db_storage.engine_options()
+        self.assertEqual(options, {"echo": True, "pool_size": 20,
+                                   "pool_pre_ping": False,
+                                   "poolclass": db_storage.NullPool,
+                                   "isolation_level": "READ COMMITTED"})
+
+    def test_invalid_option(self):
+        """Test that an invalid value names its variable"""
+        with mock.patch.dict(os.environ, {"HBNB_DB_POOL": "huge"}):
+            with self.assertRaisesRegex(ValueError, "HBNB_DB_POOL"):
+                db_storage.engine_options()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_db_url(self):
+        """Test that HBNB_DB_URL replaces the MySQL database"""
+        with tempfile.TemporaryDirectory() as tmp:
+            url = "sqlite:///" + os.path.join(tmp, "url.db")
+            with mock.patch.dict(os.environ, {"HBNB_DB_URL": url,
+                                              "HBNB_DB_POOL": "static"}):
+                storage = DBStorage()
+            storage.reload()
+            state = State(name="Url")
+            storage.new(state)
+            storage.save()
+            self.assertEqual(storage.count(State), 1)
+            storage.close()
+
+
+@unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+class TestIndexes(unittest.TestCase):
+    """Test the declared indexes on a SQLite database"""
+    def setUp(self):
+        """Opens a storage on a temporary SQLite file"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.url = "sqlite:///" + os.path.join(self.tmp.name, "index.db")
+        self.storage = DBStorage(self.url)
+        self.storage.reload()
+        self.engine = self.storage._DBStorage__engine
+
+    def tearDown(self):
+        """Closes the storage"""
+        self.storage.close()
+        self.engine.dispose()
+        self.tmp.cleanup()
+
+    def plan(self, query):
+        """Returns the SQLite query plan of query as a single string"""
+        with self.engine.connect() as conn:
+            rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + query)
+            return " | ".join(row[-1] for row in rows)
+
+    def test_foreign_keys_use_indexes(self):
+        """Test that the lookups by foreign key search an index"""
+        for table, column in (("cities", "state_id"), ("places", "user_id"),
+                              ("reviews", "place_id"),
+                              ("reviews", "user_id")):
+            plan = self.plan("SELECT * FROM {} WHERE {} = 'x'"
+                             .format(table, column))
+            self.assertIn("USING INDEX ix_{}_{}".format(table, column),
+                          plan)
+
+    def test_places_by_city_and_price(self):
+        """Test that the places of a city by price use the composite index"""
+        plan = self.plan("SELECT * FROM places WHERE city_id = 'x' "
+                         "AND price_by_night < 100")
+        self.assertIn("USING INDEX ix_places_city_id_price_by_night "
+                      "(city_id=? AND price_by_night<?)", plan)
+        plan = self.plan("SELECT * FROM places WHERE city_id = 'x'")
+        self.assertIn("USING INDEX ix_places_city_id_price_by_night", plan)
+
+    def test_unique_email(self):
+        """Test that two users cannot share an email"""
+        self.storage.new(User(email="same@hbnb.io", password="a"))
+        self.storage.save()
+        self.storage.new(User(email="same@hbnb.io", password="b"))
+        with self.assertRaises(db_storage.sqlalchemy.exc.IntegrityError):
+            self.storage.save()
+
+    def test_reload_adds_missing_indexes(self):
+        """Test that reload creates the indexes of a version 1 schema"""
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql("DROP INDEX ix_reviews_place_id")
+            conn.exec_driver_sql("DROP INDEX ix_places_city_id_price_by_night")
+        with self.engine.begin() as conn:
+            db_storage.migrations.set_version(conn, 1)
+        self.assertIn("SCAN reviews",
+                      self.plan("SELECT * FROM reviews WHERE place_id = 'x'"))
+        self.storage.reload()
+        self.assertIn("USING INDEX ix_reviews_place_id",
+                      self.plan("SELECT * FROM reviews WHERE place_id = 'x'"))
+        self.assertIn("ix_places_city_id_price_by_night",
+                      self.plan("SELECT * FROM places WHERE city_id = 'x'"))
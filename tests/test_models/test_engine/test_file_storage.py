@@ -15,9 +15,13 @@ from models.review import Review
 from models.state import State
 from models.user import User
 import json
+import multiprocessing
 import os
 import pep8
+import tempfile
+import threading
 import unittest
+from unittest import mock
 FileStorage = file_storage.FileStorage
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
@@ -132,3 +136,621 @@ class TestFileStorage(unittest.TestCase):
         models.storage.save()
         new_count = models.storage.count()
         self.assertNotEqual(count, new_count)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_stats(self):
+        """Test that saves and class scans are counted"""
+        storage = FileStorage()
+        before = storage.stats()
+        storage.all(State)
+        storage.save()
+        after = storage.stats()
+        self.assertEqual(after["saves"], before["saves"] + 1)
+        self.assertGreaterEqual(after["objects_scanned"],
+                                before["objects_scanned"])
+        self.assertGreater(after["save_seconds"], before["save_seconds"])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_bulk_new(self):
+        """Test that bulk_new adds every object like new does"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        objs = [value() for value in classes.values()]
+        storage.bulk_new(objs)
+        expected = {obj.__class__.__name__ + "." + obj.id: obj
+                    for obj in objs}
+        self.assertEqual(storage._FileStorage__objects, expected)
+        FileStorage._FileStorage__objects = save
+
+
+class TemporaryFileStorage(unittest.TestCase):
+    """Base of the tests running the FileStorage on a temporary file"""
+    state = ("objects", "file_path", "generation", "synced", "dirty",
+             "deleted", "marks", "writer", "serializer", "compression",
+             "layout", "unloaded", "workers")
+
+    def setUp(self):
+        """Points the storage to an empty temporary file"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.saved = {name: getattr(FileStorage, "_FileStorage__" + name)
+                      for name in self.state}
+        FileStorage._FileStorage__file_path = os.path.join(self.tmp.name,
+                                                           "file.json")
+        FileStorage._FileStorage__writer = None
+        FileStorage._FileStorage__layout = "single"
+        FileStorage._FileStorage__workers = 1
+        FileStorage().reset()
+        FileStorage().set_format("json")
+        FileStorage().set_compression("none")
+
+    def tearDown(self):
+        """Restores the storage"""
+        FileStorage().write_behind(None)
+        for name, value in self.saved.items():
+            setattr(FileStorage, "_FileStorage__" + name, value)
+        self.tmp.cleanup()
+
+
+class TestFileStorageThreads(TemporaryFileStorage):
+    """Stress the FileStorage class from concurrent threads"""
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_concurrent_readers_and_writers(self):
+        """Test that readers never see a dict changing size"""
+        storage = FileStorage()
+        storage.bulk_new(State(name=str(i)) for i in range(200))
+        errors = []
+        stop = threading.Event()
+
+        def writer(n):
+            """Adds and deletes objects"""
+            try:
+                for i in range(300):
+                    obj = City(name=str(i))
+                    storage.new(obj)
+                    if i % 3:
+                        storage.delete(obj)
+                    if i % 50 == n:
+                        storage.save()
+            except Exception as e:
+                errors.append(e)
+
+        def reader():
+            """Queries the storage until the writers are done"""
+            try:
+                while not stop.is_set():
+                    for state in storage.all(State).values():
+                        storage.get(State, state.id)
+                    storage.count(City)
+            except Exception as e:
+                errors.append(e)
+
+        readers = [threading.Thread(target=reader) for _ in range(4)]
+        writers = [threading.Thread(target=writer, args=(n,))
+                   for n in range(4)]
+        for thread in readers + writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        stop.set()
+        for thread in readers:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(storage.count(City), 4 * 100)
+        storage.save()
+        with open(FileStorage._FileStorage__file_path) as f:
+            self.assertEqual(len(json.load(f)), 200 + 4 * 100)
+
+
+def save_to(storage, obj):
+    """
+    Saves obj like obj.save(), but in the storage under test instead of
+    models.storage, which is another engine with HBNB_TYPE_STORAGE=mapped
+    """
+    obj.updated_at = datetime.utcnow()
+    storage.new(obj)
+    storage.save()
+
+
+def in_other_process(func):
+    """Runs func in a forked process, with its own copy of the storage"""
+    process = multiprocessing.get_context("fork").Process(target=func)
+    process.start()
+    process.join()
+    return process.exitcode
+
+
+class TestFileStorageProcesses(TemporaryFileStorage):
+    """Test FileStorage instances of several processes sharing a file"""
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_merges_the_saves_of_other_processes(self):
+        """Test that no process clobbers the objects of another"""
+        storage = FileStorage()
+        mine = State(name="mine")
+        storage.new(mine)
+        storage.save()
+        theirs = State(name="theirs")
+
+        def other():
+            """Saves another state"""
+            storage.new(theirs)
+            storage.save()
+
+        self.assertEqual(in_other_process(other), 0)
+        late = State(name="late")
+        storage.new(late)
+        storage.save()
+        with open(FileStorage._FileStorage__file_path) as f:
+            keys = set(json.load(f))
+        self.assertEqual(keys, {"State." + obj.id
+                                for obj in (mine, theirs, late)})
+        self.assertIsNotNone(storage.get(State, theirs.id))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_close_refreshes_only_on_external_changes(self):
+        """Test that close picks up the updates and deletes of others"""
+        storage = FileStorage()
+        kept = State(name="kept")
+        renamed = State(name="old")
+        deleted = State(name="deleted")
+        storage.bulk_new([kept, renamed, deleted])
+        storage.save()
+        reloads = storage.stats()["reloads"]
+        storage.close()
+        self.assertEqual(storage.stats()["reloads"], reloads)
+
+        def other():
+            """Renames a state and deletes another"""
+            obj = storage.get(State, renamed.id)
+            obj.name = "new"
+            save_to(storage, obj)
+            storage.delete(storage.get(State, deleted.id))
+            storage.save()
+
+        self.assertEqual(in_other_process(other), 0)
+        storage.close()
+        self.assertEqual(storage.stats()["reloads"], reloads + 1)
+        self.assertIs(storage.get(State, kept.id), kept)
+        self.assertEqual(storage.get(State, renamed.id).name, "new")
+        self.assertIsNone(storage.get(State, deleted.id))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_merge_keeps_concurrent_changes(self):
+        """Test that a new() during a merge is not overwritten by the file"""
+        storage = FileStorage()
+        state = State(name="local")
+        record = dict(state.to_dict(), name="file")
+
+        def records():
+            """Yields the file copy of state, then state is changed"""
+            yield record
+            storage.new(state)
+            yield State(name="other").to_dict()
+
+        storage._FileStorage__merge(records())
+        self.assertIs(storage.get(State, state.id), state)
+        self.assertEqual(storage.count(State), 2)
+
+
+class TestFileStorageSnapshots(TemporaryFileStorage):
+    """Test the snapshots of the FileStorage class"""
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_snapshot_ignores_later_writes(self):
+        """Test that a snapshot keeps the objects of its version"""
+        storage = FileStorage()
+        old = State(name="old")
+        storage.new(old)
+        snapshot = storage.snapshot()
+        storage.delete(old)
+        new = State(name="new")
+        storage.new(new)
+        self.assertEqual(list(snapshot.all(State).values()), [old])
+        self.assertIsNone(snapshot.get(State, new.id))
+        self.assertEqual(list(storage.snapshot().all(State).values()), [new])
+        self.assertGreater(storage.snapshot().version, snapshot.version)
+        with self.assertRaises(TypeError):
+            snapshot.all(State)["State.x"] = new
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reset_forgets_the_memory(self):
+        """Test that reset drops the objects and the unsaved changes"""
+        storage = FileStorage()
+        saved = State(name="saved")
+        storage.new(saved)
+        storage.save()
+        unsaved = State(name="unsaved")
+        storage.new(unsaved)
+        storage.reset()
+        self.assertEqual(storage.all(), {})
+        self.assertEqual(storage.snapshot().count(State), 0)
+        storage.reload()
+        self.assertEqual(storage.get(State, saved.id).name, "saved")
+        self.assertIsNone(storage.get(State, unsaved.id))
+        storage.reset({"State." + unsaved.id: unsaved})
+        self.assertEqual(list(storage.all(State).values()), [unsaved])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_snapshot_shares_unchanged_classes(self):
+        """Test that only the written classes are copied again"""
+        storage = FileStorage()
+        storage.bulk_new([State(name="s"), User(email="u")])
+        first = storage.snapshot()
+        self.assertIs(storage.snapshot(), first)
+        storage.new(State(name="t"))
+        second = storage.snapshot()
+        self.assertIs(second.all(User), first.all(User))
+        self.assertIsNot(second.all(State), first.all(State))
+        self.assertEqual(second.count(State), 2)
+        self.assertEqual(second.count(), 3)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_snapshot_follows_replaced_objects(self):
+        """Test that replacing __objects rebuilds the class index"""
+        storage = FileStorage()
+        storage.new(State(name="s"))
+        storage.snapshot()
+        city = City(name="c")
+        FileStorage._FileStorage__objects = {"City." + city.id: city}
+        self.assertEqual(storage.snapshot().count(), 1)
+        self.assertEqual(storage.count(City), 1)
+        self.assertEqual(storage.all(State), {})
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_iter(self):
+        """Test that iter yields the objects of a snapshot by class"""
+        storage = FileStorage()
+        state = State(name="s")
+        city = City(name="c", state_id=state.id)
+        storage.bulk_new([city, state])
+        objs = storage.iter()
+        self.assertIs(next(objs), state)
+        storage.new(State(name="later"))
+        self.assertEqual(list(objs), [city])
+        self.assertEqual(list(storage.iter("City")), [city])
+        self.assertEqual(len(list(storage.iter(State))), 2)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_iter_by_batches(self):
+        """Test that iter skips the objects deleted between two batches"""
+        storage = FileStorage()
+        states = [State(name=str(i)) for i in range(5)]
+        storage.bulk_new(states)
+        objs = storage.iter(State, batch_size=2)
+        self.assertEqual([next(objs), next(objs)], states[:2])
+        storage.delete(states[2])
+        self.assertEqual(list(objs), states[3:])
+
+
+class TestFileStorageWriteBehind(TemporaryFileStorage):
+    """Test the write-behind mode of the FileStorage class"""
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_is_written_by_flush(self):
+        """Test that save waits for flush to write the file"""
+        storage = FileStorage()
+        storage.write_behind(60)
+        state = State(name="later")
+        storage.new(state)
+        storage.save()
+        path = FileStorage._FileStorage__file_path
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(storage.stats()["write_behind_pending"], 1)
+        storage.flush()
+        with open(path) as f:
+            self.assertIn("State." + state.id, json.load(f))
+        self.assertEqual(storage.stats()["write_behind_flushes"], 1)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_leaving_write_behind_writes_the_saves(self):
+        """Test that the pending saves are written when the thread stops"""
+        storage = FileStorage()
+        storage.write_behind(60)
+        saves = storage.stats()["saves"]
+        for i in range(20):
+            storage.new(State(name=str(i)))
+            storage.save()
+        storage.write_behind(None)
+        self.assertEqual(storage.stats()["saves"], saves + 1)
+        self.assertNotIn("write_behind_pending", storage.stats())
+        with open(FileStorage._FileStorage__file_path) as f:
+            self.assertEqual(len(json.load(f)), 20)
+
+
+class TestFileStorageFormats(TemporaryFileStorage):
+    """Test the file formats of the FileStorage class"""
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_binary_file_is_detected(self):
+        """Test that a binary file is read back without configuration"""
+        storage = FileStorage()
+        storage.set_format("binary")
+        state = State(name="Binary")
+        storage.new(state)
+        storage.save()
+        path = FileStorage._FileStorage__file_path
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(4), b"HBNB")
+        storage.set_format("json")
+        storage.reset()
+        storage.reload()
+        loaded = storage.get(State, state.id)
+        self.assertEqual(loaded.name, "Binary")
+        self.assertEqual(loaded.created_at, state.created_at)
+        self.assertEqual(loaded.updated_at, state.updated_at)
+        storage.save()
+        with open(path) as f:
+            self.assertIn("State." + state.id, json.load(f))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_compressed_file_is_detected(self):
+        """Test that a gzip file is read back without configuration"""
+        storage = FileStorage()
+        storage.set_compression("gzip")
+        state = State(name="Compressed")
+        storage.new(state)
+        storage.save()
+        path = FileStorage._FileStorage__file_path
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(2), b"\x1f\x8b")
+        storage.set_compression("none")
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__synced = {}
+        storage.reload()
+        self.assertEqual(storage.get(State, state.id).name, "Compressed")
+        with self.assertRaises(ValueError):
+            storage.set_compression("lzma")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_truncated_file_is_ignored(self):
+        """Test that reload survives a truncated gzip or binary file"""
+        storage = FileStorage()
+        states = [State(name=str(i)) for i in range(20)]
+        expected = {"State." + state.id: state for state in states}
+        path = FileStorage._FileStorage__file_path
+        for name, compression in (("json", "gzip"), ("binary", "none")):
+            storage.reset(expected)
+            storage.set_format(name)
+            storage.set_compression(compression)
+            if os.path.exists(path):
+                os.remove(path)
+            storage.save()
+            with open(path, 'rb') as f:
+                data = f.read()
+            with open(path, 'wb') as f:
+                f.write(data[:-5])
+            FileStorage._FileStorage__generation = None
+            storage.reload()
+            self.assertEqual(storage.all(), expected)
+            for state in states:
+                self.assertEqual(storage.get(State, state.id).to_dict(),
+                                 state.to_dict())
+            storage.reset()
+            storage.reload()
+            self.assertEqual(storage.all(), {})
+
+
+class TestFileStorageShards(TemporaryFileStorage):
+    """Test the sharded layout of the FileStorage class"""
+    def shard(self, name):
+        """Returns the path of a shard of the temporary storage"""
+        return os.path.join(self.tmp.name, name)
+
+    def forget(self):
+        """Empties the memory of the storage, as a new process would"""
+        FileStorage().reset()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_shard_name(self):
+        """Test the names of the files of the classes"""
+        self.assertEqual(file_storage.shard_name("State"), "states.json")
+        self.assertEqual(file_storage.shard_name("City"), "cities.json")
+        self.assertEqual(file_storage.shard_name("Amenity"),
+                         "amenities.json")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_rewrites_only_changed_classes(self):
+        """Test that saving a state leaves the users file untouched"""
+        storage = FileStorage()
+        storage.set_layout("sharded")
+        state = State(name="California")
+        user = User(email="a@b.c", password="pwd")
+        storage.bulk_new([state, user])
+        storage.save()
+        with open(self.shard("states.json")) as f:
+            self.assertEqual(list(json.load(f)), ["State." + state.id])
+        with open(self.shard("users.json")) as f:
+            self.assertEqual(list(json.load(f)), ["User." + user.id])
+        self.assertFalse(os.path.exists(self.shard("places.json")))
+        os.utime(self.shard("users.json"), (0, 0))
+        writes = storage.stats()["shard_writes"]
+        state.name = "Nevada"
+        save_to(storage, state)
+        self.assertEqual(storage.stats()["shard_writes"], writes + 1)
+        self.assertEqual(os.path.getmtime(self.shard("users.json")), 0)
+        storage.delete(user)
+        storage.save()
+        with open(self.shard("users.json")) as f:
+            self.assertEqual(json.load(f), {})
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_change_during_save_is_saved_next(self):
+        """Test that an object changed while its shard is written stays
+        dirty for the next save"""
+        storage = FileStorage()
+        storage.set_layout("sharded")
+        state = State(name="old")
+        storage.new(state)
+        dump = FileStorage._FileStorage__dump
+
+        def racing_dump(self, path, records):
+            """Writes the shard, then changes the state again"""
+            dump(self, path, records)
+            if state.name == "old":
+                state.name = "new"
+                storage.new(state)
+
+        with mock.patch.object(FileStorage, "_FileStorage__dump",
+                               racing_dump):
+            storage.save()
+        with open(self.shard("states.json")) as f:
+            self.assertEqual(json.load(f)["State." + state.id]["name"],
+                             "old")
+        storage.save()
+        with open(self.shard("states.json")) as f:
+            self.assertEqual(json.load(f)["State." + state.id]["name"],
+                             "new")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_reads_classes_lazily(self):
+        """Test that a shard is only read when its class is queried"""
+        storage = FileStorage()
+        storage.set_layout("sharded")
+        state = State(name="California")
+        city = City(name="Fresno", state_id=state.id)
+        storage.bulk_new([state, city])
+        storage.save()
+        self.forget()
+        storage.reload()
+        reads = storage.stats()["shard_reads"]
+        self.assertEqual(storage.get(State, state.id).name, "California")
+        self.assertEqual(storage.stats()["shard_reads"], reads + 1)
+        self.assertEqual(storage.count(State), 1)
+        self.assertEqual(storage.stats()["shard_reads"], reads + 1)
+        self.assertEqual(list(storage.all(City)), ["City." + city.id])
+        self.assertEqual(storage.stats()["shard_reads"], reads + 2)
+        self.assertEqual(len(storage.all()), 2)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_merges_unread_shard(self):
+        """Test that saving a class never read keeps its other objects"""
+        storage = FileStorage()
+        storage.set_layout("sharded")
+        old = State(name="old")
+        storage.new(old)
+        storage.save()
+        self.forget()
+        storage.reload()
+        new = State(name="new")
+        storage.new(new)
+        storage.save()
+        self.forget()
+        storage.reload()
+        self.assertEqual({obj.name for obj in storage.all(State).values()},
+                         {"old", "new"})
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_shards_saved_by_other_processes(self):
+        """Test that the classes saved by another process are read again"""
+        storage = FileStorage()
+        storage.set_layout("sharded")
+        state = State(name="old")
+        user = User(email="a@b.c", password="pwd", first_name="old")
+        storage.bulk_new([state, user])
+        storage.save()
+
+        def other():
+            """Renames the user and adds a state"""
+            obj = storage.get(User, user.id)
+            obj.first_name = "new"
+            save_to(storage, obj)
+            storage.new(State(name="theirs"))
+            storage.save()
+
+        self.assertEqual(in_other_process(other), 0)
+        storage.new(State(name="mine"))
+        storage.save()
+        self.assertEqual(storage.get(User, user.id).first_name, "new")
+        self.assertEqual({obj.name for obj in storage.all(State).values()},
+                         {"old", "theirs", "mine"})
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_single_file_is_split(self):
+        """Test that the sharded layout starts from the single file"""
+        storage = FileStorage()
+        state = State(name="California")
+        storage.new(state)
+        storage.save()
+        storage.set_layout("sharded")
+        self.forget()
+        storage.reload()
+        self.assertEqual(storage.get(State, state.id).name, "California")
+        storage.save()
+        with open(self.shard("states.json")) as f:
+            self.assertIn("State." + state.id, json.load(f))
+        with self.assertRaises(ValueError):
+            storage.set_layout("nested")
+
+
+class TestFileStorageParallelReload(TemporaryFileStorage):
+    """Test the reload of the FileStorage class by a pool of processes"""
+    def fill(self, format="binary"):
+        """Saves states and their cities, returns their keys and names"""
+        storage = FileStorage()
+        storage.set_format(format)
+        states = [State(name="State {}".format(i)) for i in range(30)]
+        cities = [City(name="City {}".format(i), state_id=states[i].id)
+                  for i in range(30)]
+        storage.bulk_new(states + cities)
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__synced = {}
+        FileStorage._FileStorage__generation = None
+        return {obj.__class__.__name__ + "." + obj.id: obj.name
+                for obj in states + cities}
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_build_part(self):
+        """Test that the parts of a binary file are disjoint and complete"""
+        expected = self.fill()
+        path = FileStorage._FileStorage__file_path
+        tasks = file_storage.split_file(path, 3)
+        self.assertEqual(len(tasks), 3)
+        parts = [file_storage.build_part(*task) for task in tasks]
+        keys = [obj.__class__.__name__ + "." + obj.id
+                for objs in parts for obj in objs]
+        self.assertEqual(sorted(keys), sorted(expected))
+        self.assertTrue(all(parts))
+        sizes = [size for _, _, size, _ in tasks]
+        self.assertLess(max(sizes) - min(sizes), max(sizes) / 4)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_json_file_is_not_split(self):
+        """Test that a JSON file is read whole, and read once"""
+        expected = self.fill("json")
+        path = FileStorage._FileStorage__file_path
+        self.assertEqual(file_storage.split_file(path, 3), [(path,)])
+        storage = FileStorage()
+        storage.set_reload_workers(3)
+        with mock.patch.object(file_storage,
+                               "ProcessPoolExecutor") as executor:
+            storage.reload()
+        executor.assert_not_called()
+        self.assertEqual(len(storage.all()), len(expected))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_parallel_reload(self):
+        """Test that the processes build every object of the file"""
+        expected = self.fill()
+        storage = FileStorage()
+        storage.set_reload_workers(3)
+        pool = file_storage.ProcessPoolExecutor
+        with mock.patch.object(file_storage, "ProcessPoolExecutor",
+                               wraps=pool) as executor:
+            storage.reload()
+        executor.assert_called_once_with(3)
+        self.assertEqual({key: obj.name
+                          for key, obj in storage.all().items()}, expected)
+        self.assertEqual(storage.count(City), 30)
+        with self.assertRaises(ValueError):
+            storage.set_reload_workers(0)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_parallel_reload_of_shards(self):
+        """Test that the shards read at once are built by the processes"""
+        storage = FileStorage()
+        storage.set_layout("sharded")
+        expected = self.fill()
+        storage.set_reload_workers(2)
+        storage.reload()
+        self.assertEqual({key: obj.name
+                          for key, obj in storage.all().items()}, expected)
+        self.assertGreaterEqual(storage.stats()["shard_reads"], 2)
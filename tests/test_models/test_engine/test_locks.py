@@ -0,0 +1,106 @@
+#!/usr/bin/python3
+"""
+Contains the TestLocksDocs and TestReadWriteLock classes
+"""
+
+import inspect
+from models.engine import locks
+import pep8
+import threading
+import time
+import unittest
+ReadWriteLock = locks.ReadWriteLock
+
+
+class TestLocksDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the locks module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.lock_f = inspect.getmembers(ReadWriteLock, inspect.isfunction)
+
+    def test_pep8_conformance_locks(self):
+        """Test that models/engine/locks.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/locks.py',
+                                    'tests/test_models/test_engine/\
+test_locks.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_locks_module_docstring(self):
+        """Test for the locks.py module docstring"""
+        self.assertIsNot(locks.__doc__, None,
+                         "locks.py needs a docstring")
+
+    def test_lock_func_docstrings(self):
+        """Test for the presence of docstrings in ReadWriteLock methods"""
+        for func in self.lock_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+
+
+class TestReadWriteLock(unittest.TestCase):
+    """Test the ReadWriteLock class"""
+    def test_readers_share_the_lock(self):
+        """Test that two readers hold the lock at the same time"""
+        lock = ReadWriteLock()
+        inside = threading.Barrier(2, timeout=5)
+
+        def reader():
+            """Waits inside the lock for the other reader"""
+            with lock.read():
+                inside.wait()
+
+        threads = [threading.Thread(target=reader) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertFalse(inside.broken)
+
+    def test_writer_excludes_readers(self):
+        """Test that a reader waits for the writer to release the lock"""
+        lock = ReadWriteLock()
+        events = []
+        lock.acquire_write()
+
+        def reader():
+            """Records when the read lock is obtained"""
+            with lock.read():
+                events.append("read")
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        time.sleep(0.05)
+        events.append("write released")
+        lock.release_write()
+        thread.join()
+        self.assertEqual(events, ["write released", "read"])
+
+    def test_waiting_writer_goes_before_new_readers(self):
+        """Test that readers arriving after a writer wait for it"""
+        lock = ReadWriteLock()
+        events = []
+        lock.acquire_read()
+
+        def writer():
+            """Records when the write lock is obtained"""
+            with lock.write():
+                events.append("write")
+
+        def reader():
+            """Records when the read lock is obtained"""
+            with lock.read():
+                events.append("read")
+
+        first = threading.Thread(target=writer)
+        first.start()
+        time.sleep(0.05)
+        second = threading.Thread(target=reader)
+        second.start()
+        time.sleep(0.05)
+        lock.release_read()
+        first.join()
+        second.join()
+        self.assertEqual(events, ["write", "read"])
@@ -0,0 +1,172 @@
+#!/usr/bin/python3
+"""
+Contains the TestMappedStorageDocs and TestMappedStorage classes
+"""
+import inspect
+import models
+from models.engine import mapped_storage, serializers
+from models.place import Place
+from models.state import State
+import os
+import pep8
+import tempfile
+import unittest
+MappedStorage = mapped_storage.MappedStorage
+
+
+class TestMappedStorageDocs(unittest.TestCase):
+    """Tests to check the documentation and style of MappedStorage class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.ms_f = inspect.getmembers(MappedStorage, inspect.isfunction)
+
+    def test_pep8_conformance_mapped_storage(self):
+        """Test that models/engine/mapped_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/mapped_storage.py',
+                                    'tests/test_models/test_engine/\
+test_mapped_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_mapped_storage_module_docstring(self):
+        """Test for the mapped_storage.py module docstring"""
+        self.assertIsNot(mapped_storage.__doc__, None,
+                         "mapped_storage.py needs a docstring")
+
+    def test_mapped_storage_class_docstring(self):
+        """Test for the MappedStorage class docstring"""
+        self.assertIsNot(MappedStorage.__doc__, None,
+                         "MappedStorage class needs a docstring")
+
+    def test_ms_func_docstrings(self):
+        """Test for the presence of docstrings in MappedStorage methods"""
+        for func in self.ms_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestMappedStorage(unittest.TestCase):
+    """Test the MappedStorage class on a temporary file"""
+    def setUp(self):
+        """Fills a store of 20 states and a place on a temporary file"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "file.hbnb")
+        storage = MappedStorage(self.path)
+        storage.reload()
+        self.states = [State(name="State {}".format(i)) for i in range(20)]
+        self.place = Place(name="Loft", number_rooms=3, latitude=1.5,
+                           amenity_ids=["a", "b"])
+        storage.bulk_new(self.states + [self.place])
+        storage.save()
+
+    def tearDown(self):
+        """Removes the temporary file"""
+        self.tmp.cleanup()
+
+    def reopen(self, cache_size=5):
+        """Returns a new store reading the file"""
+        storage = MappedStorage(self.path, cache_size)
+        storage.reload()
+        return storage
+
+    def test_get_decodes_the_record(self):
+        """Test that get returns an equal object read from the file"""
+        storage = self.reopen()
+        place = storage.get(Place, self.place.id)
+        self.assertIsNot(place, self.place)
+        self.assertEqual(place.to_dict(), self.place.to_dict())
+        self.assertIsNone(storage.get(Place, "missing"))
+        self.assertIsNone(storage.get(State, self.place.id))
+
+    def test_count_does_not_decode(self):
+        """Test that count reads the index only"""
+        storage = self.reopen()
+        self.assertEqual(storage.count(), 21)
+        self.assertEqual(storage.count(State), 20)
+        self.assertEqual(storage.count("Place"), 1)
+        self.assertEqual(storage.stats()["cache_misses"], 0)
+
+    def test_cache_is_bounded(self):
+        """Test that the decoded objects kept are the recently used ones"""
+        storage = self.reopen(cache_size=5)
+        first = storage.get(State, self.states[0].id)
+        self.assertIs(storage.get(State, self.states[0].id), first)
+        self.assertEqual(len(storage.all(State)), 20)
+        self.assertEqual(storage.stats()["cache_objects"], 5)
+        self.assertIsNot(storage.get(State, self.states[0].id), first)
+        self.assertIs(storage.get(State, self.states[19].id),
+                      storage.get(State, self.states[19].id))
+
+    def test_changes_are_saved(self):
+        """Test that updates, additions and deletions reach the file"""
+        storage = self.reopen(cache_size=0)
+        state = storage.get(State, self.states[0].id)
+        state.name = "Renamed"
+        storage.new(state)
+        storage.delete(storage.get(State, self.states[1].id))
+        new = State(name="New")
+        storage.new(new)
+        self.assertIs(storage.get(State, state.id), state)
+        self.assertEqual(storage.count(State), 20)
+        storage.save()
+        storage = self.reopen()
+        self.assertEqual(storage.get(State, state.id).name, "Renamed")
+        self.assertIsNone(storage.get(State, self.states[1].id))
+        self.assertEqual(storage.get(State, new.id).name, "New")
+        self.assertEqual(storage.get(State, self.states[2].id).name,
+                         "State 2")
+        self.assertEqual(storage.count(State), 20)
+
+    def test_reload_keeps_unsaved_changes(self):
+        """Test that reload applies the pending changes to the new index"""
+        storage = self.reopen()
+        new = State(name="New")
+        storage.new(new)
+        storage.delete(storage.get(State, self.states[0].id))
+        storage.reload()
+        self.assertIs(storage.get(State, new.id), new)
+        self.assertIsNone(storage.get(State, self.states[0].id))
+
+    def test_close_keeps_the_cache(self):
+        """Test that close reloads only a file saved by another store"""
+        storage = self.reopen()
+        first = storage.get(State, self.states[0].id)
+        storage.close()
+        self.assertIs(storage.get(State, self.states[0].id), first)
+        self.assertEqual(storage.stats()["reloads"], 1)
+        other = self.reopen()
+        other.new(State(name="Other"))
+        other.save()
+        storage.close()
+        self.assertEqual(storage.stats()["reloads"], 2)
+        self.assertEqual(storage.count(State), 21)
+        self.assertIsNot(storage.get(State, self.states[0].id), first)
+
+    def test_file_is_in_the_binary_format(self):
+        """Test that the store is a file of the binary serializer"""
+        with open(self.path, 'rb') as f:
+            records = list(serializers.load(f))
+        self.assertEqual(len(records), 21)
+        self.assertEqual({record["__class__"] for record in records},
+                         {"State", "Place"})
+
+    def test_iter_decodes_without_caching(self):
+        """Test that iter yields every object and leaves the cache alone"""
+        storage = self.reopen()
+        new = State(name="New")
+        storage.new(new)
+        states = list(storage.iter(State))
+        self.assertEqual(len(states), 21)
+        self.assertIn(new, states)
+        self.assertEqual([obj.__class__.__name__ for obj in storage.iter()],
+                         ["State"] * 21 + ["Place"])
+        self.assertEqual(storage.stats()["cache_objects"], 0)
+
+    def test_snapshot(self):
+        """Test that a snapshot holds every object by class"""
+        snapshot = self.reopen().snapshot()
+        self.assertEqual(snapshot.count(State), 20)
+        self.assertEqual(snapshot.get(Place, self.place.id).name, "Loft")
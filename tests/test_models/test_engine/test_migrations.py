@@ -0,0 +1,124 @@
+#!/usr/bin/python3
+"""
+Contains the TestMigrationsDocs and TestMigrations classes
+"""
+from console import HBNBCommand
+import inspect
+import io
+import models
+from models.engine import migrations
+from models.state import State
+import os
+import pep8
+import sqlalchemy
+import tempfile
+import unittest
+from unittest import mock
+
+
+class TestMigrationsDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the migrations"""
+    def test_pep8_conformance_migrations(self):
+        """Test that models/engine/migrations.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/migrations.py',
+                                    'tests/test_models/test_engine/\
+test_migrations.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_migrations_module_docstring(self):
+        """Test for the migrations.py module docstring"""
+        self.assertIsNot(migrations.__doc__, None,
+                         "migrations.py needs a docstring")
+
+    def test_migrations_func_docstrings(self):
+        """Test for the presence of docstrings in the functions"""
+        for func in inspect.getmembers(migrations, inspect.isfunction):
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} needs a docstring".format(func[0]))
+
+    def test_versions_follow(self):
+        """Test that the versions are numbered from 1 without gaps"""
+        self.assertEqual([m.version for m in migrations.MIGRATIONS],
+                         list(range(1, migrations.head() + 1)))
+
+
+@unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+class TestMigrations(unittest.TestCase):
+    """Test the migrations on a SQLite database"""
+    def setUp(self):
+        """Opens an empty SQLite database"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.engine = sqlalchemy.create_engine(
+            "sqlite:///" + os.path.join(self.tmp.name, "migrate.db"))
+
+    def tearDown(self):
+        """Removes the database"""
+        self.engine.dispose()
+        self.tmp.cleanup()
+
+    def tables(self):
+        """Returns the names of the tables of the database"""
+        return set(sqlalchemy.inspect(self.engine).get_table_names())
+
+    def test_forward_and_back(self):
+        """Test the upgrades and downgrades between the versions"""
+        self.assertEqual(migrations.current(self.engine), 0)
+        steps = migrations.migrate(self.engine)
+        self.assertEqual([(d, m.version) for d, m in steps],
+                         [("upgrade", 1), ("upgrade", 2)])
+        self.assertEqual(migrations.current(self.engine), 2)
+        self.assertIn("states", self.tables())
+        self.assertEqual(migrations.migrate(self.engine), [])
+        steps = migrations.migrate(self.engine, 1)
+        self.assertEqual([(d, m.version) for d, m in steps],
+                         [("downgrade", 2)])
+        indexes = sqlalchemy.inspect(self.engine).get_indexes("reviews")
+        self.assertEqual(indexes, [])
+        migrations.migrate(self.engine, 0)
+        self.assertEqual(self.tables(), set())
+        with self.assertRaises(ValueError):
+            migrations.migrate(self.engine, migrations.head() + 1)
+
+    def test_mysql_keeps_foreign_key_indexes(self):
+        """Test that the downgrade on MySQL keeps the foreign key indexes"""
+        migrations.migrate(self.engine)
+        with mock.patch.object(self.engine.dialect, "name", "mysql"):
+            migrations.migrate(self.engine, 1)
+        inspector = sqlalchemy.inspect(self.engine)
+        tables = ("cities", "places", "reviews", "place_amenity", "users")
+        names = {index["name"] for table in tables
+                 for index in inspector.get_indexes(table)}
+        self.assertEqual(names, {"ix_cities_state_id", "ix_places_user_id",
+                                 "ix_places_city_id_price_by_night",
+                                 "ix_reviews_place_id", "ix_reviews_user_id",
+                                 "ix_place_amenity_amenity_id"})
+        self.assertEqual(migrations.migrate(self.engine)[0][1].version, 2)
+        self.assertEqual(migrations.current(self.engine), 2)
+
+    def test_unversioned_schema_is_upgraded(self):
+        """Test that a schema made by create_all is adopted"""
+        models.base_model.Base.metadata.create_all(self.engine)
+        migrations.migrate(self.engine)
+        self.assertEqual(migrations.current(self.engine), migrations.head())
+
+    def test_reload_skips_current_schema(self):
+        """Test that reload does not migrate a current schema"""
+        url = str(self.engine.url)
+        storage = models.engine.db_storage.DBStorage(url)
+        storage.reload()
+        self.assertEqual(storage.schema_version(), migrations.head())
+        with mock.patch.object(migrations, "migrate") as migrate:
+            storage.reload()
+        migrate.assert_not_called()
+        storage.close()
+
+    def test_console_migrate(self):
+        """Test the migrate command of the console"""
+        with mock.patch("sys.stdout", new=io.StringIO()) as out:
+            HBNBCommand().onecmd("migrate status")
+        self.assertRegex(out.getvalue(), r"^schema version \d+ \(latest ")
+        with mock.patch("sys.stdout", new=io.StringIO()) as out:
+            HBNBCommand().onecmd("migrate")
+        self.assertIn("is current", out.getvalue())
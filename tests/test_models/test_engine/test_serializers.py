@@ -0,0 +1,194 @@
+#!/usr/bin/python3
+"""
+Contains the TestSerializersDocs and TestSerializers classes
+"""
+from datetime import datetime
+import inspect
+import io
+import json
+from models.engine import serializers
+import os
+import pep8
+import tempfile
+import unittest
+from unittest import mock
+
+
+class TestSerializersDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the serializers"""
+    def test_pep8_conformance_serializers(self):
+        """Test that models/engine/serializers.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/serializers.py',
+                                    'tests/test_models/test_engine/\
+test_serializers.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_serializers_module_docstring(self):
+        """Test for the serializers.py module docstring"""
+        self.assertIsNot(serializers.__doc__, None,
+                         "serializers.py needs a docstring")
+
+    def test_serializers_func_docstrings(self):
+        """Test for the presence of docstrings in the serializers"""
+        members = inspect.getmembers(serializers, inspect.isfunction)
+        for cls in (serializers.JSONSerializer,
+                    serializers.BinarySerializer):
+            members += inspect.getmembers(cls, inspect.isfunction)
+        for func in members:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} needs a docstring".format(func[0]))
+
+
+class TestSerializers(unittest.TestCase):
+    """Test the JSON and binary serializers"""
+    records = [
+        {"id": "1", "name": "Nevada", "__class__": "State",
+         "created_at": datetime(2017, 3, 25, 2, 17, 6, 123456),
+         "updated_at": datetime(2017, 3, 25, 2, 17, 6, 123456)},
+        {"id": "2", "name": "Loft", "number_rooms": 3, "latitude": 37.77,
+         "description": None, "amenity_ids": ["a", "b"], "big": 2 ** 70,
+         "open": True, "closed": False, "__class__": "Place"},
+        {"id": "3", "name": "Bath", "__class__": "Place", "number_rooms": 1},
+        {"id": "4", "name": "Reno", "__class__": "State",
+         "created_at": datetime(1969, 12, 31, 23, 59, 59),
+         "updated_at": datetime(2030, 1, 1)},
+    ]
+
+    def round_trip(self, name):
+        """Returns the records written then read back in a format"""
+        f = io.BytesIO()
+        serializers.serializers[name].dump(self.records, f)
+        f.seek(0)
+        return list(serializers.load(io.BufferedReader(f)))
+
+    def test_binary_round_trip(self):
+        """Test that the binary format keeps the values and their types"""
+        self.assertEqual(self.round_trip("binary"), self.records)
+
+    def test_json_is_the_file_json_format(self):
+        """Test that the JSON format is keyed and stamps are strings"""
+        f = io.BytesIO()
+        serializers.serializers["json"].dump(self.records, f)
+        data = json.loads(f.getvalue())
+        self.assertEqual(list(data), ["State.1", "Place.2", "Place.3",
+                                      "State.4"])
+        self.assertEqual(data["State.1"]["created_at"],
+                         "2017-03-25T02:17:06.123456")
+        self.assertEqual(self.round_trip("json")[1], self.records[1])
+
+    def test_binary_is_smaller(self):
+        """Test that the binary format is more compact than JSON"""
+        many = [dict(record, id=str(i)) for i in range(100)
+                for record in self.records[:1]]
+        sizes = {}
+        for name in ("json", "binary"):
+            f = io.BytesIO()
+            serializers.serializers[name].dump(many, f)
+            sizes[name] = len(f.getvalue())
+        self.assertLess(sizes["binary"], sizes["json"] * 0.7)
+
+    def test_stamp(self):
+        """Test that the stamps of both formats compare equal"""
+        self.assertEqual(serializers.stamp(self.records[0]["updated_at"]),
+                         "2017-03-25T02:17:06.123456")
+        self.assertEqual(serializers.stamp("2017"), "2017")
+
+    def test_convert(self):
+        """Test the conversion tool in both directions"""
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "file.json")
+            binary = os.path.join(tmp, "file.hbnb")
+            back = os.path.join(tmp, "back.json")
+            with open(source, 'wb') as f:
+                serializers.serializers["json"].dump(self.records, f)
+            with mock.patch("sys.stdout", new=io.StringIO()):
+                serializers.main([source, binary, "--to", "binary"])
+            self.assertEqual(serializers.convert(binary, back, "json"), 4)
+            with open(binary, 'rb') as f:
+                self.assertIs(serializers.detect(f),
+                              serializers.serializers["binary"])
+            with open(source, 'rb') as f, open(back, 'rb') as g:
+                self.assertEqual(json.load(f), json.load(g))
+
+    def compressed_round_trip(self, name, compression):
+        """Returns the compressed bytes and the records read back"""
+        f = io.BytesIO()
+        with serializers.compressed(f, compression) as stream:
+            serializers.serializers[name].dump(self.records, stream)
+        data = f.getvalue()
+        f.seek(0)
+        return data, list(serializers.load(io.BufferedReader(f)))
+
+    def test_gzip_round_trip(self):
+        """Test that both formats are read back through gzip"""
+        for name in ("json", "binary"):
+            data, records = self.compressed_round_trip(name, "gzip")
+            self.assertEqual(data[:2], serializers.GZIP_MAGIC)
+            self.assertEqual(records, self.round_trip(name))
+
+    @unittest.skipIf(serializers.zstandard is None, "zstandard missing")
+    def test_zstd_round_trip(self):
+        """Test that both formats are read back through zstd"""
+        for name in ("json", "binary"):
+            data, records = self.compressed_round_trip(name, "zstd")
+            self.assertEqual(data[:4], serializers.ZSTD_MAGIC)
+            self.assertEqual(records, self.round_trip(name))
+
+    def test_unknown_compression(self):
+        """Test that an unknown or missing codec is refused"""
+        with self.assertRaises(ValueError):
+            with serializers.compressed(io.BytesIO(), "lzma"):
+                pass
+        if serializers.zstandard is None:
+            self.assertNotIn("zstd", serializers.compressions())
+            with self.assertRaises(ValueError):
+                with serializers.compressed(io.BytesIO(), "zstd"):
+                    pass
+
+    def test_json_is_parsed_by_blocks(self):
+        """Test the incremental JSON parser on blocks cut anywhere"""
+        data = {"State.1": {"id": "1", "name": "Zürich ☃ {}\\",
+                            "__class__": "State"},
+                "Place.2": {"id": "2", "amenity_ids": ["a", "b"],
+                            "latitude": -12.5e3, "__class__": "Place"}}
+        texts = [json.dumps(data), json.dumps(data, indent=4),
+                 json.dumps(data, separators=(",", ":"))]
+        for size in (1, 2, 7, 4096):
+            for text in texts:
+                f = io.BufferedReader(io.BytesIO(text.encode()))
+                with mock.patch.object(serializers, "BUFFER_SIZE", size):
+                    records = list(serializers.serializers["json"].load(f))
+                self.assertEqual(records, list(data.values()))
+
+    def test_json_empty_and_malformed(self):
+        """Test that an empty object has no records and bad files raise"""
+        load = serializers.serializers["json"].load
+        self.assertEqual(list(load(io.BytesIO(b" { } "))), [])
+        for text in (b"", b"[]", b'{"a": {"id": 1}', b'{"a" {}}',
+                     b'{"a": {"id": 1}}x'):
+            with self.assertRaises(ValueError):
+                list(load(io.BytesIO(text)))
+
+    def test_truncated_files(self):
+        """Test that a truncated file raises ValueError in every format"""
+        for name in ("json", "binary"):
+            for compression in ("none", "gzip"):
+                data, _ = self.compressed_round_trip(name, compression)
+                for cut in (1, 3, len(data) // 2):
+                    with self.subTest(name=name, compression=compression,
+                                      cut=cut):
+                        f = io.BufferedReader(io.BytesIO(data[:-cut]))
+                        with self.assertRaises(ValueError):
+                            list(serializers.load(f))
+
+    def test_corrupt_binary_file(self):
+        """Test that a record of an unknown shape raises ValueError"""
+        f = io.BytesIO()
+        serializers.serializers["binary"].dump(self.records, f)
+        data = bytearray(f.getvalue())
+        start = len(serializers.BinarySerializer.magic) + 4
+        data[start:start + 4] = serializers.U32.pack(7)
+        with self.assertRaises(ValueError):
+            list(serializers.load(io.BufferedReader(io.BytesIO(data))))
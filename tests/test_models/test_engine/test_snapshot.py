@@ -0,0 +1,64 @@
+#!/usr/bin/python3
+"""
+Contains the TestSnapshotDocs and TestSnapshot classes
+"""
+
+import inspect
+from models.engine import snapshot
+from models.state import State
+from types import MappingProxyType
+import pep8
+import unittest
+Snapshot = snapshot.Snapshot
+
+
+class TestSnapshotDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the snapshot module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.snapshot_f = inspect.getmembers(Snapshot, inspect.isfunction)
+
+    def test_pep8_conformance_snapshot(self):
+        """Test that models/engine/snapshot.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/snapshot.py',
+                                    'tests/test_models/test_engine/\
+test_snapshot.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_snapshot_module_docstring(self):
+        """Test for the snapshot.py module docstring"""
+        self.assertIsNot(snapshot.__doc__, None,
+                         "snapshot.py needs a docstring")
+
+    def test_snapshot_func_docstrings(self):
+        """Test for the presence of docstrings in Snapshot methods"""
+        for func in self.snapshot_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+
+
+class TestSnapshot(unittest.TestCase):
+    """Test the Snapshot class"""
+    def setUp(self):
+        """Builds a snapshot of two states"""
+        self.states = {"State.a": "first", "State.b": "second"}
+        self.snapshot = Snapshot(3, {"State": MappingProxyType(self.states),
+                                     "User": MappingProxyType({})})
+
+    def test_all(self):
+        """Test the objects of a class, by class or by name"""
+        self.assertEqual(self.snapshot.all(State), self.states)
+        self.assertEqual(self.snapshot.all("State"), self.states)
+        self.assertEqual(self.snapshot.all("City"), {})
+        self.assertEqual(self.snapshot.all(), self.states)
+
+    def test_get_and_count(self):
+        """Test the lookups and the counts"""
+        self.assertEqual(self.snapshot.get(State, "b"), "second")
+        self.assertIsNone(self.snapshot.get("User", "b"))
+        self.assertEqual(self.snapshot.count(State), 2)
+        self.assertEqual(self.snapshot.count(), 2)
+        self.assertEqual(self.snapshot.version, 3)
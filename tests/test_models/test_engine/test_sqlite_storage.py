@@ -0,0 +1,90 @@
+#!/usr/bin/python3
+"""
+Contains the TestSQLiteStorageDocs and TestSQLiteStorage classes
+"""
+import inspect
+import models
+from models.engine import sqlite_storage
+from models.state import State
+import os
+import pep8
+import sqlite3
+import tempfile
+import unittest
+SQLiteStorage = sqlite_storage.SQLiteStorage
+
+
+class TestSQLiteStorageDocs(unittest.TestCase):
+    """Tests to check the documentation and style of SQLiteStorage class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.sqls_f = inspect.getmembers(SQLiteStorage, inspect.isfunction)
+
+    def test_pep8_conformance_sqlite_storage(self):
+        """Test that models/engine/sqlite_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/sqlite_storage.py',
+                                    'tests/test_models/test_engine/\
+test_sqlite_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_sqlite_storage_module_docstring(self):
+        """Test for the sqlite_storage.py module docstring"""
+        self.assertIsNot(sqlite_storage.__doc__, None,
+                         "sqlite_storage.py needs a docstring")
+
+    def test_sqlite_storage_class_docstring(self):
+        """Test for the SQLiteStorage class docstring"""
+        self.assertIsNot(SQLiteStorage.__doc__, None,
+                         "SQLiteStorage class needs a docstring")
+
+    def test_sqls_func_docstrings(self):
+        """Test for the presence of docstrings in SQLiteStorage methods"""
+        for func in self.sqls_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+
+
+@unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+class TestSQLiteStorage(unittest.TestCase):
+    """Test the SQLiteStorage class on a temporary database"""
+    def setUp(self):
+        """Opens a storage on a temporary file"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "hbnb.db")
+        self.storage = SQLiteStorage(self.path)
+        self.storage.reload()
+
+    def tearDown(self):
+        """Closes the storage"""
+        self.storage.close()
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        """Test that a saved object is read back by another storage"""
+        other = SQLiteStorage(self.path)
+        other.reload()
+        state = State(name="Sqlite")
+        self.storage.new(state)
+        self.storage.save()
+        self.assertEqual(other.get(State, state.id).name, "Sqlite")
+        other.close()
+
+    def test_iter_by_batches(self):
+        """Test that iter reads every row by increasing id"""
+        states = [State(name=str(i)) for i in range(5)]
+        self.storage.bulk_new(states)
+        self.storage.save()
+        ids = [state.id for state in self.storage.iter(State, batch_size=2)]
+        self.assertEqual(ids, sorted(state.id for state in states))
+        self.assertEqual(len(list(self.storage.iter("State"))), 5)
+        self.assertEqual(list(self.storage.iter("City")), [])
+
+    def test_wal_mode(self):
+        """Test that the database file is in WAL mode"""
+        self.storage.count(State)
+        with sqlite3.connect(self.path) as conn:
+            mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
@@ -0,0 +1,160 @@
+#!/usr/bin/python3
+"""
+Contains the TestTransferDocs, TestTransferFile and TestTransferDB classes
+"""
+import inspect
+import io
+import json
+import models
+from models.amenity import Amenity
+from models.city import City
+from models.engine import transfer
+from models.engine.file_storage import FileStorage
+from models.engine.mapped_storage import MappedStorage
+from models.engine.sqlite_storage import SQLiteStorage
+from models.place import Place
+from models.state import State
+from models.user import User
+import os
+import pep8
+import tempfile
+import unittest
+
+
+class TestTransferDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the transfer module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.transfer_f = inspect.getmembers(transfer, inspect.isfunction)
+
+    def test_pep8_conformance_transfer(self):
+        """Test that models/engine/transfer.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/transfer.py',
+                                    'tests/test_models/test_engine/\
+test_transfer.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_transfer_module_docstring(self):
+        """Test for the transfer.py module docstring"""
+        self.assertIsNot(transfer.__doc__, None,
+                         "transfer.py needs a docstring")
+
+    def test_transfer_func_docstrings(self):
+        """Test for the presence of docstrings in transfer functions"""
+        for func in self.transfer_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} function needs a docstring".format(func[0]))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestTransferFile(unittest.TestCase):
+    """Test the export and import of the file storages"""
+    state = ("objects", "file_path", "generation", "synced", "dirty",
+             "deleted", "unloaded")
+
+    def setUp(self):
+        """Fills a FileStorage on a temporary file"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.saved = {name: getattr(FileStorage, "_FileStorage__" + name)
+                      for name in self.state}
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__file_path = os.path.join(self.tmp.name,
+                                                           "file.json")
+        FileStorage._FileStorage__generation = None
+        FileStorage._FileStorage__synced = {}
+        FileStorage._FileStorage__dirty = set()
+        FileStorage._FileStorage__deleted = set()
+        FileStorage._FileStorage__unloaded = set()
+        self.storage = FileStorage()
+        state = State(name="California")
+        self.place = Place(name="Loft", city_id="c", user_id="u",
+                           amenity_ids=["a", "b"])
+        self.storage.bulk_new([self.place, City(state_id=state.id), state])
+
+    def tearDown(self):
+        """Restores the storage"""
+        for name, value in self.saved.items():
+            setattr(FileStorage, "_FileStorage__" + name, value)
+        self.tmp.cleanup()
+
+    def test_export_lines(self):
+        """Test that export writes one record per line in foreign key order"""
+        stream = io.StringIO()
+        progress = []
+        self.assertEqual(transfer.export(self.storage, stream,
+                                         progress=progress.append), 3)
+        self.assertEqual(progress, [3])
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual([record["__class__"] for record in records],
+                         ["State", "City", "Place"])
+        self.assertEqual(records[2]["amenity_ids"], ["a", "b"])
+        self.assertEqual(records[2]["created_at"],
+                         self.place.to_dict()["created_at"])
+
+    def test_export_one_class(self):
+        """Test that export writes the objects of the given class"""
+        stream = io.StringIO()
+        self.assertEqual(transfer.export(self.storage, stream, "Place"), 1)
+
+    def test_load_into_mapped_storage(self):
+        """Test that the lines load into another engine by batches"""
+        stream = io.StringIO()
+        transfer.export(self.storage, stream)
+        stream.seek(0)
+        mapped = MappedStorage(os.path.join(self.tmp.name, "file.hbnb"))
+        mapped.reload()
+        progress = []
+        self.assertEqual(transfer.load(mapped, stream, batch_size=2,
+                                       progress=progress.append), 3)
+        self.assertEqual(progress, [2, 3])
+        self.assertEqual(mapped.get(Place, self.place.id).to_dict(),
+                         self.place.to_dict())
+
+    def test_load_bad_line(self):
+        """Test that a line which is not JSON is reported"""
+        mapped = MappedStorage(os.path.join(self.tmp.name, "file.hbnb"))
+        mapped.reload()
+        stream = io.StringIO('{"__class__": "State", "name": "A"}\n\n{')
+        with self.assertRaisesRegex(ValueError, "line 3"):
+            transfer.load(mapped, stream)
+
+
+@unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+class TestTransferDB(unittest.TestCase):
+    """Test the export and import of the database storage"""
+    def setUp(self):
+        """Fills a SQLite storage with a place and its amenities"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.storage = SQLiteStorage(os.path.join(self.tmp.name, "hbnb.db"))
+        self.storage.reload()
+        state = State(name="California")
+        city = City(name="Fremont", state_id=state.id)
+        user = User(email="a@b.c", password="pwd")
+        amenities = [Amenity(name="Wifi"), Amenity(name="Pool")]
+        self.place = Place(name="Loft", city_id=city.id, user_id=user.id,
+                           amenity_ids=[amenity.id for amenity in amenities])
+        self.storage.bulk_new([state, city, user] + amenities + [self.place])
+        self.storage.save()
+
+    def tearDown(self):
+        """Closes the storage"""
+        self.storage.close()
+        self.tmp.cleanup()
+
+    def test_export_and_load(self):
+        """Test that the links of the places go through the lines"""
+        stream = io.StringIO()
+        self.assertEqual(transfer.export(self.storage, stream), 6)
+        stream.seek(0)
+        other = SQLiteStorage(os.path.join(self.tmp.name, "other.db"))
+        other.reload()
+        self.assertEqual(transfer.load(other, stream, batch_size=1), 6)
+        other.close()
+        other.reload()
+        place = other.get(Place, self.place.id)
+        self.assertEqual(sorted(amenity.name for amenity in place.amenities),
+                         ["Pool", "Wifi"])
+        other.close()
@@ -0,0 +1,106 @@
+#!/usr/bin/python3
+"""
+Contains the TestWriteBehindDocs and TestWriteBehind classes
+"""
+
+import inspect
+from models.engine import write_behind
+import pep8
+import threading
+import time
+import unittest
+WriteBehind = write_behind.WriteBehind
+
+
+class TestWriteBehindDocs(unittest.TestCase):
+    """Tests to check the documentation and style of write_behind"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.wb_f = inspect.getmembers(WriteBehind, inspect.isfunction)
+
+    def test_pep8_conformance_write_behind(self):
+        """Test that models/engine/write_behind.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/write_behind.py',
+                                    'tests/test_models/test_engine/\
+test_write_behind.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_write_behind_module_docstring(self):
+        """Test for the write_behind.py module docstring"""
+        self.assertIsNot(write_behind.__doc__, None,
+                         "write_behind.py needs a docstring")
+
+    def test_wb_func_docstrings(self):
+        """Test for the presence of docstrings in WriteBehind methods"""
+        for func in self.wb_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+
+
+class TestWriteBehind(unittest.TestCase):
+    """Test the WriteBehind class"""
+    def setUp(self):
+        """Counts the writes"""
+        self.writes = 0
+        self.written = threading.Event()
+
+    def write(self):
+        """Counts a write"""
+        self.writes += 1
+        self.written.set()
+
+    def test_saves_are_coalesced(self):
+        """Test that the saves within the delay are written once"""
+        writer = WriteBehind(self.write, delay=0.2)
+        for i in range(10):
+            writer.mark(i)
+        self.assertEqual(writer.stats()["write_behind_pending"], 10)
+        self.assertTrue(self.written.wait(5))
+        writer.stop()
+        self.assertEqual(self.writes, 1)
+        stats = writer.stats()
+        self.assertEqual(stats["write_behind_saves"], 10)
+        self.assertEqual(stats["write_behind_flushes"], 1)
+        self.assertEqual(stats["write_behind_pending"], 0)
+        self.assertGreaterEqual(stats["write_behind_max_lag_seconds"], 0.2)
+
+    def test_max_dirty_forces_a_write(self):
+        """Test that enough changed objects do not wait for the delay"""
+        writer = WriteBehind(self.write, delay=60, max_dirty=5)
+        writer.mark(5)
+        self.assertTrue(self.written.wait(5))
+        writer.stop()
+        self.assertEqual(self.writes, 1)
+
+    def test_flush_and_stop(self):
+        """Test that flush writes at once and stop writes what is left"""
+        writer = WriteBehind(self.write, delay=60)
+        writer.flush()
+        self.assertEqual(self.writes, 0)
+        writer.mark(1)
+        writer.flush()
+        self.assertEqual(self.writes, 1)
+        writer.mark(1)
+        self.assertGreater(writer.stats()["write_behind_lag_seconds"], 0)
+        writer.stop()
+        self.assertEqual(self.writes, 2)
+
+    def test_failed_write_stays_pending(self):
+        """Test that the saves of a failed write are written later"""
+        def fail():
+            """Fails the first write"""
+            self.write()
+            if self.writes == 1:
+                raise OSError("disk full")
+
+        writer = WriteBehind(fail, delay=60)
+        writer.mark(1)
+        with self.assertRaises(OSError):
+            writer.flush()
+        self.assertEqual(writer.stats()["write_behind_pending"], 1)
+        self.assertEqual(writer.stats()["write_behind_errors"], 1)
+        writer.stop()
+        self.assertEqual(self.writes, 2)
@@ -12,10 +12,14 @@ app = Flask(__name__)
 @app.route('/hbnb_filters', strict_slashes=False)
 def filters():
     """display a HTML page like 6-index.html from static"""
-    states = storage.all("State").values()
-    amenities = storage.all("Amenity").values()
+    snapshot = storage.snapshot()
+    states = snapshot.all("State").values()
+    amenities = snapshot.all("Amenity").values()
+    cities = {}
+    for city in snapshot.all("City").values():
+        cities.setdefault(city.state_id, []).append(city)
     return render_template('10-hbnb_filters.html', states=states,
-                           amenities=amenities)
+                           cities=cities, amenities=amenities)
 
 
 @app.teardown_appcontext